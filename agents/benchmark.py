@@ -0,0 +1,230 @@
+"""
+Micro-benchmarks of orchestrator framework overhead and batch pay math.
+
+Every agent's calculate() is replaced by a canned result, so the time
+measured is what the workflow itself costs per node: LangGraph dispatch,
+state handling, routing, progress wrappers and logging. Run with:
+
+    python -m agents.benchmark [--runs N] [--flights N] [--checkpoint]
+
+With --batch-legs, the deterministic RosterBatch totals (flight time,
+premiums, per diem, duty checks) are timed instead over that many
+synthetic legs:
+
+    python -m agents.benchmark --batch-legs 1000000 [--legs-per-crew N]
+"""
+
+import argparse
+import copy
+import logging
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+from dotenv import load_dotenv
+
+from .checkpoint import create_checkpointer
+from .orchestrator import CrewPayOrchestrator
+from .roster_batch import RosterBatch
+
+CREW_MEMBER = {
+    "id": "bench-crew",
+    "employee_id": "B00001",
+    "first_name": "Bench",
+    "last_name": "Mark",
+    "role": "Captain",
+    "crew_type": "line_holder",
+    "hourly_rate": 105.0,
+    "base_airport": "BUR",
+}
+
+CANNED_RESULTS = {
+    "flight_time_agent": {
+        "totals": {"total_credit_hours": 80.0, "total_flight_pay": 8400.0},
+        "confidence_score": 0.95,
+    },
+    "duty_time_agent": {"violations": [], "compliance_status": "compliant"},
+    "per_diem_agent": {"totals": {"total_net_per_diem": 300.0}, "confidence_score": 0.95},
+    "premium_pay_agent": {"totals": {"total_premium_pay": 100.0}, "confidence_score": 0.95},
+    "guarantee_agent": {"paid_hours": 80.0, "calculation": {"base_pay": 8400.0}},
+    "compliance_agent": {"overall_compliance": "pass", "requires_human_review": False},
+}
+
+
+def sample_flights(count: int) -> List[Dict[str, Any]]:
+    """Red-eye legs with layovers, so no node is routed around."""
+    flights = []
+    for index in range(count):
+        day = 1 + index % 28
+        flights.append(
+            {
+                "flight_number": f"XP{100 + index}",
+                "flight_date": f"2025-11-{day:02d}",
+                "origin_airport": "BUR",
+                "destination_airport": "PDX",
+                "scheduled_departure": f"2025-11-{day:02d} 22:30:00",
+                "actual_departure": f"2025-11-{day:02d} 22:45:00",
+                "scheduled_block_time": 2.75,
+                "actual_block_time": 2.58,
+                "position": "CA",
+                "overnight_location": "PDX",
+                "is_redeye": True,
+                "is_international": False,
+                "trip_id": f"T{index // 4}",
+                "sequence_number": index % 4 + 1,
+            }
+        )
+    return flights
+
+
+def stub_agents(orchestrator: CrewPayOrchestrator) -> None:
+    """Replace every agent's calculate() with its canned result."""
+    for attribute, result in CANNED_RESULTS.items():
+        agent = getattr(orchestrator, attribute)
+        agent.calculate = lambda input_data, result=result: copy.deepcopy(result)
+
+
+def run(runs: int, flights: int, checkpoint: bool) -> Dict[str, float]:
+    """
+    Time complete workflow runs with stubbed agents.
+
+    Args:
+        runs: Workflow runs to time (after one warm-up run)
+        flights: Flights per crew member
+        checkpoint: Use an in-memory checkpointer
+
+    Returns:
+        Mean milliseconds per run and per node executed
+    """
+    orchestrator = CrewPayOrchestrator(
+        checkpointer=create_checkpointer(":memory:") if checkpoint else None,
+        crew_sla_seconds=0,
+        speculate=False,
+    )
+    stub_agents(orchestrator)
+    assignments = sample_flights(flights)
+
+    nodes: List[str] = []
+
+    def count_node(execution_id: str, event: Dict[str, Any]) -> None:
+        if event["event"] == "node_completed":
+            nodes.append(event["node"])
+
+    orchestrator.process(CREW_MEMBER, assignments, "2025-11-01", "2025-11-30")
+    orchestrator.process(
+        CREW_MEMBER, assignments, "2025-11-01", "2025-11-30", on_progress=count_node
+    )
+    started = time.perf_counter()
+    for _ in range(runs):
+        orchestrator.process(CREW_MEMBER, assignments, "2025-11-01", "2025-11-30")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        "ms_per_run": elapsed_ms / runs,
+        "ms_per_node": elapsed_ms / runs / len(nodes),
+        "nodes_per_run": len(nodes),
+    }
+
+
+def synthetic_batch(legs: int, legs_per_crew: int = 50, seed: int = 0) -> RosterBatch:
+    """
+    Build a batch of random legs directly from columns.
+
+    Legs run about every 20 hours per crew member from 2025-11-01, so they
+    stay in departure order; about a third end in a layover and a tenth
+    are red-eyes.
+    """
+    rng = np.random.default_rng(seed)
+    n_crew = -(-legs // legs_per_crew)
+    crew_index = np.repeat(np.arange(n_crew), legs_per_crew)[:legs]
+    sequence = np.tile(np.arange(legs_per_crew), n_crew)[:legs]
+    departure = 1761955200 + sequence * 72000 + rng.integers(0, 3600, legs)
+    block = rng.integers(60, 400, legs)
+    return RosterBatch(
+        crew_ids=[f"crew-{index}" for index in range(n_crew)],
+        hourly_rates=rng.uniform(60, 120, n_crew),
+        redeye_rates=np.full(n_crew, 50.0),
+        crew_index=crew_index,
+        departure_epoch=departure,
+        arrival_epoch=departure + block * 36,
+        block_centihours=block,
+        flight_day=departure // 86400,
+        is_redeye=rng.random(legs) < 0.1,
+        is_international=rng.random(legs) < 0.05,
+        is_deadhead=rng.random(legs) < 0.03,
+        has_overnight=rng.random(legs) < 0.3,
+        per_diem_rate=np.full(legs, 79.0),
+        duty_report_epoch=departure - 3600,
+        duty_end_epoch=departure + block * 36 + 1800,
+    )
+
+
+def batch_run(legs: int, legs_per_crew: int = 50, runs: int = 5) -> Dict[str, float]:
+    """
+    Time the vectorized per-crew totals over synthetic legs.
+
+    Args:
+        legs: Legs in the batch
+        legs_per_crew: Legs per crew member
+        runs: Timed passes (the best is reported)
+
+    Returns:
+        Seconds to build the batch and for the best pass of pay totals
+        (flight time, premiums, per diem) and duty checks
+    """
+    started = time.perf_counter()
+    batch = synthetic_batch(legs, legs_per_crew)
+    build_seconds = time.perf_counter() - started
+
+    pay, duty = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        batch.flight_totals()
+        batch.premium_totals()
+        batch.per_diem_totals()
+        pay.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        batch.duty_checks()
+        duty.append(time.perf_counter() - started)
+
+    return {
+        "legs": len(batch),
+        "crew_members": batch.n_crew,
+        "build_seconds": build_seconds,
+        "pay_seconds": min(pay),
+        "duty_seconds": min(duty),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--flights", type=int, default=60)
+    parser.add_argument("--checkpoint", action="store_true")
+    parser.add_argument("--batch-legs", type=int, default=0)
+    parser.add_argument("--legs-per-crew", type=int, default=50)
+    args = parser.parse_args()
+
+    # Agents need ANTHROPIC_API_KEY even though the benchmark never calls Claude
+    load_dotenv()
+    logging.basicConfig(level=logging.WARNING)
+    if args.batch_legs:
+        stats = batch_run(args.batch_legs, args.legs_per_crew)
+        print(
+            f"{stats['legs']} legs, {stats['crew_members']} crew members: "
+            f"build {stats['build_seconds']:.3f}s, pay totals {stats['pay_seconds']:.3f}s, "
+            f"duty checks {stats['duty_seconds']:.3f}s"
+        )
+        return
+
+    stats = run(args.runs, args.flights, args.checkpoint)
+    print(
+        f"{args.runs} runs, {args.flights} flights, "
+        f"checkpoint={'on' if args.checkpoint else 'off'}: "
+        f"{stats['ms_per_run']:.3f} ms/run, {stats['ms_per_node']:.3f} ms/node "
+        f"({stats['nodes_per_run']} nodes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
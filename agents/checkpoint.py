@@ -0,0 +1,89 @@
+"""
+Workflow checkpointing.
+
+Durable LangGraph checkpoints for the crew pay workflow, keyed by
+execution_id, so a run whose node failed can be resumed from that node
+with the earlier nodes' outputs restored instead of re-running them.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite import JsonPlusSerializerCompat, SqliteSaver
+
+from .flight_record import FlightRecord
+
+
+class WorkflowSerializer(JsonPlusSerializerCompat):
+    """Checkpoint serializer that also understands FlightRecord, date and Decimal."""
+
+    def _default(self, obj: Any) -> Any:
+        if isinstance(obj, FlightRecord):
+            return self._encode_constructor_args(
+                FlightRecord, method="from_dict", args=[obj.to_dict()]
+            )
+        if isinstance(obj, date) and not isinstance(obj, datetime):
+            return self._encode_constructor_args(
+                date, method="fromisoformat", args=[obj.isoformat()]
+            )
+        if isinstance(obj, Decimal):
+            return self._encode_constructor_args(Decimal, args=[str(obj)])
+        return super()._default(obj)
+
+
+def create_checkpointer(path: str) -> SqliteSaver:
+    """
+    Open (or create) a SQLite checkpoint store.
+
+    Args:
+        path: Database file path (":memory:" for a process-local store)
+
+    Returns:
+        Checkpointer to pass to CrewPayOrchestrator
+    """
+    saver = SqliteSaver.from_conn_string(path)
+    saver.serde = WorkflowSerializer()
+    return saver
+
+
+def thread_config(execution_id: str, checkpoint_id: Optional[str] = None) -> dict:
+    """LangGraph config addressing an execution's checkpoints."""
+    configurable = {"thread_id": execution_id}
+    if checkpoint_id:
+        configurable["thread_ts"] = checkpoint_id
+    return {"configurable": configurable}
+
+
+def first_failed_step(history: List[Any]) -> Optional[Any]:
+    """
+    Find the checkpoint to resume a failed run from.
+
+    Nodes record failures in error_log rather than raising, so the run
+    completes; the failed node is the first one whose step grew error_log.
+
+    Args:
+        history: StateSnapshots of one execution, oldest first
+
+    Returns:
+        Snapshot taken just before the first failed node ran, or None if no
+        node failed
+    """
+    for before, after in zip(history, history[1:]):
+        if not before.next:
+            continue
+        errors_before = len(before.values.get("error_log") or [])
+        errors_after = len(after.values.get("error_log") or [])
+        if errors_after > errors_before:
+            return before
+    return None
+
+
+def discard_checkpoints(saver: Any, execution_id: str) -> None:
+    """Delete an execution's checkpoints (once it no longer needs resuming)."""
+    if isinstance(saver, SqliteSaver):
+        with saver.lock, saver.cursor() as cur:
+            cur.execute("DELETE FROM checkpoints WHERE thread_id = ?", (execution_id,))
+    elif isinstance(saver, MemorySaver):
+        saver.storage.pop(execution_id, None)
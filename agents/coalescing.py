@@ -0,0 +1,120 @@
+"""
+Cross-crew request coalescing.
+
+Crew members flying together share legs: every crew member on a trip sees
+the same times, route and flags. A Coalescer installed for a batch run
+(with coalescing_scope) lets agents compute such crew-neutral
+sub-results once, keyed by their content, and share them across the
+crew members in the batch; crew-specific rates are applied locally
+afterwards.
+"""
+
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from .flight_record import FlightRecord
+
+_coalescer: ContextVar[Optional["Coalescer"]] = ContextVar("agent_coalescer", default=None)
+
+
+class Coalescer:
+    """Compute each keyed sub-result once and share it (thread-safe)."""
+
+    def __init__(self):
+        self._results: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.computed = 0
+        self.shared = 0
+
+    def get_many(
+        self,
+        keys: Sequence[Hashable],
+        compute: Callable[[List[Hashable]], Dict[Hashable, Any]],
+    ) -> Dict[Hashable, Any]:
+        """
+        Get results for keys, computing only those nobody has claimed yet.
+
+        Missing keys are claimed and computed together in one compute call
+        (before waiting on keys other callers are computing, so callers
+        never wait on each other in a cycle). If compute fails, its keys are
+        released so a later caller can retry them.
+
+        Args:
+            keys: Sub-computation keys
+            compute: Computes results for a list of claimed keys
+
+        Returns:
+            Result per key
+
+        Raises:
+            Exception: Whatever compute raised, for this caller's keys or
+                keys another caller was computing
+        """
+        owned: Dict[Hashable, Future] = {}
+        futures: Dict[Hashable, Future] = {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                future = self._results.get(key)
+                if future is None:
+                    future = owned[key] = self._results[key] = Future()
+                else:
+                    self.shared += 1
+                futures[key] = future
+            self.computed += len(owned)
+
+        if owned:
+            try:
+                results = compute(list(owned))
+                for key, future in owned.items():
+                    future.set_result(results[key])
+            except BaseException as e:
+                with self._lock:
+                    for key in owned:
+                        self._results.pop(key, None)
+                for future in owned.values():
+                    if not future.done():
+                        future.set_exception(e)
+                raise
+
+        return {key: future.result() for key, future in futures.items()}
+
+    def stats(self) -> Dict[str, int]:
+        """Sub-results computed and sub-results served from another crew member's call."""
+        return {"computed": self.computed, "shared": self.shared}
+
+
+def trip_signature(legs: Sequence[FlightRecord]) -> Tuple[Any, ...]:
+    """Content key for a trip: everything crew-neutral that a calculation reads."""
+    return tuple(
+        (
+            leg.key,
+            leg.scheduled_departure,
+            leg.actual_departure,
+            leg.scheduled_arrival,
+            leg.actual_arrival,
+            leg.scheduled_block_centihours,
+            leg.actual_block_centihours,
+            leg.is_international,
+            leg.is_redeye,
+            leg.is_deadhead,
+        )
+        for leg in legs
+    )
+
+
+@contextmanager
+def coalescing_scope(coalescer: Optional[Coalescer]) -> Iterator[None]:
+    """Share sub-computations of agent calls made inside the block through coalescer."""
+    token = _coalescer.set(coalescer)
+    try:
+        yield
+    finally:
+        _coalescer.reset(token)
+
+
+def current_coalescer() -> Optional[Coalescer]:
+    """Coalescer installed by the innermost coalescing_scope, if any."""
+    return _coalescer.get()
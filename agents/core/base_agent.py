@@ -8,24 +8,101 @@ Provides common functionality:
 - Structured outputs
 """
 
+import contextvars
+import functools
 import os
 import logging
 import json
-from typing import Dict, Any, Optional, Type
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
 from datetime import datetime
 from decimal import Decimal
 
 from anthropic import Anthropic
-from openai import OpenAI
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError, create_model
+
+from ..llm_health import claude_circuit
+from .call_policy import (
+    CallDeadlineExceeded,
+    CallPolicy,
+    LatencyTracker,
+    ModelTiers,
+    is_transient,
+    remaining_time,
+)
+from .json_stream import IncrementalJSONParser, current_field_listener, parse_json_response
 
 
 logger = logging.getLogger(__name__)
 
+# Tool the model calls with its result in structured-output mode
+OUTPUT_TOOL_NAME = "record_result"
+
+# The prompts' "OUTPUT FORMAT" schema block, redundant once the schema is a tool
+_FORMAT_BLOCK = re.compile(r"(?:OUTPUT FORMAT:\n)?Return a JSON object with:\n\{\n.*?\n\}\n", re.S)
+
+# Threads for hedged requests (shared by all agents)
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    if _hedge_executor is None:
+        _hedge_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("CLAUDE_HEDGE_WORKERS", "16")),
+            thread_name_prefix="claude-hedge",
+        )
+    return _hedge_executor
+
+
+def _content_block(block: Any) -> Dict[str, Any]:
+    """Response content block as a request message block."""
+    if block.type == "tool_use":
+        return {"type": "tool_use", "id": block.id, "name": block.name, "input": block.input}
+    return {"type": "text", "text": block.text}
+
+
+@functools.lru_cache(maxsize=None)
+def _required_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """model restricted to fields, for a streamed response cut off after them."""
+    return create_model(
+        f"Required{model.__name__}",
+        __config__=model.model_config,
+        **{
+            name: (info.annotation, info)
+            for name, info in model.model_fields.items()
+            if name in fields
+        },
+    )
+
+
+# Threads for chunks of one agent call run concurrently (shared by all agents)
+_chunk_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_chunk_executor() -> ThreadPoolExecutor:
+    global _chunk_executor
+    if _chunk_executor is None:
+        _chunk_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("CLAUDE_CHUNK_WORKERS", "8")),
+            thread_name_prefix="claude-chunk",
+        )
+    return _chunk_executor
+
 
 class BaseAgent:
     """Base class for all crew pay calculation agents."""
 
+    # Top-level response fields downstream code needs; a streamed response
+    # is cut off once all are parsed (None: read the whole object)
+    required_fields: Optional[Tuple[str, ...]] = None
+
+    # Pydantic model every response is validated against (None: unchecked JSON)
+    output_model: Optional[Type[BaseModel]] = None
+
     def __init__(self, agent_name: str, temperature: float = 0.1):
         """
         Initialize the base agent.
@@ -37,6 +114,9 @@ class BaseAgent:
         self.agent_name = agent_name
         self.temperature = temperature
         self.client = self._initialize_client()
+        self.policy = CallPolicy.from_env(agent_name)
+        self.tiers = ModelTiers.from_env()
+        self.latency = LatencyTracker()
 
         # Configure logging
         self.logger = logging.getLogger(f"agents.{agent_name}")
@@ -47,7 +127,8 @@ class BaseAgent:
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
-        return Anthropic(api_key=api_key)
+        # Retries are handled by call_claude's policy, not the SDK
+        return Anthropic(api_key=api_key, max_retries=0)
 
     def call_claude(
         self,
@@ -55,58 +136,353 @@ class BaseAgent:
         user_message: str,
         response_model: Optional[Type[BaseModel]] = None,
         max_tokens: int = 4096,
+        stream: Optional[bool] = None,
+        escalate: bool = False,
+        accept: Optional[Callable[[Dict[str, Any]], bool]] = None,
     ) -> Dict[str, Any]:
         """
         Call Claude API with structured output.
 
+        The call starts on the agent's model tier (self.tiers). A fast-tier
+        result is redone on the strong model when its confidence_score is
+        below tiers.escalation_confidence, when accept rejects it (e.g. it
+        disagrees with a local calculation), or when its output stays
+        invalid after repair.
+
+        Transient failures are retried and slow calls hedged according to
+        self.policy; no attempt runs past the current node deadline.
+
+        With a response model (default: self.output_model) and
+        policy.structured on, the model's JSON schema is offered as a tool
+        that Claude must call, replacing the prompt's OUTPUT FORMAT block.
+        Either way the response is validated against the model once; if it
+        fails, the validation errors are sent back for a single repair
+        attempt.
+
+        In streaming mode the response is parsed as it arrives: each
+        completed top-level field goes to the current field_scope listener,
+        and generation stops as soon as self.required_fields are all parsed
+        (or the JSON object closes).
+
         Args:
             system_prompt: System prompt defining agent behavior
             user_message: User message with task details
             response_model: Pydantic model for structured response (optional)
             max_tokens: Maximum tokens in response
+            stream: Stream the response (default: self.policy.stream)
+            escalate: Go straight to the strong model (e.g. messy input)
+            accept: Check of a fast-tier result; False escalates
 
         Returns:
-            Parsed response as dictionary
+            Parsed response as dictionary (validated and with model defaults
+            filled in when there is a response model)
+
+        Raises:
+            ValidationError: If the repaired response is still invalid
         """
+        call = (system_prompt, user_message, response_model, max_tokens, stream)
+        claude_model = (
+            self.tiers.strong_model if escalate else self.tiers.model_for(self.agent_name)
+        )
+        if claude_model == self.tiers.strong_model:
+            return self._call_model(claude_model, *call)
+
+        try:
+            result = self._call_model(claude_model, *call)
+        except ValidationError as e:
+            reason = f"invalid output ({e.error_count()} errors)"
+        else:
+            reason = self._escalation_reason(result, accept)
+            if reason is None:
+                return result
+
+        self.logger.info(f"Escalating {self.agent_name} to {self.tiers.strong_model}: {reason}")
+        return self._call_model(self.tiers.strong_model, *call)
+
+    def _escalation_reason(
+        self, result: Dict[str, Any], accept: Optional[Callable[[Dict[str, Any]], bool]]
+    ) -> Optional[str]:
+        """Why a fast-tier result should be redone on the strong model (None: keep it)."""
+        confidence = result.get("confidence_score")
+        if isinstance(confidence, (int, float)) and confidence < self.tiers.escalation_confidence:
+            return f"confidence {confidence:.2f}"
+        if accept is not None and not accept(result):
+            return "result disagrees with local validation"
+        return None
+
+    @staticmethod
+    def _close_to(value: Any, expected: float, tolerance: float) -> bool:
+        """Whether a reported value is a number within tolerance (null or text: no)."""
+        try:
+            return abs(float(value) - expected) <= tolerance
+        except (TypeError, ValueError):
+            return False
+
+    def _call_model(
+        self,
+        claude_model: str,
+        system_prompt: str,
+        user_message: str,
+        response_model: Optional[Type[BaseModel]],
+        max_tokens: int,
+        stream: Optional[bool],
+    ) -> Dict[str, Any]:
+        """One call_claude attempt on a given model (see call_claude)."""
         try:
-            self.logger.info(f"Calling Claude API for {self.agent_name}")
+            self.logger.info(f"Calling Claude API for {self.agent_name} ({claude_model})")
 
+            model = response_model or self.output_model
+            streaming = self.policy.stream if stream is None else stream
             messages = [{"role": "user", "content": user_message}]
+            request = {
+                "model": claude_model,
+                "max_tokens": max_tokens,
+                "temperature": self.temperature,
+                "system": system_prompt,
+                "messages": messages,
+            }
+
+            if model is not None and self.policy.structured and not streaming:
+                return self._call_structured(model, request)
+
+            if streaming:
+                result, complete = self._create_with_policy(self._streaming_sender(), request)
+                reply = json.dumps(result)
+                if model is not None and not complete:
+                    # Cut off after required_fields: only those were generated
+                    model = _required_model(model, self.required_fields)
+            else:
+                response = self._create_with_policy(self._create, request)
 
-            response = self.client.messages.create(
-                model="claude-sonnet-4-5-20250929",
-                max_tokens=max_tokens,
-                temperature=self.temperature,
-                system=system_prompt,
-                messages=messages,
-            )
+                # Extract text content
+                reply = response.content[0].text
 
-            # Extract text content
-            content = response.content[0].text
+                self.logger.debug(f"Claude response: {reply[:200]}...")
 
-            self.logger.debug(f"Claude response: {content[:200]}...")
+                result = parse_json_response(reply)
 
-            # Parse JSON response
+            if model is None:
+                return result
             try:
-                parsed = json.loads(content)
-                return parsed
-            except json.JSONDecodeError:
-                # If not valid JSON, try to extract JSON from markdown code blocks
-                if "```json" in content:
-                    json_str = content.split("```json")[1].split("```")[0].strip()
-                    parsed = json.loads(json_str)
-                    return parsed
-                elif "```" in content:
-                    json_str = content.split("```")[1].split("```")[0].strip()
-                    parsed = json.loads(json_str)
-                    return parsed
-                else:
-                    raise ValueError(f"Could not parse JSON from response: {content[:200]}")
+                return self._validated(model, result)
+            except ValidationError as e:
+                self.logger.warning(f"{self.agent_name} response failed validation; repairing: {e}")
+                request["messages"] = messages + [
+                    {"role": "assistant", "content": reply},
+                    {
+                        "role": "user",
+                        "content": f"Your JSON failed validation:\n{e}\n"
+                        "Return the complete corrected JSON object.",
+                    },
+                ]
+                response = self._create_with_policy(self._create, request)
+                return self._validated(model, parse_json_response(response.content[0].text))
 
         except Exception as e:
             self.logger.error(f"Error calling Claude API: {str(e)}")
             raise
 
+    def _call_structured(self, model: Type[BaseModel], request: Dict[str, Any]) -> Dict[str, Any]:
+        """Request the response as a call to a tool whose input schema is the model."""
+        request = dict(
+            request,
+            system=_FORMAT_BLOCK.sub("", request["system"]).rstrip()
+            + f"\n\nReport your result by calling the {OUTPUT_TOOL_NAME} tool exactly once.",
+            tools=[
+                {
+                    "name": OUTPUT_TOOL_NAME,
+                    "description": f"Record the {self.agent_name} result.",
+                    "input_schema": model.model_json_schema(),
+                }
+            ],
+        )
+        response = self._create_with_policy(self._create, request)
+        try:
+            return self._validated(model, self._tool_input(response))
+        except (ValidationError, ValueError) as e:
+            self.logger.warning(f"{self.agent_name} tool output failed validation; repairing: {e}")
+            request["messages"] = request["messages"] + [
+                {"role": "assistant", "content": [_content_block(b) for b in response.content]},
+                {"role": "user", "content": self._repair_content(response, e)},
+            ]
+            response = self._create_with_policy(self._create, request)
+            return self._validated(model, self._tool_input(response))
+
+    @staticmethod
+    def _tool_input(response: Any) -> Dict[str, Any]:
+        """The output tool's input, or JSON from the text if the tool was not called."""
+        for block in response.content:
+            if block.type == "tool_use" and block.name == OUTPUT_TOOL_NAME:
+                return block.input
+        text = "".join(b.text for b in response.content if b.type == "text")
+        return parse_json_response(text)
+
+    @staticmethod
+    def _repair_content(response: Any, error: Exception) -> Any:
+        message = (
+            f"Output failed validation:\n{error}\n"
+            f"Call {OUTPUT_TOOL_NAME} again with corrected input."
+        )
+        for block in response.content:
+            if block.type == "tool_use":
+                return [
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": block.id,
+                        "content": message,
+                        "is_error": True,
+                    }
+                ]
+        return message
+
+    @staticmethod
+    def _validated(model: Type[BaseModel], data: Dict[str, Any]) -> Dict[str, Any]:
+        # Kept as plain dicts: workflow state is checkpointed and persisted as JSON
+        return model.model_validate(data).model_dump(exclude_none=True)
+
+    def _create_with_policy(
+        self, send: Callable[[Dict[str, Any], float], Any], request: Dict[str, Any]
+    ) -> Any:
+        """
+        Send a request with deadline, retries and backoff.
+
+        Each attempt's outcome feeds the process-wide Claude circuit
+        (agents.llm_health); only transient errors count as failures.
+        """
+        for attempt in range(self.policy.max_retries + 1):
+            remaining = remaining_time()
+            if remaining is not None and remaining <= 0:
+                raise CallDeadlineExceeded(f"{self.agent_name} node deadline exceeded")
+            timeout = self.policy.timeout_seconds
+            if remaining is not None:
+                timeout = min(timeout, remaining)
+
+            try:
+                response = self._create_hedged(send, request, timeout)
+            except Exception as e:
+                if is_transient(e):
+                    claude_circuit.record_failure(e)
+                if attempt == self.policy.max_retries or not is_transient(e):
+                    raise
+                delay = self.policy.backoff_delay(attempt)
+                remaining = remaining_time()
+                if remaining is not None and delay >= remaining:
+                    raise
+                self.logger.warning(
+                    f"Transient Claude error for {self.agent_name} "
+                    f"(attempt {attempt + 1}): {str(e)}; retrying in {delay:.2f}s"
+                )
+                time.sleep(delay)
+            else:
+                claude_circuit.record_success()
+                return response
+
+    def _create_hedged(
+        self, send: Callable[[Dict[str, Any], float], Any], request: Dict[str, Any], timeout: float
+    ) -> Any:
+        """
+        One attempt; if hedging is on and the call outlives the agent's p95
+        latency, send a duplicate and take whichever succeeds first.
+        """
+        hedge_after = self.latency.p95() or self.policy.hedge_after_seconds
+        if not self.policy.hedge or hedge_after >= timeout:
+            return send(request, timeout)
+
+        executor = _get_hedge_executor()
+        primary = executor.submit(send, request, timeout)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        self.logger.info(f"Hedging {self.agent_name} call after {hedge_after:.1f}s")
+        pending = {primary, executor.submit(send, request, timeout - hedge_after)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    error = e
+        raise error
+
+    def _create(self, request: Dict[str, Any], timeout: float) -> Any:
+        started = time.monotonic()
+        # Tool use is only exposed on the beta tools endpoint in this SDK
+        messages = self.client.beta.tools.messages if "tools" in request else self.client.messages
+        response = messages.create(**request, timeout=timeout)
+        self.latency.record(time.monotonic() - started)
+        return response
+
+    def _streaming_sender(
+        self,
+    ) -> Callable[[Dict[str, Any], float], Tuple[Dict[str, Any], bool]]:
+        """
+        Build a send function that streams and parses the response.
+
+        The send function returns the parsed fields and whether the JSON
+        object was complete (False: generation was stopped once
+        required_fields were parsed).
+
+        The field listener is captured here because hedged attempts run on
+        other threads; fields are delivered once even if both attempts
+        produce them.
+        """
+        listener = current_field_listener()
+        delivered = set()
+        lock = threading.Lock()
+
+        def deliver(name: str, value: Any) -> None:
+            with lock:
+                if name in delivered:
+                    return
+                delivered.add(name)
+            listener(name, value)
+
+        def send(request: Dict[str, Any], timeout: float) -> Tuple[Dict[str, Any], bool]:
+            parser = IncrementalJSONParser()
+            started = time.monotonic()
+            with self.client.messages.stream(**request, timeout=timeout) as stream:
+                for text in stream.text_stream:
+                    for name, value in parser.feed(text):
+                        if listener is not None:
+                            deliver(name, value)
+                    if parser.complete or (
+                        self.required_fields and parser.has_fields(self.required_fields)
+                    ):
+                        # Leaving the block closes the connection, which
+                        # stops generation of anything still to come
+                        break
+            self.latency.record(time.monotonic() - started)
+            stopped_early = bool(self.required_fields) and parser.has_fields(self.required_fields)
+            return parser.result(partial=stopped_early), parser.complete
+
+        return send
+
+    def map_chunks(
+        self, calculate: Callable[[Any], Dict[str, Any]], chunks: Sequence[Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Run calculate over input chunks concurrently.
+
+        Each chunk runs with a copy of the caller's context, so the node
+        deadline and field listener still apply.
+
+        Args:
+            calculate: Calculation for one chunk
+            chunks: Input chunks
+
+        Returns:
+            Results in chunk order (independent of completion order)
+        """
+        if len(chunks) == 1:
+            return [calculate(chunks[0])]
+        executor = _get_chunk_executor()
+        futures = [
+            executor.submit(contextvars.copy_context().run, calculate, chunk) for chunk in chunks
+        ]
+        return [future.result() for future in futures]
+
     def log_execution(
         self,
         execution_id: str,
@@ -184,3 +560,18 @@ class BaseAgent:
             NotImplementedError: Must be implemented by subclass
         """
         raise NotImplementedError("Subclasses must implement calculate()")
+
+    def trivial_result(self, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Result of calculate() when the input determines it without Claude.
+
+        The orchestrator uses this to route around nodes for empty or
+        trivial periods (no flights, no layovers, ...).
+
+        Args:
+            input_data: Input data, as for calculate()
+
+        Returns:
+            The result, or None if Claude is needed
+        """
+        return None
@@ -0,0 +1,175 @@
+"""
+Resilience policy for Claude API calls.
+
+Per-call deadlines, retries with jittered exponential backoff on transient
+errors, and optional hedged duplicate requests once a call runs past the
+agent's observed p95 latency. The orchestrator sets a per-node deadline
+(derived from the per-crew SLA) with deadline_scope(); call_claude never
+waits past it.
+
+Policies are read from the environment. Each setting can be overridden per
+agent by suffixing the agent name, e.g. CLAUDE_TIMEOUT_SECONDS_COMPLIANCEVALIDATOR.
+
+ModelTiers routes simple agents to a faster model and escalates to the
+larger one when a fast-tier answer looks unreliable.
+"""
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import FrozenSet, Iterator, Optional
+
+from anthropic import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
+
+# HTTP statuses worth retrying (529 = overloaded)
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Latency samples kept per agent, and the minimum before p95 is trusted
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+
+_deadline: ContextVar[Optional[float]] = ContextVar("claude_call_deadline", default=None)
+
+
+class CallDeadlineExceeded(TimeoutError):
+    """The node's deadline passed before the call could complete."""
+
+
+def _env(name: str, agent_name: str, default: str) -> str:
+    return os.getenv(f"{name}_{agent_name.upper()}", os.getenv(name, default))
+
+
+@dataclass(frozen=True)
+class CallPolicy:
+    """How one agent calls Claude."""
+
+    timeout_seconds: float = 60.0  # per attempt
+    max_retries: int = 2
+    backoff_base_seconds: float = 0.5
+    backoff_max_seconds: float = 8.0
+    hedge: bool = False
+    hedge_after_seconds: float = 20.0  # used until enough latency samples exist
+    stream: bool = False
+    # Tool-use output validated against the agent's model. Off by default:
+    # the pinned SDK (anthropic 0.25) only offers tools on the deprecated
+    # beta endpoint; turn on once the pin has GA messages.create(tools=...)
+    structured: bool = False
+    prompt_token_budget: int = 6000  # flight data per prompt before chunking
+    max_flights_per_prompt: int = 25  # keeps per-flight output within max_tokens
+
+    @classmethod
+    def from_env(cls, agent_name: str) -> "CallPolicy":
+        """Build the policy for an agent from CLAUDE_* environment variables."""
+        return cls(
+            timeout_seconds=float(_env("CLAUDE_TIMEOUT_SECONDS", agent_name, "60")),
+            max_retries=int(_env("CLAUDE_MAX_RETRIES", agent_name, "2")),
+            backoff_base_seconds=float(_env("CLAUDE_BACKOFF_BASE_SECONDS", agent_name, "0.5")),
+            backoff_max_seconds=float(_env("CLAUDE_BACKOFF_MAX_SECONDS", agent_name, "8")),
+            hedge=_env("CLAUDE_HEDGE", agent_name, "false").lower() in ("1", "true", "yes"),
+            hedge_after_seconds=float(_env("CLAUDE_HEDGE_AFTER_SECONDS", agent_name, "20")),
+            stream=_env("CLAUDE_STREAM", agent_name, "false").lower() in ("1", "true", "yes"),
+            structured=_env("CLAUDE_STRUCTURED_OUTPUT", agent_name, "false").lower()
+            in ("1", "true", "yes"),
+            prompt_token_budget=int(_env("CLAUDE_PROMPT_TOKEN_BUDGET", agent_name, "6000")),
+            max_flights_per_prompt=int(_env("CLAUDE_MAX_FLIGHTS_PER_PROMPT", agent_name, "25")),
+        )
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number attempt + 1."""
+        ceiling = min(self.backoff_max_seconds, self.backoff_base_seconds * 2**attempt)
+        return random.uniform(0, ceiling)
+
+
+@dataclass(frozen=True)
+class ModelTiers:
+    """Which Claude model each agent uses, and when to escalate."""
+
+    fast_model: str = "claude-haiku-4-5-20251001"
+    strong_model: str = "claude-sonnet-4-5-20250929"
+    # Agents whose calls start on the fast model
+    fast_agents: FrozenSet[str] = frozenset(
+        {"FlightTimeCalculator", "GuaranteeCalculator", "PerDiemCalculator"}
+    )
+    # Fast-tier results below this confidence are redone on the strong model
+    escalation_confidence: float = 0.85
+
+    @classmethod
+    def from_env(cls) -> "ModelTiers":
+        """Build the tiers from CLAUDE_*_MODEL environment variables."""
+        default = cls()
+        fast_agents = os.getenv("CLAUDE_FAST_AGENTS")
+        return cls(
+            fast_model=os.getenv("CLAUDE_FAST_MODEL", default.fast_model),
+            strong_model=os.getenv("CLAUDE_STRONG_MODEL", default.strong_model),
+            fast_agents=(
+                default.fast_agents
+                if fast_agents is None
+                else frozenset(name.strip() for name in fast_agents.split(",") if name.strip())
+            ),
+            escalation_confidence=float(
+                os.getenv("CLAUDE_ESCALATION_CONFIDENCE", str(default.escalation_confidence))
+            ),
+        )
+
+    def model_for(self, agent_name: str) -> str:
+        """Model an agent's calls start on."""
+        return self.fast_model if agent_name in self.fast_agents else self.strong_model
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies (thread-safe)."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def p95(self) -> Optional[float]:
+        """95th percentile latency, or None until enough samples exist."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        return samples[int(0.95 * (len(samples) - 1))]
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether a failed call is worth retrying."""
+    if isinstance(
+        error, (APITimeoutError, APIConnectionError, RateLimitError, InternalServerError)
+    ):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code in TRANSIENT_STATUS_CODES
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Bound every Claude call made inside the block to finish within seconds."""
+    if seconds is None:
+        yield
+        return
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or None if there is none."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
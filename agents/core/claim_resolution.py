@@ -8,12 +8,32 @@ import time
 from typing import Dict, Any, List
 
 from .base_agent import BaseAgent
+from .output_models import ClaimResolutionOutput
+from ..flight_record import FlightRecord, as_flight_records
+from ..prompt_encoding import (
+    ACT_ARR,
+    ACT_BLOCK,
+    ACT_DEP,
+    DATE,
+    FLIGHT,
+    ROUTE,
+    TABLE_LEGEND,
+    encode_daily_totals,
+    encode_flights,
+    estimate_tokens,
+)
 from ..prompts.claim_resolution_prompts import CLAIM_RESOLUTION_SYSTEM_PROMPT
 
 
+# Flight columns relevant to a pay claim
+CLAIM_COLUMNS = (FLIGHT, DATE, ROUTE, ACT_DEP, ACT_ARR, ACT_BLOCK)
+
+
 class ClaimResolutionAgent(BaseAgent):
     """Agent for resolving crew pay claims."""
 
+    output_model = ClaimResolutionOutput
+
     def __init__(self):
         super().__init__(agent_name="ClaimResolutionAgent", temperature=0.1)
 
@@ -26,6 +46,7 @@ class ClaimResolutionAgent(BaseAgent):
                 - crew_member_data: Crew member profile
                 - claim_data: Claim details
                 - flight_assignments: Flight data
+                - flight_records: Pre-parsed flights (optional, preferred)
                 - pay_calculations: Current pay calculations
                 - execution_id: Execution tracking ID
 
@@ -37,7 +58,10 @@ class ClaimResolutionAgent(BaseAgent):
         try:
             crew_member = input_data.get("crew_member_data", {})
             claim_data = input_data.get("claim_data", {})
-            flight_assignments = input_data.get("flight_assignments", [])
+            flight_assignments = as_flight_records(
+                input_data.get("flight_records")
+                or input_data.get("flight_assignments", [])
+            )
             pay_calculations = input_data.get("pay_calculations", {})
             execution_id = input_data.get("execution_id")
 
@@ -120,7 +144,7 @@ Return results in the specified JSON format."""
         self,
         claim_data: Dict[str, Any],
         crew_member: Dict[str, Any],
-        flight_assignments: List[Dict[str, Any]],
+        flight_assignments: List[FlightRecord],
         pay_calculations: Dict[str, Any],
     ) -> str:
         """Prepare investigation data summary."""
@@ -147,20 +171,25 @@ CURRENT PAY CALCULATIONS:
 - Total Pay: ${pay_calculations.get('total_pay', 0):.2f}
 """
 
-    def _format_flight_data(self, flights: List[Dict[str, Any]]) -> str:
-        """Format flight data for investigation."""
+    def _format_flight_data(self, flights: List[FlightRecord]) -> str:
+        """
+        Format flight data for investigation.
+
+        Every flight is included as a compact table row; if the table would
+        exceed the prompt budget, flights are summarized per day instead so
+        no part of the period is dropped.
+        """
         if not flights:
             return "No flight data available"
 
-        flight_lines = []
-        for flight in flights[:10]:  # Limit to 10 flights
-            flight_lines.append(
-                f"- {flight.get('flight_number')} on {flight.get('flight_date')}: "
-                f"{flight.get('origin_airport')}→{flight.get('destination_airport')} "
-                f"({flight.get('actual_block_time', 0):.2f} hrs)"
-            )
+        table = encode_flights(flights, CLAIM_COLUMNS)
+        if estimate_tokens(table) <= self.policy.prompt_token_budget:
+            return f"({TABLE_LEGEND})\n{table}"
 
-        return "\n".join(flight_lines)
+        self.logger.info(f"Summarizing {len(flights)} flights by day for claim prompt")
+        return f"Daily totals for all {len(flights)} flights (hours):\n" + encode_daily_totals(
+            flights
+        )
 
     def _no_claims_result(self) -> Dict[str, Any]:
         """Return result when no claims to process."""
@@ -5,16 +5,20 @@ Tracks and enforces FAA Part 117 duty time and rest requirements.
 """
 
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 
 from .base_agent import BaseAgent
+from .output_models import DutyTimeOutput
+from ..flight_record import FlightRecord, as_flight_records
 from ..prompts.duty_time_prompts import DUTY_TIME_SYSTEM_PROMPT
 
 
 class DutyTimeMonitor(BaseAgent):
     """Agent for monitoring FAA Part 117 compliance."""
 
+    output_model = DutyTimeOutput
+
     def __init__(self):
         super().__init__(agent_name="DutyTimeMonitor", temperature=0.1)
 
@@ -26,6 +30,7 @@ class DutyTimeMonitor(BaseAgent):
             input_data: Dictionary containing:
                 - crew_member_data: Crew member profile
                 - flight_assignments: List of flights
+                - flight_records: Pre-parsed flights (optional, preferred)
                 - historical_duty_data: Past 30 days duty history (optional)
                 - execution_id: Execution tracking ID
 
@@ -36,13 +41,17 @@ class DutyTimeMonitor(BaseAgent):
 
         try:
             crew_member = input_data.get("crew_member_data", {})
-            flights = input_data.get("flight_assignments", [])
+            flights = as_flight_records(
+                input_data.get("flight_records")
+                or input_data.get("flight_assignments", [])
+            )
             historical_data = input_data.get("historical_duty_data", [])
             execution_id = input_data.get("execution_id")
 
-            if not flights:
+            trivial = self.trivial_result(input_data)
+            if trivial is not None:
                 self.logger.warning("No flight assignments to monitor")
-                return self._empty_result()
+                return trivial
 
             # Prepare duty period data
             duty_summary = self._prepare_duty_data(flights)
@@ -117,26 +126,32 @@ Return results in the specified JSON format."""
             )
             raise
 
-    def _prepare_duty_data(self, flights: List[Dict[str, Any]]) -> str:
+    def trivial_result(self, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Empty, compliant result when there are no flights."""
+        if input_data.get("flight_records") or input_data.get("flight_assignments"):
+            return None
+        return self._empty_result()
+
+    def _prepare_duty_data(self, flights: List[FlightRecord]) -> str:
         """Format duty period data for Claude prompt."""
         # Group flights by duty period (trip_id)
         trips = {}
-        for flight in flights:
-            trip_id = flight.get("trip_id", "UNKNOWN")
+        for flight in as_flight_records(flights):
+            trip_id = flight.trip_id or "UNKNOWN"
             if trip_id not in trips:
                 trips[trip_id] = []
             trips[trip_id].append(flight)
 
         trip_lines = []
         for trip_id, trip_flights in trips.items():
-            trip_flights.sort(key=lambda f: f.get("sequence_number", 0))
+            trip_flights.sort(key=lambda f: f.sequence_number or 0)
 
             first_flight = trip_flights[0]
             last_flight = trip_flights[-1]
 
-            report_time = first_flight.get("duty_report_time", "N/A")
-            release_time = last_flight.get("duty_end_time", "N/A")
-            fdp_hours = first_flight.get("flight_duty_period", "N/A")
+            report_time = first_flight.duty_report_time or "N/A"
+            release_time = last_flight.duty_end_time or "N/A"
+            fdp_hours = first_flight.flight_duty_period
             num_segments = len(trip_flights)
 
             trip_lines.append(
@@ -144,9 +159,9 @@ Return results in the specified JSON format."""
 Trip {trip_id}:
 - Duty Report: {report_time}
 - Duty Release: {release_time}
-- FDP Hours: {fdp_hours}
+- FDP Hours: {'N/A' if fdp_hours is None else fdp_hours}
 - Number of Segments: {num_segments}
-- Flights: {', '.join([f.get('flight_number') for f in trip_flights])}
+- Flights: {', '.join([f.flight_number for f in trip_flights])}
 """
             )
 
@@ -5,17 +5,56 @@ Calculates flight pay based on block time from ACARS data.
 """
 
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence
 from datetime import datetime
 from decimal import Decimal
 
 from .base_agent import BaseAgent
+from .output_models import FlightTimeOutput
+from ..flight_record import HOURS_SCALE, FlightRecord, as_flight_records
+from ..prompt_encoding import (
+    ACT_ARR,
+    ACT_BLOCK,
+    ACT_DEP,
+    DATE,
+    FLIGHT,
+    POSITION,
+    ROUTE,
+    SCHED_ARR,
+    SCHED_BLOCK,
+    SCHED_DEP,
+    TABLE_LEGEND,
+    encode_flights,
+    trip_chunks,
+)
 from ..prompts.flight_time_prompts import FLIGHT_TIME_SYSTEM_PROMPT
 
 
+# Columns the flight time prompt needs, one row per flight
+FLIGHT_COLUMNS = (
+    FLIGHT,
+    DATE,
+    ROUTE,
+    SCHED_DEP,
+    ACT_DEP,
+    SCHED_ARR,
+    ACT_ARR,
+    SCHED_BLOCK,
+    ACT_BLOCK,
+    POSITION,
+)
+
+# Disagreement that sends a fast-tier result to the strong model
+BLOCK_TOLERANCE_CENTIHOURS = 10  # recorded block time vs actual times
+CREDIT_TOLERANCE_HOURS = 0.05
+PAY_TOLERANCE = 1.00
+
+
 class FlightTimeCalculator(BaseAgent):
     """Agent for calculating flight time and flight pay."""
 
+    output_model = FlightTimeOutput
+
     def __init__(self):
         super().__init__(agent_name="FlightTimeCalculator", temperature=0.1)
 
@@ -27,6 +66,7 @@ class FlightTimeCalculator(BaseAgent):
             input_data: Dictionary containing:
                 - crew_member_data: Crew member profile
                 - flight_assignments: List of flights
+                - flight_records: Pre-parsed flights (optional, preferred)
                 - execution_id: Execution tracking ID
 
         Returns:
@@ -36,57 +76,34 @@ class FlightTimeCalculator(BaseAgent):
 
         try:
             crew_member = input_data.get("crew_member_data", {})
-            flights = input_data.get("flight_assignments", [])
+            flights = as_flight_records(
+                input_data.get("flight_records")
+                or input_data.get("flight_assignments", [])
+            )
             execution_id = input_data.get("execution_id")
 
-            if not flights:
+            trivial = self.trivial_result(input_data)
+            if trivial is not None:
                 self.logger.warning("No flight assignments provided")
-                return {
-                    "flights": [],
-                    "totals": {
-                        "total_flights": 0,
-                        "total_actual_hours": 0.0,
-                        "total_credit_hours": 0.0,
-                        "hourly_rate": float(crew_member.get("hourly_rate", 0)),
-                        "total_flight_pay": 0.0,
-                    },
-                    "discrepancies": [],
-                    "confidence_score": 1.0,
-                }
-
-            # Prepare flight data for Claude
-            flight_summary = self._prepare_flight_data(flights, crew_member)
-
-            # Create user message
-            user_message = f"""Calculate flight time and pay for the following crew member and flights:
-
-CREW MEMBER:
-- Employee ID: {crew_member.get('employee_id')}
-- Name: {crew_member.get('first_name')} {crew_member.get('last_name')}
-- Role: {crew_member.get('role')}
-- Hourly Rate: ${crew_member.get('hourly_rate')}
-
-FLIGHTS:
-{flight_summary}
+                return trivial
 
-CONTRACT RULES:
-- Minimum credit per segment: 1.0 hour
-- Credit hours = MAX(actual block time, minimum credit)
-- Flight pay = Total credit hours × Hourly rate
-
-Please calculate:
-1. Block time for each flight (actual arrival - actual departure)
-2. Credit hours (apply 1.0 hour minimum per segment)
-3. Total flight pay
-4. Flag any discrepancies or data quality issues
-
-Return results in the specified JSON format."""
-
-            # Call Claude
-            result = self.call_claude(
-                system_prompt=FLIGHT_TIME_SYSTEM_PROMPT,
-                user_message=user_message,
-                max_tokens=4096,
+            # Large rosters are split into whole trips, calculated
+            # concurrently and merged
+            chunks = trip_chunks(
+                flights,
+                FLIGHT_COLUMNS,
+                self.policy.prompt_token_budget,
+                self.policy.max_flights_per_prompt,
+            )
+            if len(chunks) > 1:
+                self.logger.info(
+                    f"Splitting {len(flights)} flights into {len(chunks)} prompts"
+                )
+            result = self._merge_results(
+                self.map_chunks(
+                    lambda chunk: self._calculate_chunk(chunk, crew_member), chunks
+                ),
+                crew_member,
             )
 
             # Log execution
@@ -116,35 +133,128 @@ Return results in the specified JSON format."""
             )
             raise
 
+    def trivial_result(self, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Zero totals when there are no flights."""
+        if input_data.get("flight_records") or input_data.get("flight_assignments"):
+            return None
+        crew_member = input_data.get("crew_member_data", {})
+        return {
+            "flights": [],
+            "totals": {
+                "total_flights": 0,
+                "total_actual_hours": 0.0,
+                "total_credit_hours": 0.0,
+                "hourly_rate": float(crew_member.get("hourly_rate", 0)),
+                "total_flight_pay": 0.0,
+            },
+            "discrepancies": [],
+            "confidence_score": 1.0,
+        }
+
+    def _calculate_chunk(
+        self, flights: Sequence[FlightRecord], crew_member: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Calculate flight time and pay for one prompt's worth of flights."""
+        # Prepare flight data for Claude
+        flight_summary = self._prepare_flight_data(flights, crew_member)
+
+        # Create user message
+        user_message = f"""Calculate flight time and pay for the following crew member and flights:
+
+CREW MEMBER:
+- Employee ID: {crew_member.get('employee_id')}
+- Name: {crew_member.get('first_name')} {crew_member.get('last_name')}
+- Role: {crew_member.get('role')}
+- Hourly Rate: ${crew_member.get('hourly_rate')}
+
+FLIGHTS ({TABLE_LEGEND}):
+{flight_summary}
+
+CONTRACT RULES:
+- Minimum credit per segment: 1.0 hour
+- Credit hours = MAX(actual block time, minimum credit)
+- Flight pay = Total credit hours × Hourly rate
+
+Please calculate:
+1. Block time for each flight (actual arrival - actual departure)
+2. Credit hours (apply 1.0 hour minimum per segment)
+3. Total flight pay
+4. Flag any discrepancies or data quality issues
+
+Return results in the specified JSON format."""
+
+        # Call Claude; flights with missing or inconsistent times go straight
+        # to the strong model, and totals must match the local credit math
+        return self.call_claude(
+            system_prompt=FLIGHT_TIME_SYSTEM_PROMPT,
+            user_message=user_message,
+            max_tokens=4096,
+            escalate=self._has_data_issues(flights),
+            accept=lambda result: self._totals_match(result, flights, crew_member),
+        )
+
+    def _has_data_issues(self, flights: Sequence[FlightRecord]) -> bool:
+        """Whether any flight lacks actual times or its block time disagrees with them."""
+        for flight in flights:
+            if not flight.actual_departure or not flight.actual_arrival:
+                return True
+            if flight.actual_block_centihours is not None:
+                timed = (flight.actual_arrival - flight.actual_departure).total_seconds() / 36
+                if abs(timed - flight.actual_block_centihours) > BLOCK_TOLERANCE_CENTIHOURS:
+                    return True
+        return False
+
+    def _totals_match(
+        self, result: Dict[str, Any], flights: Sequence[FlightRecord], crew_member: Dict[str, Any]
+    ) -> bool:
+        """Whether Claude's totals agree with credit hours computed locally."""
+        totals = result.get("totals") or {}
+        credit_hours = sum(flight.credit_centihours for flight in flights) / HOURS_SCALE
+        flight_pay = credit_hours * float(crew_member.get("hourly_rate") or 0)
+        return (
+            self._close_to(totals.get("total_credit_hours"), credit_hours, CREDIT_TOLERANCE_HOURS)
+            and self._close_to(totals.get("total_flight_pay"), flight_pay, PAY_TOLERANCE)
+        )
+
+    def _merge_results(
+        self, results: List[Dict[str, Any]], crew_member: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Combine per-chunk results into one period result.
+
+        Lists are concatenated in chunk (chronological trip) order and
+        totals re-summed in that order, so the merge does not depend on
+        which chunk finished first. Flight pay is recomputed from the
+        combined credit hours, so rounding matches a single-prompt
+        calculation.
+        """
+        if len(results) == 1:
+            return results[0]
+
+        # Keys are read with defaults: a chunk may omit optional totals
+        totals = [r.get("totals") or {} for r in results]
+        hourly_rate = float(crew_member.get("hourly_rate") or totals[0].get("hourly_rate") or 0)
+        credit_hours = round(sum(t.get("total_credit_hours") or 0 for t in totals), 2)
+        return {
+            "flights": [flight for r in results for flight in r.get("flights", [])],
+            "totals": {
+                "total_flights": sum(t.get("total_flights") or 0 for t in totals),
+                "total_actual_hours": round(
+                    sum(t.get("total_actual_hours") or 0 for t in totals), 2
+                ),
+                "total_credit_hours": credit_hours,
+                "hourly_rate": hourly_rate,
+                "total_flight_pay": round(credit_hours * hourly_rate, 2),
+            },
+            "discrepancies": [d for r in results for d in r.get("discrepancies", [])],
+            "confidence_score": min(r.get("confidence_score", 0) for r in results),
+        }
+
     def _prepare_flight_data(
-        self, flights: List[Dict[str, Any]], crew_member: Dict[str, Any]
+        self, flights: Sequence[FlightRecord], crew_member: Dict[str, Any]
     ) -> str:
-        """Format flight data for Claude prompt."""
-        flight_lines = []
-
-        for i, flight in enumerate(flights, 1):
-            scheduled_departure = flight.get("scheduled_departure", "")
-            actual_departure = flight.get("actual_departure", "")
-            scheduled_arrival = flight.get("scheduled_arrival", "")
-            actual_arrival = flight.get("actual_arrival", "")
-
-            flight_lines.append(
-                f"""
-Flight {i}:
-- Flight Number: {flight.get('flight_number')}
-- Date: {flight.get('flight_date')}
-- Route: {flight.get('origin_airport')} → {flight.get('destination_airport')}
-- Scheduled Departure: {scheduled_departure}
-- Actual Departure: {actual_departure}
-- Scheduled Arrival: {scheduled_arrival}
-- Actual Arrival: {actual_arrival}
-- Scheduled Block Time: {flight.get('scheduled_block_time', 'N/A')} hours
-- Actual Block Time: {flight.get('actual_block_time', 'N/A')} hours
-- Position: {flight.get('position')}
-"""
-            )
-
-        return "\n".join(flight_lines)
+        """Format flight data for Claude prompt (one CSV row per flight)."""
+        return encode_flights(flights, FLIGHT_COLUMNS)
 
     def calculate_block_time(
         self, departure: datetime, arrival: datetime
@@ -0,0 +1,138 @@
+"""
+Incremental JSON parsing of agent responses.
+
+Claude's answer is one JSON object, sometimes wrapped in prose or a code
+fence. IncrementalJSONParser consumes the text as it streams, skips
+anything before the first "{", and yields each top-level field as soon as
+its value is complete, so callers can act on e.g. "totals" before the rest
+of the object has been generated and stop generation once they have what
+they need.
+"""
+
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Receives (field name, value) as each top-level field completes
+FieldListener = Callable[[str, Any], None]
+
+_field_listener: ContextVar[Optional[FieldListener]] = ContextVar(
+    "agent_field_listener", default=None
+)
+
+
+class IncrementalJSONParser:
+    """Parse a JSON object one chunk at a time, field by field."""
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+        self._text = ""
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next piece of text.
+
+        Returns:
+            (name, value) for each top-level field completed by this chunk
+
+        Raises:
+            ValueError: If a completed field is not valid JSON
+        """
+        completed: List[Tuple[str, Any]] = []
+        if self.complete:
+            return completed
+
+        if not self._started:
+            brace = chunk.find("{")
+            if brace < 0:
+                return completed
+            chunk = chunk[brace + 1:]
+            self._started = True
+            self._depth = 1
+
+        offset = len(self._text)
+        self._text += chunk
+        for index in range(offset, len(self._text)):
+            char = self._text[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_member(index, completed)
+                    self.complete = True
+                    break
+            elif char == "," and self._depth == 1:
+                self._finish_member(index, completed)
+        return completed
+
+    def _finish_member(self, end: int, completed: List[Tuple[str, Any]]) -> None:
+        member = self._text[self._member_start:end].strip()
+        self._member_start = end + 1
+        if not member:
+            return
+        try:
+            parsed = json.loads("{" + member + "}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON field in response: {member[:200]}") from e
+        for name, value in parsed.items():
+            self.fields[name] = value
+            completed.append((name, value))
+
+    def has_fields(self, names: Iterable[str]) -> bool:
+        """Whether every named field has been parsed."""
+        return all(name in self.fields for name in names)
+
+    def result(self, partial: bool = False) -> Dict[str, Any]:
+        """
+        The parsed object.
+
+        Args:
+            partial: Accept an object cut off before its closing brace
+                (the fields parsed so far), e.g. a stream stopped early
+
+        Raises:
+            ValueError: If no field was parsed, or the object is incomplete
+                and partial is False (e.g. truncated at max_tokens)
+        """
+        if not self.complete and not (partial and self.fields):
+            raise ValueError(f"Could not parse JSON from response: {self._text[:200]}")
+        return dict(self.fields)
+
+
+def parse_json_response(content: str) -> Dict[str, Any]:
+    """Parse a complete response in one pass, ignoring surrounding prose."""
+    parser = IncrementalJSONParser()
+    parser.feed(content)
+    return parser.result()
+
+
+@contextmanager
+def field_scope(listener: Optional[FieldListener]) -> Iterator[None]:
+    """Deliver fields parsed from streamed responses inside the block to listener."""
+    token = _field_listener.set(listener)
+    try:
+        yield
+    finally:
+        _field_listener.reset(token)
+
+
+def current_field_listener() -> Optional[FieldListener]:
+    """Listener installed by the innermost field_scope, if any."""
+    return _field_listener.get()
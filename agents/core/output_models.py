@@ -0,0 +1,388 @@
+"""
+Pydantic output models for agent responses.
+
+Each agent declares one of these as its output_model. In structured-output
+mode the model's JSON schema is sent as a tool definition, so the prompt no
+longer needs to spell out the response format, and every response is
+validated against it before it reaches the workflow state.
+
+Extra fields are kept: the models pin down what downstream code reads,
+not everything the model may add.
+"""
+
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class AgentOutput(BaseModel):
+    """Base for agent outputs."""
+
+    model_config = ConfigDict(extra="allow")
+
+    confidence_score: float = Field(ge=0, le=1, description="Confidence in the result, 0-1")
+
+
+class _Part(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+# Flight time
+
+
+class FlightCredit(_Part):
+    flight_number: str
+    flight_date: str = Field(description="YYYY-MM-DD")
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    scheduled_block_time: Optional[float] = None
+    actual_block_time: Optional[float] = None
+    credit_hours: float
+    used_minimum_credit: bool = False
+    notes: str = ""
+
+
+class FlightTimeTotals(_Part):
+    total_flights: int
+    total_actual_hours: float
+    total_credit_hours: float
+    hourly_rate: float
+    total_flight_pay: float = Field(description="total_credit_hours x hourly_rate")
+
+
+class Discrepancy(_Part):
+    flight_number: str
+    issue: str
+    severity: Literal["low", "medium", "high"]
+
+
+class FlightTimeOutput(AgentOutput):
+    flights: List[FlightCredit]
+    totals: FlightTimeTotals
+    discrepancies: List[Discrepancy] = []
+
+
+# Duty time
+
+
+class DutyPeriod(_Part):
+    duty_date: str = Field(description="YYYY-MM-DD")
+    report_time: Optional[str] = Field(None, description="HH:MM")
+    release_time: Optional[str] = Field(None, description="HH:MM")
+    fdp_hours: float
+    flight_time_hours: Optional[float] = None
+    number_of_segments: Optional[int] = None
+    fdp_limit: Optional[float] = None
+    compliant: bool
+    margin: Optional[float] = None
+    notes: str = ""
+
+
+class RestPeriod(_Part):
+    start: str = Field(description="YYYY-MM-DD HH:MM")
+    end: str = Field(description="YYYY-MM-DD HH:MM")
+    duration_hours: float
+    meets_minimum: bool
+    sleep_opportunity_hours: Optional[float] = None
+
+
+class CumulativeLimit(_Part):
+    actual: float
+    limit: float
+    compliant: bool
+    utilization_percent: Optional[float] = None
+
+
+class DutyViolation(_Part):
+    regulation: str
+    description: str
+    severity: Literal["warning", "violation"]
+    duty_date: Optional[str] = Field(None, description="YYYY-MM-DD")
+
+
+class FatigueAssessment(_Part):
+    overall_risk: Literal["low", "medium", "high"]
+    contributing_factors: List[str] = []
+    recommendations: List[str] = []
+
+
+class DutyTimeOutput(AgentOutput):
+    duty_periods: List[DutyPeriod] = []
+    rest_periods: List[RestPeriod] = []
+    cumulative_limits: Dict[str, CumulativeLimit] = Field(
+        default_factory=dict,
+        description="Keyed by fdp_7_days, fdp_28_days, flight_time_28_days, flight_time_365_days",
+    )
+    violations: List[DutyViolation] = []
+    fatigue_assessment: Optional[FatigueAssessment] = None
+    compliance_status: Literal["compliant", "non_compliant", "needs_review"]
+
+
+# Per diem
+
+
+class MealDeductions(_Part):
+    breakfast: float = 0.0
+    lunch: float = 0.0
+    dinner: float = 0.0
+    total: float = 0.0
+
+
+class PerDiemDay(_Part):
+    date: str = Field(description="YYYY-MM-DD")
+    is_first_or_last: bool = False
+    rate_percent: float
+    base_amount: float
+    meal_deductions: Optional[MealDeductions] = None
+    net_amount: float
+
+
+class Layover(_Part):
+    location: str = Field(description="city, state/country")
+    airport_code: str
+    arrival: str = Field(description="YYYY-MM-DD HH:MM")
+    departure: str = Field(description="YYYY-MM-DD HH:MM")
+    duration_hours: float
+    is_international: bool = False
+    daily_rate: float
+    days_breakdown: List[PerDiemDay] = []
+    layover_total: float
+
+
+class PerDiemTotals(_Part):
+    total_layovers: int
+    total_days: float
+    total_gross_per_diem: float
+    total_meal_deductions: float = 0.0
+    total_net_per_diem: float
+
+
+class RateSource(_Part):
+    location: str
+    rate: float
+    source: Literal["GSA", "State_Dept"]
+    effective_date: Optional[str] = Field(None, description="YYYY-MM-DD")
+
+
+class PerDiemOutput(AgentOutput):
+    layovers: List[Layover]
+    totals: PerDiemTotals
+    rate_sources: List[RateSource] = []
+    notes: List[str] = []
+
+
+# Premium pay
+
+
+class PremiumComponent(_Part):
+    type: Literal[
+        "holiday", "redeye", "international", "training", "deadhead", "cancellation", "overtime"
+    ]
+    description: str = ""
+    flight_number: Optional[str] = None
+    date: str = Field(description="YYYY-MM-DD")
+    calculation: str = Field("", description="Formula explanation")
+    base_amount: float
+    rate_or_multiplier: float
+    premium_amount: float
+    contract_reference: str = ""
+
+
+class PremiumTotals(_Part):
+    total_holiday_pay: float = 0.0
+    total_redeye_premium: float = 0.0
+    total_international_premium: float = 0.0
+    total_training_pay: float = 0.0
+    total_deadhead_pay: float = 0.0
+    total_cancellation_pay: float = 0.0
+    total_overtime_pay: float = 0.0
+    total_premium_pay: float
+
+
+class TypeBreakdown(_Part):
+    count: int
+    amount: float
+
+
+class PremiumPayOutput(AgentOutput):
+    premium_components: List[PremiumComponent]
+    totals: PremiumTotals
+    breakdown_by_type: Dict[str, TypeBreakdown] = {}
+    notes: List[str] = []
+
+
+class LegPremium(_Part):
+    type: Literal["holiday", "redeye", "international", "deadhead"]
+    flight_number: str
+    date: str = Field(description="YYYY-MM-DD")
+    basis: float = Field(
+        description="Credit hours (holiday, international), block hours (deadhead) "
+        "or segments (redeye) the premium is computed on"
+    )
+    description: str = ""
+    contract_reference: str = ""
+
+
+class LegPremiumOutput(AgentOutput):
+    """Crew-neutral premium eligibility, priced per crew member afterwards."""
+
+    leg_premiums: List[LegPremium]
+    notes: List[str] = []
+
+
+# Guarantee
+
+
+class ApplicableGuarantee(_Part):
+    type: Literal["monthly", "daily", "trip"]
+    hours: float
+    description: str = ""
+    contract_reference: str = ""
+
+
+class GuaranteeApplied(_Part):
+    type: str
+    hours: float
+    reason: str = ""
+
+
+class GuaranteeCalculation(_Part):
+    actual_credit_hours: float
+    guarantee_hours: float
+    paid_hours: float
+    hourly_rate: float
+    base_pay: float = Field(description="paid_hours x hourly_rate")
+
+
+class GuaranteeDay(_Part):
+    date: str = Field(description="YYYY-MM-DD")
+    actual_hours: float
+    guarantee_hours: float
+    paid_hours: float
+
+
+class GuaranteeOutput(AgentOutput):
+    crew_type: Literal["line_holder", "reserve"]
+    role: str
+    actual_hours: float
+    applicable_guarantees: List[ApplicableGuarantee] = []
+    guarantee_applied: Optional[GuaranteeApplied] = None
+    paid_hours: float
+    guarantee_triggered: bool
+    additional_hours_from_guarantee: float = 0.0
+    calculation: GuaranteeCalculation
+    breakdown_by_day: List[GuaranteeDay] = []
+    notes: List[str] = []
+
+
+# Compliance
+
+
+class ValidationResult(_Part):
+    category: Literal["FAA", "Contract", "Policy", "Calculation"]
+    check: str
+    status: Literal["pass", "fail", "warning"]
+    details: str = ""
+    regulation_reference: str = ""
+    severity: Literal["info", "low", "medium", "high", "critical"] = "info"
+
+
+class ComplianceViolation(_Part):
+    type: Literal["FAA", "Contract", "Policy"]
+    regulation: str
+    description: str
+    severity: Literal["warning", "violation", "critical"]
+    recommended_action: str = ""
+    requires_human_review: bool = False
+
+
+class ComplianceWarning(_Part):
+    description: str
+    category: str = ""
+    recommendation: str = ""
+
+
+class PayAccuracyCheck(_Part):
+    all_rates_correct: bool
+    all_premiums_applied: bool
+    no_duplicates: bool
+    totals_accurate: bool
+    discrepancies: List[str] = []
+
+
+class AuditEntry(_Part):
+    timestamp: str = ""
+    check_performed: str
+    result: str
+
+
+class ComplianceOutput(AgentOutput):
+    overall_compliance: Literal["pass", "fail", "needs_review"]
+    validation_results: List[ValidationResult] = []
+    violations: List[ComplianceViolation] = []
+    warnings: List[ComplianceWarning] = []
+    pay_accuracy_check: Optional[PayAccuracyCheck] = None
+    audit_trail: List[AuditEntry] = []
+    recommendations: List[str] = []
+    requires_human_review: bool
+
+
+# Claim resolution
+
+
+class ClaimAnalysis(_Part):
+    claim_id: str
+    claim_type: str
+    filed_date: Optional[str] = None
+    amount_claimed: Optional[float] = None
+    crew_member: Optional[str] = None
+
+
+class Evidence(_Part):
+    source: str
+    data: str
+    supports_claim: bool
+
+
+class Investigation(_Part):
+    evidence_gathered: List[Evidence] = []
+    root_cause: str
+    confidence_in_diagnosis: float = Field(ge=0, le=1)
+
+
+class CorrectedCalculation(_Part):
+    original: float
+    corrected: float
+    difference: float
+    explanation: str = ""
+
+
+class Resolution(_Part):
+    resolution_type: Literal["auto_approve", "auto_deny", "escalate"]
+    approved_amount: float = 0.0
+    denial_reason: Optional[str] = None
+    escalation_reason: Optional[str] = None
+    corrected_calculation: Optional[CorrectedCalculation] = None
+
+
+class PatternAnalysis(_Part):
+    is_recurring_issue: bool = False
+    similar_claims_found: int = 0
+    systemic_issue: bool = False
+    recommendation: str = ""
+
+
+class Communication(_Part):
+    crew_notification: str
+    timeline: str = ""
+    next_steps: List[str] = []
+
+
+class ClaimResolutionOutput(AgentOutput):
+    claim_analysis: ClaimAnalysis
+    investigation: Investigation
+    resolution: Resolution
+    pattern_analysis: Optional[PatternAnalysis] = None
+    communication: Optional[Communication] = None
+    requires_human_review: bool
+    processing_time_minutes: Optional[float] = None
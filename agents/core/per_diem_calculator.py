@@ -5,15 +5,19 @@ Calculates per diem allowances for layovers using GSA and State Department rates
 """
 
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from .base_agent import BaseAgent
+from .output_models import PerDiemOutput
+from ..flight_record import FlightRecord, as_flight_records
 from ..prompts.per_diem_prompts import PER_DIEM_SYSTEM_PROMPT
 
 
 class PerDiemCalculator(BaseAgent):
     """Agent for calculating per diem allowances."""
 
+    output_model = PerDiemOutput
+
     def __init__(self):
         super().__init__(agent_name="PerDiemCalculator", temperature=0.1)
 
@@ -25,6 +29,7 @@ class PerDiemCalculator(BaseAgent):
             input_data: Dictionary containing:
                 - crew_member_data: Crew member profile
                 - flight_assignments: List of flights
+                - flight_records: Pre-parsed flights (optional, preferred)
                 - per_diem_rates: Rate table from database
                 - execution_id: Execution tracking ID
 
@@ -35,16 +40,19 @@ class PerDiemCalculator(BaseAgent):
 
         try:
             crew_member = input_data.get("crew_member_data", {})
-            flights = input_data.get("flight_assignments", [])
+            flights = as_flight_records(
+                input_data.get("flight_records")
+                or input_data.get("flight_assignments", [])
+            )
             rates = input_data.get("per_diem_rates", {})
             execution_id = input_data.get("execution_id")
 
             # Find layovers (flights with overnight_location)
-            layovers = [f for f in flights if f.get("overnight_location")]
+            layovers = [f for f in flights if f.overnight_location]
 
             if not layovers:
                 self.logger.info("No layovers found, no per diem to calculate")
-                return self._empty_result()
+                return self.trivial_result(input_data)
 
             # Prepare layover data
             layover_summary = self._prepare_layover_data(layovers, rates)
@@ -111,15 +119,24 @@ Return results in the specified JSON format."""
             )
             raise
 
+    def trivial_result(self, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Empty result when no flight has an overnight location."""
+        flights = as_flight_records(
+            input_data.get("flight_records") or input_data.get("flight_assignments", [])
+        )
+        if any(flight.overnight_location for flight in flights):
+            return None
+        return self._empty_result()
+
     def _prepare_layover_data(
-        self, layovers: List[Dict[str, Any]], rates: Dict[str, Any]
+        self, layovers: List[FlightRecord], rates: Dict[str, Any]
     ) -> str:
         """Format layover data for Claude prompt."""
         layover_lines = []
 
-        for i, flight in enumerate(layovers, 1):
-            overnight_location = flight.get("overnight_location")
-            arrival = flight.get("actual_arrival") or flight.get("scheduled_arrival")
+        for i, flight in enumerate(as_flight_records(layovers), 1):
+            overnight_location = flight.overnight_location
+            arrival = flight.actual_arrival or flight.scheduled_arrival
             # Find the departure flight from this location
             # For now, just use the arrival time
             layover_lines.append(
@@ -127,8 +144,8 @@ Return results in the specified JSON format."""
 Layover {i}:
 - Location: {overnight_location}
 - Arrival: {arrival}
-- International: {flight.get('is_international', False)}
-- Flight: {flight.get('flight_number')}
+- International: {flight.is_international}
+- Flight: {flight.flight_number}
 """
             )
 
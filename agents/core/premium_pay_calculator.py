@@ -5,33 +5,52 @@ Calculates all premium pay components (holiday, red-eye, international, etc.).
 """
 
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, Hashable, List, Optional, Sequence, Tuple
 from datetime import datetime
 
 from .base_agent import BaseAgent
-from ..prompts.premium_pay_prompts import PREMIUM_PAY_SYSTEM_PROMPT
+from .output_models import LegPremiumOutput, PremiumPayOutput
+from ..coalescing import Coalescer, current_coalescer, trip_signature
+from ..flight_record import FlightRecord, as_flight_records
+from ..prompt_encoding import (
+    ACT_BLOCK,
+    ACT_DEP,
+    DATE,
+    FLIGHT,
+    ROUTE,
+    TABLE_LEGEND,
+    Column,
+    encode_flights,
+    group_trips,
+    trip_chunks,
+)
+from ..prompts.premium_pay_prompts import LEG_PREMIUM_SYSTEM_PROMPT
+from ..rules import pay_rules
+
+
+# Flight columns for premium eligibility (a premiums column is appended)
+PREMIUM_COLUMNS = (FLIGHT, DATE, ROUTE, ACT_DEP, ACT_BLOCK)
+
+# Result totals fed by each per-leg premium type (flight rows carry no
+# training, cancellation or overtime events, so those totals stay zero)
+LEG_PREMIUM_TOTALS = {
+    "holiday": "total_holiday_pay",
+    "redeye": "total_redeye_premium",
+    "international": "total_international_premium",
+    "deadhead": "total_deadhead_pay",
+}
 
 
 class PremiumPayCalculator(BaseAgent):
     """Agent for calculating premium pay."""
 
+    output_model = PremiumPayOutput
+
     def __init__(self):
         super().__init__(agent_name="PremiumPayCalculator", temperature=0.1)
 
     # US Federal Holidays for 2025
-    HOLIDAYS_2025 = [
-        "2025-01-01",  # New Year's Day
-        "2025-01-20",  # MLK Day
-        "2025-02-17",  # Presidents Day
-        "2025-05-26",  # Memorial Day
-        "2025-06-19",  # Juneteenth
-        "2025-07-04",  # Independence Day
-        "2025-09-01",  # Labor Day
-        "2025-10-13",  # Columbus Day
-        "2025-11-11",  # Veterans Day
-        "2025-11-27",  # Thanksgiving
-        "2025-12-25",  # Christmas
-    ]
+    HOLIDAYS_2025 = list(pay_rules.HOLIDAYS_2025)
 
     def calculate(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -41,8 +60,7 @@ class PremiumPayCalculator(BaseAgent):
             input_data: Dictionary containing:
                 - crew_member_data: Crew member profile
                 - flight_assignments: List of flights
-                - flight_time_data: Flight time calculation results
-                - premium_rules: Premium pay rules from database
+                - flight_records: Pre-parsed flights (optional, preferred)
                 - execution_id: Execution tracking ID
 
         Returns:
@@ -52,51 +70,23 @@ class PremiumPayCalculator(BaseAgent):
 
         try:
             crew_member = input_data.get("crew_member_data", {})
-            flights = input_data.get("flight_assignments", [])
-            flight_time_data = input_data.get("flight_time_data", {})
-            premium_rules = input_data.get("premium_rules", {})
+            flights = as_flight_records(
+                input_data.get("flight_records") or input_data.get("flight_assignments", [])
+            )
             execution_id = input_data.get("execution_id")
 
-            if not flights:
-                self.logger.warning("No flights to calculate premium pay")
-                return self._empty_result()
-
-            # Identify premium-eligible flights
-            premium_summary = self._prepare_premium_data(flights, crew_member)
-
-            # Create user message
-            user_message = f"""Calculate premium pay for the following crew member:
-
-CREW MEMBER:
-- Employee ID: {crew_member.get('employee_id')}
-- Name: {crew_member.get('first_name')} {crew_member.get('last_name')}
-- Role: {crew_member.get('role')}
-- Hourly Rate: ${crew_member.get('hourly_rate')}
-- Total Credit Hours: {flight_time_data.get('totals', {}).get('total_credit_hours', 0)}
-
-FLIGHTS WITH PREMIUM ELIGIBILITY:
-{premium_summary}
-
-PREMIUM RULES:
-{self._format_premium_rules(premium_rules, crew_member.get('role'))}
-
-HOLIDAYS IN PERIOD: {', '.join(self.HOLIDAYS_2025)}
-
-Please calculate:
-1. Holiday pay (1.5x rate for work on holidays)
-2. Red-eye premiums (flights departing 2200-0559)
-3. International premiums (15% of trip value)
-4. Training pay (if applicable)
-5. Deadhead pay (if applicable)
-6. Any other applicable premiums
-
-Return results in the specified JSON format with itemized breakdown."""
-
-            # Call Claude
-            result = self.call_claude(
-                system_prompt=PREMIUM_PAY_SYSTEM_PROMPT,
-                user_message=user_message,
-                max_tokens=4096,
+            trivial = self.trivial_result(input_data)
+            if trivial is not None:
+                self.logger.info("No premium-eligible flights, no premium pay to calculate")
+                return trivial
+
+            # Which premiums apply to each leg (and on what basis) comes from
+            # Claude; amounts are applied locally from the contract rules.
+            # Outside a batch the legs are identified for this crew member
+            # alone, through the same steps, so both price identically.
+            eligible = [flight for flight in flights if self._premium_types(flight)]
+            result = self._calculate_shared(
+                eligible, crew_member, current_coalescer() or Coalescer()
             )
 
             # Log execution
@@ -126,55 +116,153 @@ Return results in the specified JSON format with itemized breakdown."""
             )
             raise
 
-    def _prepare_premium_data(
-        self, flights: List[Dict[str, Any]], crew_member: Dict[str, Any]
-    ) -> str:
-        """Format premium eligibility data for Claude prompt."""
-        flight_lines = []
-
-        for flight in flights:
-            flight_date = flight.get("flight_date", "")
-            flight_number = flight.get("flight_number")
-            is_holiday = str(flight_date) in self.HOLIDAYS_2025
-            is_redeye = flight.get("is_redeye", False)
-            is_international = flight.get("is_international", False)
-            is_deadhead = flight.get("is_deadhead", False)
-
-            premiums = []
-            if is_holiday:
-                premiums.append("HOLIDAY")
-            if is_redeye:
-                premiums.append("RED-EYE")
-            if is_international:
-                premiums.append("INTERNATIONAL")
-            if is_deadhead:
-                premiums.append("DEADHEAD")
-
-            if premiums:
-                flight_lines.append(
-                    f"""
-Flight {flight_number} ({flight_date}):
-- Route: {flight.get('origin_airport')} → {flight.get('destination_airport')}
-- Departure: {flight.get('actual_departure')}
-- Block Time: {flight.get('actual_block_time', 0):.2f} hours
-- Premium Types: {', '.join(premiums)}
-"""
+    def trivial_result(self, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Empty result when no flight qualifies for a premium."""
+        flights = as_flight_records(
+            input_data.get("flight_records") or input_data.get("flight_assignments", [])
+        )
+        if any(self._premium_types(flight) for flight in flights):
+            return None
+        return self._empty_result()
+
+    def _calculate_shared(
+        self, flights: List[FlightRecord], crew_member: Dict[str, Any], coalescer: Coalescer
+    ) -> Dict[str, Any]:
+        """
+        Calculate premium pay from leg premiums shared through coalescer.
+
+        Which premiums apply to a trip's legs, and on what basis, does not
+        depend on who flies it, so with a batch's coalescer each distinct
+        trip goes to Claude once per batch; the crew member's rate and role
+        are applied locally.
+        """
+        if not flights:
+            return self._empty_result()
+
+        trips = {trip_signature(legs): legs for legs in group_trips(flights)}
+        shared = coalescer.get_many(
+            list(trips), lambda keys: self._leg_premiums({key: trips[key] for key in keys})
+        )
+        return self._price_leg_premiums([shared[key] for key in trips], crew_member)
+
+    def _leg_premiums(
+        self, trips: Dict[Hashable, Tuple[FlightRecord, ...]]
+    ) -> Dict[Hashable, Dict[str, Any]]:
+        """Ask Claude for the crew-neutral leg premiums of trips, keyed like trips."""
+        trip_of = {
+            (leg.flight_number, str(leg.flight_date)): key
+            for key, legs in trips.items()
+            for leg in legs
+        }
+        chunks = trip_chunks(
+            [leg for legs in trips.values() for leg in legs],
+            self._premium_columns(),
+            self.policy.prompt_token_budget,
+            self.policy.max_flights_per_prompt,
+        )
+        results = self.map_chunks(self._identify_leg_premiums, chunks)
+
+        shared = {key: {"leg_premiums": [], "confidence_score": 1.0} for key in trips}
+        for chunk, result in zip(chunks, results):
+            for key in {trip_of[(leg.flight_number, str(leg.flight_date))] for leg in chunk}:
+                shared[key]["confidence_score"] = min(
+                    shared[key]["confidence_score"], result["confidence_score"]
                 )
+            for premium in result["leg_premiums"]:
+                key = trip_of.get((premium["flight_number"], premium["date"]))
+                if key is None:
+                    self.logger.warning(
+                        f"Ignoring premium for unknown leg {premium['flight_number']} "
+                        f"on {premium['date']}"
+                    )
+                    continue
+                shared[key]["leg_premiums"].append(premium)
+        return shared
+
+    def _identify_leg_premiums(self, flights: Sequence[FlightRecord]) -> Dict[str, Any]:
+        """Identify leg premiums for one prompt's worth of flights."""
+        user_message = f"""Identify the leg premiums for the following flights:
 
-        if not flight_lines:
-            return "No flights qualify for premium pay in this period."
+FLIGHTS WITH PREMIUM ELIGIBILITY:
+{self._prepare_premium_data(flights, {})}
 
-        return "\n".join(flight_lines)
+HOLIDAYS IN PERIOD: {', '.join(self.HOLIDAYS_2025)}
 
-    def _format_premium_rules(self, rules: Dict[str, Any], role: str) -> str:
-        """Format premium pay rules."""
-        return f"""
-Holiday Pay: 1.5x hourly rate
-Red-Eye Premium: ${100 if role == 'Captain' else 75 if role == 'First Officer' else 50} per segment
-International Premium: 15% of base trip pay
-Deadhead Pay: 50% of hourly rate
-Training Pay: ${125 if role == 'Captain' else 100 if role == 'First Officer' else 75} per session
-"""
+Return results in the specified JSON format."""
+
+        return self.call_claude(
+            system_prompt=LEG_PREMIUM_SYSTEM_PROMPT,
+            user_message=user_message,
+            response_model=LegPremiumOutput,
+            max_tokens=4096,
+        )
+
+    def _price_leg_premiums(
+        self, shared: List[Dict[str, Any]], crew_member: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Apply a crew member's rate and role to shared leg premiums."""
+        role = crew_member.get("role")
+        hourly_rate = float(crew_member.get("hourly_rate") or 0)
+        result = self._empty_result()
+        result["notes"] = []
+        totals, breakdown = result["totals"], result["breakdown_by_type"]
+
+        for trip in shared:
+            result["confidence_score"] = min(result["confidence_score"], trip["confidence_score"])
+            for premium in trip["leg_premiums"]:
+                premium_type, basis = premium["type"], premium["basis"]
+                unit = pay_rules.leg_premium(premium_type, 1.0, hourly_rate, role)
+                amount = pay_rules.leg_premium(premium_type, basis, hourly_rate, role)
+                result["premium_components"].append(
+                    {
+                        "type": premium_type,
+                        "description": premium.get("description", ""),
+                        "flight_number": premium["flight_number"],
+                        "date": premium["date"],
+                        "calculation": f"{basis:g} × ${unit:.2f}",
+                        "base_amount": basis,
+                        "rate_or_multiplier": unit,
+                        "premium_amount": amount,
+                        "contract_reference": premium.get("contract_reference", ""),
+                    }
+                )
+                total_key = LEG_PREMIUM_TOTALS[premium_type]
+                totals[total_key] = round(totals[total_key] + amount, 2)
+                entry = breakdown.setdefault(premium_type, {"count": 0, "amount": 0.0})
+                entry["count"] += 1
+                entry["amount"] = round(entry["amount"] + amount, 2)
+
+        totals["total_premium_pay"] = round(
+            sum(totals[key] for key in LEG_PREMIUM_TOTALS.values()), 2
+        )
+        return result
+
+    def _prepare_premium_data(
+        self, flights: Sequence[FlightRecord], crew_member: Dict[str, Any]
+    ) -> str:
+        """Format premium eligibility data for Claude prompt (one CSV row per flight)."""
+        eligible = [flight for flight in as_flight_records(flights) if self._premium_types(flight)]
+        if not eligible:
+            return "No flights qualify for premium pay in this period."
+
+        return f"({TABLE_LEGEND})\n{encode_flights(eligible, self._premium_columns())}"
+
+    def _premium_columns(self) -> Tuple[Column, ...]:
+        """Prompt columns: flight details plus the premiums each qualifies for."""
+        return PREMIUM_COLUMNS + (("premiums", self._premium_types),)
+
+    def _premium_types(self, flight: FlightRecord) -> str:
+        """Premium types a flight qualifies for, e.g. HOLIDAY|RED-EYE."""
+        premiums = []
+        if str(flight.flight_date) in self.HOLIDAYS_2025:
+            premiums.append("HOLIDAY")
+        if flight.is_redeye:
+            premiums.append("RED-EYE")
+        if flight.is_international:
+            premiums.append("INTERNATIONAL")
+        if flight.is_deadhead:
+            premiums.append("DEADHEAD")
+        return "|".join(premiums)
 
     def _empty_result(self) -> Dict[str, Any]:
         """Return empty result structure."""
@@ -0,0 +1,300 @@
+"""
+Compact flight record for the hot path.
+
+Flights are parsed once per crew member at load time into immutable,
+__slots__-based records with pre-parsed datetimes and fixed-point block
+times, then shared read-only by every node in the workflow.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+# Block times and FDP are stored as integer hundredths of an hour
+HOURS_SCALE = 100
+MIN_CREDIT_CENTIHOURS = 100  # 1.0 hour minimum credit per segment
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_DATETIME_FIELDS = (
+    "scheduled_departure",
+    "actual_departure",
+    "scheduled_arrival",
+    "actual_arrival",
+    "duty_report_time",
+    "duty_end_time",
+)
+_HOURS_FIELDS = ("scheduled_block_time", "actual_block_time", "flight_duty_period")
+_TEXT_FIELDS = (
+    "id",
+    "flight_number",
+    "origin_airport",
+    "destination_airport",
+    "aircraft_type",
+    "position",
+    "overnight_location",
+    "trip_id",
+)
+_FLAG_FIELDS = ("is_international", "is_redeye", "is_deadhead")
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Parse a timestamp such as '2025-11-03 22:45:00' (datetimes pass through)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """Parse a date such as '2025-11-03' (dates pass through)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def to_centihours(value: Any) -> Optional[int]:
+    """Convert hours (float, Decimal or string) to integer hundredths."""
+    if value is None or value == "" or value == "N/A":
+        return None
+    return int((Decimal(str(value)) * HOURS_SCALE).quantize(Decimal("1")))
+
+
+class FlightRecord:
+    """Immutable, typed flight assignment."""
+
+    __slots__ = (
+        "id",
+        "flight_number",
+        "flight_date",
+        "origin_airport",
+        "destination_airport",
+        "scheduled_departure",
+        "actual_departure",
+        "scheduled_arrival",
+        "actual_arrival",
+        "scheduled_block_centihours",
+        "actual_block_centihours",
+        "duty_report_time",
+        "duty_end_time",
+        "flight_duty_period_centihours",
+        "aircraft_type",
+        "position",
+        "overnight_location",
+        "is_international",
+        "is_redeye",
+        "is_deadhead",
+        "trip_id",
+        "sequence_number",
+        "block_centihours",
+    )
+
+    def __init__(self, **fields: Any):
+        """
+        Initialize a flight record.
+
+        Args:
+            **fields: Values for each slot; missing slots default to None/False
+        """
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name))
+        for name in _FLAG_FIELDS:
+            object.__setattr__(self, name, bool(fields.get(name)))
+        object.__setattr__(self, "block_centihours", self._derive_block())
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("FlightRecord is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("FlightRecord is read-only")
+
+    def __reduce__(self):
+        return (_rebuild, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return (
+            f"FlightRecord({self.flight_number} {self.flight_date} "
+            f"{self.origin_airport}-{self.destination_airport})"
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, FlightRecord):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def _derive_block(self) -> int:
+        """Block time: actual, else actual/scheduled times, else scheduled."""
+        if self.actual_block_centihours is not None:
+            return self.actual_block_centihours
+
+        departure = self.actual_departure or self.scheduled_departure
+        arrival = self.actual_arrival or self.scheduled_arrival
+        if departure and arrival:
+            seconds = (arrival - departure).total_seconds()
+            return int(round(seconds * HOURS_SCALE / 3600))
+
+        return self.scheduled_block_centihours or 0
+
+    @classmethod
+    def from_dict(cls, flight: Dict[str, Any]) -> "FlightRecord":
+        """Build a record from the flight assignment dictionary shape."""
+        fields = {name: flight.get(name) for name in _TEXT_FIELDS + _FLAG_FIELDS}
+        fields["flight_date"] = parse_date(flight.get("flight_date"))
+        for name in _DATETIME_FIELDS:
+            fields[name] = parse_datetime(flight.get(name))
+        fields["scheduled_block_centihours"] = to_centihours(
+            flight.get("scheduled_block_time")
+        )
+        fields["actual_block_centihours"] = to_centihours(
+            flight.get("actual_block_time")
+        )
+        fields["flight_duty_period_centihours"] = to_centihours(
+            flight.get("flight_duty_period")
+        )
+        sequence_number = flight.get("sequence_number")
+        fields["sequence_number"] = (
+            int(sequence_number) if sequence_number is not None else None
+        )
+        if fields["id"] is not None:
+            fields["id"] = str(fields["id"])
+        return cls(**fields)
+
+    @classmethod
+    def from_model(cls, assignment: Any) -> "FlightRecord":
+        """Build a record from a FlightAssignment ORM object."""
+        return cls.from_dict(
+            {
+                name: getattr(assignment, name, None)
+                for name in _TEXT_FIELDS
+                + _FLAG_FIELDS
+                + _DATETIME_FIELDS
+                + _HOURS_FIELDS
+                + ("flight_date", "sequence_number")
+            }
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the flight assignment dictionary shape."""
+        flight: Dict[str, Any] = {}
+        if self.id is not None:
+            flight["id"] = self.id
+        flight["flight_number"] = self.flight_number
+        flight["flight_date"] = (
+            self.flight_date.isoformat() if self.flight_date else None
+        )
+        flight["origin_airport"] = self.origin_airport
+        flight["destination_airport"] = self.destination_airport
+        for name in _DATETIME_FIELDS[:4]:
+            value = getattr(self, name)
+            flight[name] = value.strftime(DATETIME_FORMAT) if value else None
+        flight["scheduled_block_time"] = self.scheduled_block_time
+        flight["actual_block_time"] = self.actual_block_time
+        for name in _DATETIME_FIELDS[4:]:
+            value = getattr(self, name)
+            flight[name] = value.strftime(DATETIME_FORMAT) if value else None
+        flight["flight_duty_period"] = self.flight_duty_period
+        if self.aircraft_type is not None:
+            flight["aircraft_type"] = self.aircraft_type
+        flight["position"] = self.position
+        flight["overnight_location"] = self.overnight_location
+        flight["is_redeye"] = self.is_redeye
+        flight["is_international"] = self.is_international
+        if self.is_deadhead:
+            flight["is_deadhead"] = True
+        flight["trip_id"] = self.trip_id
+        flight["sequence_number"] = self.sequence_number
+        return flight
+
+    @property
+    def key(self) -> Tuple[Any, ...]:
+        """Identity of the leg: (flight number, date, origin, destination)."""
+        return (
+            self.flight_number,
+            self.flight_date,
+            self.origin_airport,
+            self.destination_airport,
+        )
+
+    @property
+    def scheduled_block_time(self) -> Optional[float]:
+        """Scheduled block time in hours."""
+        return _hours(self.scheduled_block_centihours)
+
+    @property
+    def actual_block_time(self) -> Optional[float]:
+        """Actual block time in hours."""
+        return _hours(self.actual_block_centihours)
+
+    @property
+    def flight_duty_period(self) -> Optional[float]:
+        """Flight duty period in hours."""
+        return _hours(self.flight_duty_period_centihours)
+
+    @property
+    def block_hours(self) -> float:
+        """Best available block time in hours."""
+        return self.block_centihours / HOURS_SCALE
+
+    @property
+    def credit_centihours(self) -> int:
+        """Credit time in hundredths: MAX(block time, 1.0 hour minimum)."""
+        return max(self.block_centihours, MIN_CREDIT_CENTIHOURS)
+
+    @property
+    def credit_hours(self) -> float:
+        """Credit time in hours: MAX(block time, 1.0 hour minimum)."""
+        return self.credit_centihours / HOURS_SCALE
+
+
+def _hours(centihours: Optional[int]) -> Optional[float]:
+    """Convert integer hundredths back to hours."""
+    return None if centihours is None else centihours / HOURS_SCALE
+
+
+def _rebuild(flight: Dict[str, Any]) -> FlightRecord:
+    """Unpickle helper for FlightRecord."""
+    return FlightRecord.from_dict(flight)
+
+
+def load_flight_records(flights: Iterable[Any]) -> Tuple[FlightRecord, ...]:
+    """
+    Parse flight assignments once for a crew member.
+
+    Args:
+        flights: Flight dictionaries, FlightAssignment ORM objects or records
+
+    Returns:
+        Read-only tuple of FlightRecord
+    """
+    records = []
+    for flight in flights or ():
+        if isinstance(flight, FlightRecord):
+            records.append(flight)
+        elif isinstance(flight, dict):
+            records.append(FlightRecord.from_dict(flight))
+        else:
+            records.append(FlightRecord.from_model(flight))
+    return tuple(records)
+
+
+def as_flight_records(flights: Sequence[Any]) -> Tuple[FlightRecord, ...]:
+    """Return flights as records, reusing an already-loaded tuple."""
+    if isinstance(flights, tuple) and all(
+        isinstance(f, FlightRecord) for f in flights
+    ):
+        return flights
+    return load_flight_records(flights)
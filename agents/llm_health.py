@@ -0,0 +1,83 @@
+"""
+Claude backend health, shared by every agent in the process.
+
+A passive circuit breaker over call outcomes: after CLAUDE_CIRCUIT_FAILURES
+consecutive transient failures the circuit opens, and once
+CLAUDE_CIRCUIT_COOLDOWN_SECONDS have passed it is half-open until the next
+call succeeds (closed) or fails (open again). Calls are not rejected; the
+per-call retry policy already bounds them. The API's readiness check
+reports an open circuit so load balancers stop sending calculations here.
+
+Kept free of the Anthropic SDK so the API can read it without importing
+the agent stack.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit state (thread-safe)."""
+
+    def __init__(self, failure_threshold: int = 5, cooldown_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._last_success: Optional[float] = None
+        self._last_failure: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._last_success = time.time()
+
+    def record_failure(self, error: Exception) -> None:
+        """Record a transient failure (timeouts, connection errors, 429/5xx)."""
+        with self._lock:
+            self._consecutive_failures += 1
+            self._last_failure = time.time()
+            # Type only: the snapshot is served on the unauthenticated
+            # readiness endpoint (the message is in the agent's own log)
+            self._last_error = type(error).__name__
+            if self._consecutive_failures >= self.failure_threshold:
+                # A failed half-open probe restarts the cooldown
+                self._opened_at = time.monotonic()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at < self.cooldown_seconds:
+            return OPEN
+        return HALF_OPEN
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State and recent outcomes, for health reporting."""
+        with self._lock:
+            return {
+                "state": self._state(),
+                "consecutive_failures": self._consecutive_failures,
+                "last_success": self._last_success,
+                "last_failure": self._last_failure,
+                "last_error": self._last_error,
+            }
+
+
+claude_circuit = CircuitBreaker(
+    failure_threshold=int(os.getenv("CLAUDE_CIRCUIT_FAILURES", "5")),
+    cooldown_seconds=float(os.getenv("CLAUDE_CIRCUIT_COOLDOWN_SECONDS", "30")),
+)
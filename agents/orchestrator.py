@@ -5,15 +5,20 @@ Master coordinator using LangGraph to manage workflow across all agents.
 """
 
 import os
+import time
 import uuid
 import logging
-from typing import Dict, Any, Optional
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, Sequence, Tuple
 from datetime import datetime
 
 from langgraph.graph import StateGraph, END
 from dotenv import load_dotenv
 
 from .state import CrewPayState
+from .checkpoint import discard_checkpoints, first_failed_step, thread_config
+from .flight_record import HOURS_SCALE, FlightRecord, load_flight_records
 from .core import (
     FlightTimeCalculator,
     DutyTimeMonitor,
@@ -23,17 +28,96 @@ from .core import (
     ComplianceValidator,
     ClaimResolutionAgent,
 )
+from .core.call_policy import ModelTiers, deadline_scope
+from .core.json_stream import field_scope
 
-# Load environment variables
-load_dotenv()
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+# Logging is configured by the entry point (API app or __main__ below); per
+# node messages are DEBUG so they cost nothing on the hot path
 logger = logging.getLogger(__name__)
 
+# Receives (execution_id, event) for each progress event of a run
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+# What a node returns: only the state keys it changed. LangGraph applies the
+# update to its channels, so unchanged inputs (flights, earlier outputs) stay
+# held by reference instead of being rewritten at every step.
+StateUpdate = Dict[str, Any]
+
+# Nodes that call Claude, in workflow order; they share the per-crew SLA
+LLM_NODES = ("flight_time", "duty_time", "per_diem", "premium_pay", "guarantee", "compliance")
+
+# Nodes routed around when their agent's trivial_result() determines the
+# output, in workflow order (compliance always runs)
+SKIPPABLE_NODES = ("flight_time", "duty_time", "per_diem", "premium_pay", "guarantee")
+
+# Nodes that only read total credit hours from flight_time_data, started
+# alongside Flight Time on a local estimate
+SPECULATIVE_NODES = ("premium_pay", "guarantee")
+
+_speculation_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_speculation_executor() -> ThreadPoolExecutor:
+    global _speculation_executor
+    if _speculation_executor is None:
+        _speculation_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("SPECULATION_WORKERS", "16")),
+            thread_name_prefix="speculative-node",
+        )
+    return _speculation_executor
+
+
+def estimate_flight_time(flight_records: Sequence[FlightRecord]) -> Dict[str, Any]:
+    """
+    Estimate Flight Time totals locally: credit = MAX(block time, 1.0) per leg.
+
+    Args:
+        flight_records: Parsed flights
+
+    Returns:
+        flight_time_data-shaped totals, marked as an estimate
+    """
+    return {
+        "totals": {
+            "total_flights": len(flight_records),
+            "total_block_hours": sum(f.block_centihours for f in flight_records) / HOURS_SCALE,
+            "total_credit_hours": sum(f.credit_centihours for f in flight_records) / HOURS_SCALE,
+        },
+        "estimated": True,
+    }
+
+
+def _node_summary(node: str, state: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact partial result published when a node completes."""
+    if node == "flight_time":
+        return (state["flight_time_data"] or {}).get("totals", {})
+    if node == "duty_time":
+        duty = state["duty_time_data"] or {}
+        return {
+            "compliance_status": duty.get("compliance_status"),
+            "violations": len(duty.get("violations", [])),
+        }
+    if node == "per_diem":
+        return (state["per_diem_data"] or {}).get("totals", {})
+    if node == "premium_pay":
+        return (state["premium_pay_data"] or {}).get("totals", {})
+    if node == "guarantee":
+        return (state["guarantee_data"] or {}).get("calculation", {})
+    if node == "compliance":
+        compliance = state["compliance_status"] or {}
+        return {
+            "overall_compliance": compliance.get("overall_compliance"),
+            "requires_human_review": state["requires_human_review"],
+        }
+    if node == "claims":
+        return state["claims_data"] or {}
+    return {
+        "total_pay": state["total_pay"],
+        "total_hours": state["total_hours"],
+        "breakdown": state["breakdown"],
+        "confidence_score": state["confidence_score"],
+    }
+
 
 class CrewPayOrchestrator:
     """
@@ -42,8 +126,43 @@ class CrewPayOrchestrator:
     Coordinates all 7 specialized agents in the correct sequence.
     """
 
-    def __init__(self):
-        """Initialize the orchestrator and all agents."""
+    def __init__(
+        self,
+        checkpointer: Optional[Any] = None,
+        crew_sla_seconds: Optional[float] = None,
+        model_tiers: Optional[ModelTiers] = None,
+        speculate: Optional[bool] = None,
+        per_diem_rates: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize the orchestrator and all agents.
+
+        Args:
+            checkpointer: LangGraph checkpointer (see agents.checkpoint); when
+                set, every node's output is saved under the execution ID and
+                failed runs can be resumed with resume()
+            crew_sla_seconds: Time budget for one crew member's run, split
+                across the remaining Claude-calling nodes as each starts
+                (default: CREW_SLA_SECONDS, 0 disables node deadlines)
+            model_tiers: Model routing for every agent (default: each agent
+                reads CLAUDE_*_MODEL from the environment)
+            speculate: Start Premium Pay and Guarantee alongside Flight Time
+                on locally estimated credit hours, keeping their results
+                when Flight Time agrees within SPECULATION_TOLERANCE_HOURS
+                (default: SPECULATIVE_DOWNSTREAM, on)
+            per_diem_rates: Per diem rate table keyed by airport code, given
+                to Per Diem and to the compliance rate check (default: none;
+                Per Diem quotes default ranges and the rate check is skipped)
+        """
+        self.checkpointer = checkpointer
+        if crew_sla_seconds is None:
+            crew_sla_seconds = float(os.getenv("CREW_SLA_SECONDS", "180"))
+        self.crew_sla_seconds = crew_sla_seconds
+        if speculate is None:
+            speculate = os.getenv("SPECULATIVE_DOWNSTREAM", "true").lower() in ("1", "true", "yes")
+        self.speculate = speculate
+        self.speculation_tolerance = float(os.getenv("SPECULATION_TOLERANCE_HOURS", "0.01"))
+        self.per_diem_rates = per_diem_rates or {}
         self.flight_time_agent = FlightTimeCalculator()
         self.duty_time_agent = DutyTimeMonitor()
         self.per_diem_agent = PerDiemCalculator()
@@ -51,6 +170,25 @@ class CrewPayOrchestrator:
         self.guarantee_agent = GuaranteeCalculator()
         self.compliance_agent = ComplianceValidator()
         self.claim_resolution_agent = ClaimResolutionAgent()
+        if model_tiers is not None:
+            for agent in (
+                self.flight_time_agent,
+                self.duty_time_agent,
+                self.per_diem_agent,
+                self.premium_pay_agent,
+                self.guarantee_agent,
+                self.compliance_agent,
+                self.claim_resolution_agent,
+            ):
+                agent.tiers = model_tiers
+
+        # Progress listeners keyed by execution ID (the compiled graph is shared)
+        self._progress_callbacks: Dict[str, ProgressCallback] = {}
+        # SLA deadline (time.monotonic) per running execution
+        self._deadlines: Dict[str, float] = {}
+        # Speculative downstream runs per execution: the credit hours they
+        # assumed and a future per node
+        self._speculation: Dict[str, Dict[str, Any]] = {}
 
         # Build workflow graph
         self.workflow = self._build_workflow()
@@ -62,26 +200,35 @@ class CrewPayOrchestrator:
         Workflow:
         Entry → Flight Time → Duty Time → Per Diem → Premium →
         Guarantee → Compliance → [Pass → Claims / Fail → Human Review] → End
+
+        Nodes listed in state["skipped_nodes"] (see _skip_trivial_nodes) are
+        routed around; their outputs were filled before the run started.
+
+        Premium and Guarantee may already have run speculatively alongside
+        Flight Time (see _start_speculation); their nodes then only check
+        the estimate held.
         """
         workflow = StateGraph(CrewPayState)
 
         # Add nodes for each agent
-        workflow.add_node("flight_time", self._calculate_flight_time)
-        workflow.add_node("duty_time", self._monitor_duty_time)
-        workflow.add_node("per_diem", self._calculate_per_diem)
-        workflow.add_node("premium_pay", self._calculate_premium_pay)
-        workflow.add_node("guarantee", self._calculate_guarantee)
-        workflow.add_node("compliance", self._validate_compliance)
-        workflow.add_node("claims", self._process_claims)
-        workflow.add_node("finalize", self._finalize_results)
-
-        # Define edges (workflow sequence)
-        workflow.set_entry_point("flight_time")
-        workflow.add_edge("flight_time", "duty_time")
-        workflow.add_edge("duty_time", "per_diem")
-        workflow.add_edge("per_diem", "premium_pay")
-        workflow.add_edge("premium_pay", "guarantee")
-        workflow.add_edge("guarantee", "compliance")
+        nodes = {
+            "flight_time": self._calculate_flight_time,
+            "duty_time": self._monitor_duty_time,
+            "per_diem": self._calculate_per_diem,
+            "premium_pay": self._calculate_premium_pay,
+            "guarantee": self._calculate_guarantee,
+            "compliance": self._validate_compliance,
+            "claims": self._process_claims,
+            "finalize": self._finalize_results,
+        }
+        for name, node in nodes.items():
+            workflow.add_node(name, self._with_progress(name, self._with_deadline(name, node)))
+
+        # Define edges (workflow sequence, skipping trivial nodes)
+        workflow.set_conditional_entry_point(*self._route_to_next(None))
+        for name in SKIPPABLE_NODES[:-1]:
+            workflow.add_conditional_edges(name, *self._route_to_next(name))
+        workflow.add_edge(SKIPPABLE_NODES[-1], "compliance")
 
         # Conditional edge from compliance
         workflow.add_conditional_edges(
@@ -97,186 +244,390 @@ class CrewPayOrchestrator:
         workflow.add_edge("claims", "finalize")
         workflow.add_edge("finalize", END)
 
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
 
-    def _calculate_flight_time(self, state: CrewPayState) -> CrewPayState:
-        """Execute Flight Time Calculator agent."""
-        logger.info("Executing Flight Time Calculator...")
+    def _route_to_next(
+        self, after: Optional[str]
+    ) -> Tuple[Callable[[CrewPayState], str], Dict[str, str]]:
+        """Router to the first node after `after` that is not skipped, and its path map."""
+        start = SKIPPABLE_NODES.index(after) + 1 if after else 0
+        targets = SKIPPABLE_NODES[start:] + ("compliance",)
+
+        def route(state: CrewPayState) -> str:
+            skipped = state.get("skipped_nodes") or []
+            return next(node for node in targets if node not in skipped)
+
+        return route, {node: node for node in targets}
 
+    def _skip_trivial_nodes(self, state: CrewPayState) -> None:
+        """
+        Fill the outputs of nodes whose result the input already determines.
+
+        Each agent's trivial_result() is asked in workflow order (so a
+        determined Flight Time result can settle Guarantee too); nodes with
+        a result are recorded in skipped_nodes and never run. A reserve with
+        no flights finishes without any Claude call.
+        """
+        nodes = {
+            "flight_time": (self.flight_time_agent, "flight_time_data", self._flight_time_input),
+            "duty_time": (self.duty_time_agent, "duty_time_data", self._duty_time_input),
+            "per_diem": (self.per_diem_agent, "per_diem_data", self._per_diem_input),
+            "premium_pay": (
+                self.premium_pay_agent,
+                "premium_pay_data",
+                lambda state: self._premium_pay_input(state, state["flight_time_data"]),
+            ),
+            "guarantee": (
+                self.guarantee_agent,
+                "guarantee_data",
+                lambda state: self._guarantee_input(state, state["flight_time_data"]),
+            ),
+        }
+        for name in SKIPPABLE_NODES:
+            agent, output, build_input = nodes[name]
+            result = agent.trivial_result(build_input(state))
+            if result is not None:
+                state[output] = result
+                state["skipped_nodes"].append(name)
+        if state["skipped_nodes"]:
+            logger.debug("Skipping trivial nodes: %s", ", ".join(state["skipped_nodes"]))
+
+    def _emit(self, execution_id: str, event: Dict[str, Any]) -> None:
+        """Publish a progress event to the run's listener, if any."""
+        callback = self._progress_callbacks.get(execution_id)
+        if callback is None:
+            return
         try:
-            result = self.flight_time_agent.calculate(
+            callback(execution_id, event)
+        except Exception as e:
+            logger.warning(f"Progress callback error: {str(e)}")
+
+    def _with_deadline(
+        self, name: str, node: Callable[[CrewPayState], StateUpdate]
+    ) -> Callable[[CrewPayState], StateUpdate]:
+        """
+        Wrap a Claude-calling node so its calls share out the remaining SLA.
+
+        The node may use the time left divided by the number of LLM nodes
+        still to run, so time saved by fast nodes carries forward.
+        """
+        if name not in LLM_NODES:
+            return node
+        nodes_left = len(LLM_NODES) - LLM_NODES.index(name)
+
+        def run(state: CrewPayState) -> StateUpdate:
+            deadline = self._deadlines.get(state["execution_id"])
+            if deadline is None:
+                return node(state)
+            budget = max(0.0, deadline - time.monotonic()) / nodes_left
+            with deadline_scope(budget):
+                return node(state)
+
+        return run
+
+    def _with_progress(
+        self, name: str, node: Callable[[CrewPayState], StateUpdate]
+    ) -> Callable[[CrewPayState], StateUpdate]:
+        """Wrap a node so it emits node_started / node_completed events."""
+
+        def run(state: CrewPayState) -> StateUpdate:
+            execution_id = state["execution_id"]
+            if execution_id not in self._progress_callbacks:
+                return node(state)
+
+            self._emit(
+                execution_id,
+                {"event": "node_started", "node": name, "at": datetime.now().isoformat()},
+            )
+            errors = state["error_log"]
+            started = time.perf_counter()
+
+            def on_field(field: str, value: Any) -> None:
+                self._emit(
+                    execution_id,
+                    {"event": "node_field", "node": name, "field": field, "value": value},
+                )
+
+            # Streamed agent responses surface fields before the node finishes
+            with field_scope(on_field):
+                update = node(state)
+            self._emit(
+                execution_id,
                 {
-                    "crew_member_data": state["crew_member_data"],
-                    "flight_assignments": state["flight_assignments"],
-                    "execution_id": state["execution_id"],
-                }
+                    "event": "node_completed",
+                    "node": name,
+                    "at": datetime.now().isoformat(),
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                    "result": _node_summary(name, {**state, **update}),
+                    "errors": update.get("error_log", errors)[len(errors) :],
+                },
             )
+            return update
 
-            state["flight_time_data"] = result
-            state["status"] = "processing"
-            logger.info(
-                f"Flight Time calculated: {result.get('totals', {}).get('total_credit_hours', 0)} hours"
+        return run
+
+    def _calculate_flight_time(self, state: CrewPayState) -> StateUpdate:
+        """Execute Flight Time Calculator agent."""
+        logger.debug("Executing Flight Time Calculator...")
+        self._start_speculation(state)
+
+        try:
+            result = self.flight_time_agent.calculate(self._flight_time_input(state))
+            logger.debug(
+                "Flight Time calculated: %s hours",
+                result.get("totals", {}).get("total_credit_hours", 0),
             )
+            return {"flight_time_data": result, "status": "processing"}
 
         except Exception as e:
-            logger.error(f"Flight Time calculation error: {str(e)}")
-            state["error_log"].append(f"Flight Time Error: {str(e)}")
-            state["status"] = "error"
-
-        return state
+            logger.error("Flight Time calculation error: %s", e)
+            return {
+                "error_log": state["error_log"] + [f"Flight Time Error: {str(e)}"],
+                "status": "error",
+            }
 
-    def _monitor_duty_time(self, state: CrewPayState) -> CrewPayState:
+    def _monitor_duty_time(self, state: CrewPayState) -> StateUpdate:
         """Execute Duty Time Monitor agent."""
-        logger.info("Executing Duty Time Monitor...")
+        logger.debug("Executing Duty Time Monitor...")
 
         try:
-            result = self.duty_time_agent.calculate(
-                {
-                    "crew_member_data": state["crew_member_data"],
-                    "flight_assignments": state["flight_assignments"],
-                    "execution_id": state["execution_id"],
-                }
-            )
-
-            state["duty_time_data"] = result
-            logger.info(
-                f"Duty Time compliance: {result.get('compliance_status', 'unknown')}"
-            )
+            result = self.duty_time_agent.calculate(self._duty_time_input(state))
+            logger.debug("Duty Time compliance: %s", result.get("compliance_status", "unknown"))
+            update: StateUpdate = {"duty_time_data": result}
 
             # Flag violations
             if result.get("violations"):
-                state["warnings"].append(
+                update["warnings"] = state["warnings"] + [
                     f"Duty time violations detected: {len(result['violations'])}"
-                )
+                ]
+            return update
 
         except Exception as e:
-            logger.error(f"Duty Time monitoring error: {str(e)}")
-            state["error_log"].append(f"Duty Time Error: {str(e)}")
-
-        return state
+            logger.error("Duty Time monitoring error: %s", e)
+            return {"error_log": state["error_log"] + [f"Duty Time Error: {str(e)}"]}
 
-    def _calculate_per_diem(self, state: CrewPayState) -> CrewPayState:
+    def _calculate_per_diem(self, state: CrewPayState) -> StateUpdate:
         """Execute Per Diem Calculator agent."""
-        logger.info("Executing Per Diem Calculator...")
+        logger.debug("Executing Per Diem Calculator...")
 
         try:
-            # Note: In production, fetch per_diem_rates from database
-            result = self.per_diem_agent.calculate(
-                {
-                    "crew_member_data": state["crew_member_data"],
-                    "flight_assignments": state["flight_assignments"],
-                    "per_diem_rates": {},  # Would be loaded from DB
-                    "execution_id": state["execution_id"],
-                }
-            )
-
-            state["per_diem_data"] = result
-            logger.info(
-                f"Per Diem calculated: ${result.get('totals', {}).get('total_net_per_diem', 0)}"
+            result = self.per_diem_agent.calculate(self._per_diem_input(state))
+            logger.debug(
+                "Per Diem calculated: $%s", result.get("totals", {}).get("total_net_per_diem", 0)
             )
+            return {"per_diem_data": result}
 
         except Exception as e:
-            logger.error(f"Per Diem calculation error: {str(e)}")
-            state["error_log"].append(f"Per Diem Error: {str(e)}")
-
-        return state
+            logger.error("Per Diem calculation error: %s", e)
+            return {"error_log": state["error_log"] + [f"Per Diem Error: {str(e)}"]}
 
-    def _calculate_premium_pay(self, state: CrewPayState) -> CrewPayState:
+    def _calculate_premium_pay(self, state: CrewPayState) -> StateUpdate:
         """Execute Premium Pay Calculator agent."""
-        logger.info("Executing Premium Pay Calculator...")
+        logger.debug("Executing Premium Pay Calculator...")
 
         try:
-            result = self.premium_pay_agent.calculate(
-                {
-                    "crew_member_data": state["crew_member_data"],
-                    "flight_assignments": state["flight_assignments"],
-                    "flight_time_data": state["flight_time_data"],
-                    "premium_rules": {},  # Would be loaded from DB
-                    "execution_id": state["execution_id"],
-                }
-            )
+            result = self._speculative_result(state, "premium_pay")
+            if result is None:
+                result = self.premium_pay_agent.calculate(
+                    self._premium_pay_input(state, state["flight_time_data"])
+                )
 
-            state["premium_pay_data"] = result
-            logger.info(
-                f"Premium Pay calculated: ${result.get('totals', {}).get('total_premium_pay', 0)}"
+            logger.debug(
+                "Premium Pay calculated: $%s", result.get("totals", {}).get("total_premium_pay", 0)
             )
+            return {"premium_pay_data": result}
 
         except Exception as e:
-            logger.error(f"Premium Pay calculation error: {str(e)}")
-            state["error_log"].append(f"Premium Pay Error: {str(e)}")
+            logger.error("Premium Pay calculation error: %s", e)
+            return {"error_log": state["error_log"] + [f"Premium Pay Error: {str(e)}"]}
 
-        return state
-
-    def _calculate_guarantee(self, state: CrewPayState) -> CrewPayState:
+    def _calculate_guarantee(self, state: CrewPayState) -> StateUpdate:
         """Execute Guarantee Calculator agent."""
-        logger.info("Executing Guarantee Calculator...")
+        logger.debug("Executing Guarantee Calculator...")
 
         try:
-            result = self.guarantee_agent.calculate(
-                {
-                    "crew_member_data": state["crew_member_data"],
-                    "flight_time_data": state["flight_time_data"],
-                    "pay_period_start": state["pay_period_start"],
-                    "pay_period_end": state["pay_period_end"],
-                    "execution_id": state["execution_id"],
-                }
-            )
+            result = self._speculative_result(state, "guarantee")
+            if result is None:
+                result = self.guarantee_agent.calculate(
+                    self._guarantee_input(state, state["flight_time_data"])
+                )
 
-            state["guarantee_data"] = result
-            logger.info(
-                f"Guarantee calculated: {result.get('paid_hours', 0)} hours paid"
+            logger.debug("Guarantee calculated: %s hours paid", result.get("paid_hours", 0))
+            return {"guarantee_data": result}
+
+        except Exception as e:
+            logger.error("Guarantee calculation error: %s", e)
+            return {"error_log": state["error_log"] + [f"Guarantee Error: {str(e)}"]}
+
+    def _flight_time_input(self, state: CrewPayState) -> Dict[str, Any]:
+        return {
+            "crew_member_data": state["crew_member_data"],
+            "flight_assignments": state["flight_assignments"],
+            "flight_records": state["flight_records"],
+            "execution_id": state["execution_id"],
+        }
+
+    def _duty_time_input(self, state: CrewPayState) -> Dict[str, Any]:
+        return {
+            "crew_member_data": state["crew_member_data"],
+            "flight_assignments": state["flight_assignments"],
+            "flight_records": state["flight_records"],
+            "execution_id": state["execution_id"],
+        }
+
+    def _per_diem_input(self, state: CrewPayState) -> Dict[str, Any]:
+        return {
+            "crew_member_data": state["crew_member_data"],
+            "flight_assignments": state["flight_assignments"],
+            "flight_records": state["flight_records"],
+            "per_diem_rates": self.per_diem_rates,
+            "execution_id": state["execution_id"],
+        }
+
+    def _premium_pay_input(
+        self, state: CrewPayState, flight_time_data: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return {
+            "crew_member_data": state["crew_member_data"],
+            "flight_assignments": state["flight_assignments"],
+            "flight_records": state["flight_records"],
+            "flight_time_data": flight_time_data,
+            "premium_rules": {},  # Would be loaded from DB
+            "execution_id": state["execution_id"],
+        }
+
+    def _guarantee_input(
+        self, state: CrewPayState, flight_time_data: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return {
+            "crew_member_data": state["crew_member_data"],
+            "flight_time_data": flight_time_data,
+            "flight_records": state["flight_records"],
+            "pay_period_start": state["pay_period_start"],
+            "pay_period_end": state["pay_period_end"],
+            "execution_id": state["execution_id"],
+        }
+
+    def _start_speculation(self, state: CrewPayState) -> None:
+        """
+        Start Premium Pay and Guarantee on locally estimated flight time.
+
+        Both only read total credit hours from Flight Time, which for most
+        rosters is the sum of MAX(block time, 1.0) already in the input, so
+        they run concurrently with Flight Time instead of after it. Their
+        calls get the rest of the run's SLA rather than Flight Time's share,
+        and stream no progress fields (the node that uses them reports).
+        """
+        skipped = state.get("skipped_nodes") or []
+        nodes = [node for node in SPECULATIVE_NODES if node not in skipped]
+        if not self.speculate or not nodes or not state["flight_records"]:
+            return
+        execution_id = state["execution_id"]
+        estimate = estimate_flight_time(state["flight_records"])
+        deadline = self._deadlines.get(execution_id)
+
+        def run(
+            calculate: Callable[[Dict[str, Any]], Dict[str, Any]], agent_input: Dict[str, Any]
+        ) -> Dict[str, Any]:
+            budget = None if deadline is None else max(0.0, deadline - time.monotonic())
+            with deadline_scope(budget), field_scope(None):
+                return calculate(agent_input)
+
+        speculative = {
+            "premium_pay": (self.premium_pay_agent, self._premium_pay_input),
+            "guarantee": (self.guarantee_agent, self._guarantee_input),
+        }
+        executor = _get_speculation_executor()
+        futures: Dict[str, Future] = {}
+        for node in nodes:
+            agent, build_input = speculative[node]
+            futures[node] = executor.submit(
+                contextvars.copy_context().run, run, agent.calculate, build_input(state, estimate)
             )
+        self._speculation[execution_id] = {
+            "credit_hours": estimate["totals"]["total_credit_hours"],
+            "futures": futures,
+        }
+
+    def _speculative_result(self, state: CrewPayState, node: str) -> Optional[Dict[str, Any]]:
+        """
+        Speculative result for node, if its estimate held.
 
+        Returns None (the node runs normally) when nothing was speculated,
+        the speculative run failed, or Flight Time's credit hours differ
+        from the estimate by more than the tolerance.
+        """
+        speculation = self._speculation.get(state["execution_id"])
+        if speculation is None or node not in speculation["futures"]:
+            return None
+        future = speculation["futures"].pop(node)
+        try:
+            result = future.result()
         except Exception as e:
-            logger.error(f"Guarantee calculation error: {str(e)}")
-            state["error_log"].append(f"Guarantee Error: {str(e)}")
+            logger.warning(f"Speculative {node} failed, re-running: {str(e)}")
+            return None
 
-        return state
+        estimated = speculation["credit_hours"]
+        actual = ((state["flight_time_data"] or {}).get("totals") or {}).get(
+            "total_credit_hours"
+        )
+        if actual is None or abs(float(actual) - estimated) > self.speculation_tolerance:
+            logger.info(
+                "Re-running %s: estimated %s credit hours, Flight Time reported %s",
+                node,
+                estimated,
+                actual,
+            )
+            return None
+        logger.debug("Using speculative %s result (%s credit hours)", node, estimated)
+        return result
 
-    def _validate_compliance(self, state: CrewPayState) -> CrewPayState:
+    def _validate_compliance(self, state: CrewPayState) -> StateUpdate:
         """Execute Compliance Validator agent."""
-        logger.info("Executing Compliance Validator...")
+        logger.debug("Executing Compliance Validator...")
 
         try:
             result = self.compliance_agent.calculate(
                 {
                     "crew_member_data": state["crew_member_data"],
+                    "flight_assignments": state["flight_assignments"],
+                    "flight_records": state["flight_records"],
                     "flight_time_data": state["flight_time_data"],
                     "duty_time_data": state["duty_time_data"],
                     "per_diem_data": state["per_diem_data"],
                     "premium_pay_data": state["premium_pay_data"],
                     "guarantee_data": state["guarantee_data"],
+                    "per_diem_rates": self.per_diem_rates,
+                    "pay_period_start": state["pay_period_start"],
+                    "pay_period_end": state["pay_period_end"],
                     "execution_id": state["execution_id"],
                 }
             )
 
-            state["compliance_status"] = result
-            state["requires_human_review"] = result.get("requires_human_review", False)
-
-            logger.info(
-                f"Compliance validation: {result.get('overall_compliance', 'unknown')}"
-            )
+            logger.debug("Compliance validation: %s", result.get("overall_compliance", "unknown"))
+            return {
+                "compliance_status": result,
+                "requires_human_review": result.get("requires_human_review", False),
+            }
 
         except Exception as e:
-            logger.error(f"Compliance validation error: {str(e)}")
-            state["error_log"].append(f"Compliance Error: {str(e)}")
-            state["requires_human_review"] = True
-
-        return state
+            logger.error("Compliance validation error: %s", e)
+            return {
+                "error_log": state["error_log"] + [f"Compliance Error: {str(e)}"],
+                "requires_human_review": True,
+            }
 
-    def _process_claims(self, state: CrewPayState) -> CrewPayState:
+    def _process_claims(self, state: CrewPayState) -> StateUpdate:
         """Execute Claim Resolution agent if needed."""
-        logger.info("Processing claims (if any)...")
+        logger.debug("Processing claims (if any)...")
 
         # Note: In production, this would check for existing claims
         # For now, just log that we checked
-        state["claims_data"] = {"claims_processed": 0}
-
-        return state
+        return {"claims_data": {"claims_processed": 0}}
 
-    def _finalize_results(self, state: CrewPayState) -> CrewPayState:
+    def _finalize_results(self, state: CrewPayState) -> StateUpdate:
         """Finalize and calculate total pay."""
-        logger.info("Finalizing results...")
+        logger.debug("Finalizing results...")
 
         try:
             # Calculate total pay
@@ -298,19 +649,6 @@ class CrewPayOrchestrator:
 
             total_pay = base_pay + per_diem + premium_pay
 
-            state["total_pay"] = total_pay
-            state["total_hours"] = state["flight_time_data"].get("totals", {}).get(
-                "total_credit_hours", 0
-            )
-            state["breakdown"] = {
-                "base_pay": base_pay,
-                "flight_pay": flight_pay,
-                "guarantee_pay": guarantee_pay,
-                "per_diem": per_diem,
-                "premium_pay": premium_pay,
-                "total_pay": total_pay,
-            }
-
             # Calculate confidence score
             flight_confidence = state["flight_time_data"].get("confidence_score", 1.0)
             duty_confidence = state["duty_time_data"].get("confidence_score", 1.0)
@@ -321,7 +659,7 @@ class CrewPayOrchestrator:
                 "confidence_score", 1.0
             )
 
-            state["confidence_score"] = min(
+            confidence_score = min(
                 flight_confidence,
                 duty_confidence,
                 per_diem_confidence,
@@ -330,18 +668,31 @@ class CrewPayOrchestrator:
                 compliance_confidence,
             )
 
-            state["status"] = "complete"
-            state["processing_completed_at"] = datetime.now().isoformat()
-
-            logger.info(f"Final total pay: ${total_pay:.2f}")
-            logger.info(f"Confidence score: {state['confidence_score']:.2f}")
+            logger.info("Final total pay: $%.2f (confidence %.2f)", total_pay, confidence_score)
+            return {
+                "total_pay": total_pay,
+                "total_hours": state["flight_time_data"].get("totals", {}).get(
+                    "total_credit_hours", 0
+                ),
+                "breakdown": {
+                    "base_pay": base_pay,
+                    "flight_pay": flight_pay,
+                    "guarantee_pay": guarantee_pay,
+                    "per_diem": per_diem,
+                    "premium_pay": premium_pay,
+                    "total_pay": total_pay,
+                },
+                "confidence_score": confidence_score,
+                "status": "complete",
+                "processing_completed_at": datetime.now().isoformat(),
+            }
 
         except Exception as e:
-            logger.error(f"Finalization error: {str(e)}")
-            state["error_log"].append(f"Finalization Error: {str(e)}")
-            state["status"] = "error"
-
-        return state
+            logger.error("Finalization error: %s", e)
+            return {
+                "error_log": state["error_log"] + [f"Finalization Error: {str(e)}"],
+                "status": "error",
+            }
 
     def _route_after_compliance(self, state: CrewPayState) -> str:
         """Decide routing after compliance check."""
@@ -362,25 +713,31 @@ class CrewPayOrchestrator:
         flight_assignments: list,
         pay_period_start: str,
         pay_period_end: str,
+        execution_id: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
     ) -> CrewPayState:
         """
         Process crew pay calculations.
 
         Args:
             crew_member_data: Crew member profile
-            flight_assignments: List of flight assignments
+            flight_assignments: Flight assignment dicts, ORM rows or FlightRecords
             pay_period_start: Start date (YYYY-MM-DD)
             pay_period_end: End date (YYYY-MM-DD)
+            execution_id: Execution ID to use (optional, generated if omitted)
+            on_progress: Called with (execution_id, event) as the run starts,
+                as each node starts and completes, and when the run ends
 
         Returns:
             Final state with all calculations
         """
-        execution_id = str(uuid.uuid4())
+        execution_id = execution_id or str(uuid.uuid4())
 
         logger.info(
-            f"Starting crew pay processing for {crew_member_data.get('employee_id')}"
+            "Starting crew pay processing for %s (execution %s)",
+            crew_member_data.get("employee_id"),
+            execution_id,
         )
-        logger.info(f"Execution ID: {execution_id}")
 
         # Initialize state
         initial_state: CrewPayState = {
@@ -391,6 +748,7 @@ class CrewPayOrchestrator:
             "execution_id": execution_id,
             "crew_member_data": crew_member_data,
             "flight_assignments": flight_assignments,
+            "flight_records": load_flight_records(flight_assignments),
             "flight_time_data": None,
             "duty_time_data": None,
             "per_diem_data": None,
@@ -406,15 +764,139 @@ class CrewPayOrchestrator:
             "warnings": [],
             "requires_human_review": False,
             "confidence_score": 1.0,
+            "skipped_nodes": [],
             "processing_started_at": datetime.now().isoformat(),
             "processing_completed_at": None,
         }
+        self._skip_trivial_nodes(initial_state)
+
+        if self.checkpointer is not None:
+            # ORM rows cannot be checkpointed; their records carry the same fields
+            initial_state["flight_assignments"] = [
+                flight if isinstance(flight, (dict, FlightRecord)) else record
+                for flight, record in zip(flight_assignments, initial_state["flight_records"])
+            ]
+
+        return self._run(
+            execution_id,
+            initial_state,
+            thread_config(execution_id),
+            on_progress,
+            {
+                "event": "execution_started",
+                "employee_id": initial_state["employee_id"],
+                "pay_period_start": pay_period_start,
+                "pay_period_end": pay_period_end,
+                "skipped_nodes": initial_state["skipped_nodes"],
+                "at": initial_state["processing_started_at"],
+            },
+        )
+
+    def resume(
+        self, execution_id: str, on_progress: Optional[ProgressCallback] = None
+    ) -> CrewPayState:
+        """
+        Re-run a checkpointed execution from its first failed node.
+
+        Nodes before the failed one are not re-run; their outputs are
+        restored from the checkpoint. An execution with no failed node
+        returns its last saved state unchanged.
 
-        # Run workflow
-        final_state = self.workflow.invoke(initial_state)
+        Args:
+            execution_id: Execution to resume
+            on_progress: Progress callback, as for process()
 
-        logger.info(f"Processing complete. Status: {final_state['status']}")
+        Returns:
+            Final state after the resumed run
 
+        Raises:
+            RuntimeError: If the orchestrator has no checkpointer
+            KeyError: If no checkpoints exist for the execution
+        """
+        if self.checkpointer is None:
+            raise RuntimeError("Resuming requires an orchestrator with a checkpointer")
+
+        history = list(self.workflow.get_state_history(thread_config(execution_id)))
+        if not history:
+            raise KeyError(execution_id)
+        history.reverse()
+
+        resume_from = first_failed_step(history)
+        if resume_from is None:
+            logger.info(f"Execution {execution_id} has no failed node; nothing to resume")
+            return history[-1].values
+
+        logger.info(f"Resuming execution {execution_id} at {', '.join(resume_from.next)}")
+        return self._run(
+            execution_id,
+            None,
+            resume_from.config,
+            on_progress,
+            {
+                "event": "execution_started",
+                "employee_id": resume_from.values.get("employee_id"),
+                "resumed_at_node": resume_from.next[0],
+                "at": datetime.now().isoformat(),
+            },
+        )
+
+    def _run(
+        self,
+        execution_id: str,
+        graph_input: Optional[CrewPayState],
+        config: Dict[str, Any],
+        on_progress: Optional[ProgressCallback],
+        started_event: Dict[str, Any],
+    ) -> CrewPayState:
+        """Invoke the workflow, emitting start/completion progress events."""
+        if on_progress is None:
+            return self._invoke(execution_id, graph_input, config)
+
+        self._progress_callbacks[execution_id] = on_progress
+        started = time.perf_counter()
+        final_state = None
+        try:
+            self._emit(execution_id, started_event)
+            final_state = self._invoke(execution_id, graph_input, config)
+            return final_state
+        finally:
+            self._emit(
+                execution_id,
+                {
+                    "event": "execution_completed",
+                    "status": final_state["status"] if final_state else "error",
+                    "total_pay": final_state["total_pay"] if final_state else None,
+                    "requires_human_review": (
+                        final_state["requires_human_review"] if final_state else True
+                    ),
+                    "at": datetime.now().isoformat(),
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                },
+            )
+            del self._progress_callbacks[execution_id]
+
+    def _invoke(
+        self, execution_id: str, graph_input: Optional[CrewPayState], config: Dict[str, Any]
+    ) -> CrewPayState:
+        if self.crew_sla_seconds:
+            self._deadlines[execution_id] = time.monotonic() + self.crew_sla_seconds
+        try:
+            final_state = self.workflow.invoke(graph_input, config=config)
+        finally:
+            self._deadlines.pop(execution_id, None)
+            speculation = self._speculation.pop(execution_id, None)
+            if speculation is not None:
+                for future in speculation["futures"].values():
+                    future.cancel()
+        logger.debug("Processing complete. Status: %s", final_state["status"])
+
+        # Clean runs never need resuming; keep checkpoints only for failures
+        if (
+            self.checkpointer is not None
+            and final_state["status"] == "complete"
+            and not final_state["error_log"]
+        ):
+            discard_checkpoints(self.checkpointer, execution_id)
         return final_state
 
 
@@ -492,6 +974,13 @@ def run_crew_pay_workflow(
 
 
 if __name__ == "__main__":
+    # Load environment variables (the API loads them in api.config)
+    load_dotenv()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
     # Test the workflow
     print("Testing Crew Pay Workflow...")
     print("=" * 80)
@@ -0,0 +1,238 @@
+"""
+Compact tabular encoding of flights for agent prompts.
+
+Flights are rendered as a header row plus one CSV row per leg, carrying
+only the columns an agent needs, so prompt size grows by a short line per
+leg instead of a multi-line block. estimate_tokens() gives a cheap size
+estimate used to split rosters that would exceed an agent's prompt budget;
+trip_chunks() splits along trip boundaries for map-reduce execution.
+"""
+
+import csv
+import io
+import math
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .flight_record import HOURS_SCALE, FlightRecord, as_flight_records
+
+# Rough characters per token for the dense, mostly numeric tables sent to
+# Claude (errs on the high side of the token count)
+CHARS_PER_TOKEN = 3.5
+
+# A column: header name and how to render a flight's value
+Column = Tuple[str, Callable[[FlightRecord], str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens Claude will count for text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def clock(value: Optional[datetime], day: Optional[date]) -> str:
+    """Time as HH:MM, suffixed +N when it falls N days after day."""
+    if value is None:
+        return ""
+    text = value.strftime("%H:%M")
+    if day is not None and value.date() != day:
+        text += f"{(value.date() - day).days:+d}"
+    return text
+
+
+def hours(value: Optional[float]) -> str:
+    """Hours without trailing zeros (blank when unknown)."""
+    return "" if value is None else f"{value:g}"
+
+
+def route(flight: FlightRecord) -> str:
+    """Origin-destination, e.g. BUR-PDX."""
+    return f"{flight.origin_airport}-{flight.destination_airport}"
+
+
+FLIGHT = ("flight", lambda f: f.flight_number or "")
+DATE = ("date", lambda f: f.flight_date.isoformat() if f.flight_date else "")
+ROUTE = ("route", route)
+SCHED_DEP = ("sched_dep", lambda f: clock(f.scheduled_departure, f.flight_date))
+ACT_DEP = ("act_dep", lambda f: clock(f.actual_departure, f.flight_date))
+SCHED_ARR = ("sched_arr", lambda f: clock(f.scheduled_arrival, f.flight_date))
+ACT_ARR = ("act_arr", lambda f: clock(f.actual_arrival, f.flight_date))
+SCHED_BLOCK = ("sched_block", lambda f: hours(f.scheduled_block_time))
+ACT_BLOCK = ("act_block", lambda f: hours(f.actual_block_time))
+BLOCK = ("block", lambda f: hours(f.block_hours))
+POSITION = ("pos", lambda f: f.position or "")
+TRIP = ("trip", lambda f: f.trip_id or "")
+
+TABLE_LEGEND = "Times are HH:MM on the flight date (+1 = next day); hours are decimal."
+
+
+def _rows(flights: Sequence[FlightRecord], columns: Sequence[Column]) -> List[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    rows = []
+    for flight in flights:
+        writer.writerow([render(flight) for _, render in columns])
+        rows.append(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
+    return rows
+
+
+def encode_flights(flights: Sequence[FlightRecord], columns: Sequence[Column]) -> str:
+    """
+    Render flights as a CSV table.
+
+    Args:
+        flights: Flight records (or assignment dicts)
+        columns: Columns to include, in order
+
+    Returns:
+        Header line followed by one row per flight
+    """
+    header = ",".join(name for name, _ in columns) + "\n"
+    return header + "".join(_rows(as_flight_records(flights), columns)).rstrip("\n")
+
+
+def _row_tokens(
+    flights: Sequence[FlightRecord], columns: Sequence[Column]
+) -> List[Tuple[FlightRecord, int]]:
+    return [(f, estimate_tokens(row)) for f, row in zip(flights, _rows(flights, columns))]
+
+
+def _header_tokens(columns: Sequence[Column]) -> int:
+    return estimate_tokens(",".join(name for name, _ in columns) + "\n")
+
+
+def chunk_flights(
+    flights: Sequence[FlightRecord],
+    columns: Sequence[Column],
+    token_budget: int,
+    max_flights: Optional[int] = None,
+) -> List[Tuple[FlightRecord, ...]]:
+    """
+    Split flights into consecutive runs whose tables fit a token budget.
+
+    Args:
+        flights: Flight records in prompt order
+        columns: Columns the table will use
+        token_budget: Maximum estimated tokens per table
+        max_flights: Maximum flights per chunk (bounds the response size)
+
+    Returns:
+        One or more chunks (a single chunk when everything fits; a flight
+        too large for the budget on its own still gets a chunk)
+    """
+    flights = as_flight_records(flights)
+    header_tokens = _header_tokens(columns)
+    chunks: List[Tuple[FlightRecord, ...]] = []
+    current: List[FlightRecord] = []
+    used = header_tokens
+    for flight, row_tokens in _row_tokens(flights, columns):
+        if current and (
+            used + row_tokens > token_budget or (max_flights and len(current) >= max_flights)
+        ):
+            chunks.append(tuple(current))
+            current, used = [], header_tokens
+        current.append(flight)
+        used += row_tokens
+    if current or not chunks:
+        chunks.append(tuple(current))
+    return chunks
+
+
+def _leg_order(flight: FlightRecord) -> Tuple[Any, ...]:
+    return (
+        flight.flight_date or date.min,
+        flight.scheduled_departure or flight.actual_departure or datetime.min,
+        flight.flight_number or "",
+    )
+
+
+def _trip_order(flight: FlightRecord) -> Tuple[Any, ...]:
+    return (flight.sequence_number is None, flight.sequence_number or 0) + _leg_order(flight)
+
+
+def group_trips(flights: Sequence[FlightRecord]) -> List[Tuple[FlightRecord, ...]]:
+    """
+    Group legs into trips (by trip_id; flights without one stand alone).
+
+    Returns:
+        Trips in chronological order, legs ordered by sequence_number
+    """
+    trips: Dict[Any, List[FlightRecord]] = {}
+    for index, flight in enumerate(as_flight_records(flights)):
+        trips.setdefault(flight.trip_id or ("leg", index), []).append(flight)
+    return sorted(
+        (tuple(sorted(legs, key=_trip_order)) for legs in trips.values()),
+        key=lambda legs: _leg_order(legs[0]) + (str(legs[0].trip_id or ""),),
+    )
+
+
+def trip_chunks(
+    flights: Sequence[FlightRecord],
+    columns: Sequence[Column],
+    token_budget: int,
+    max_flights: Optional[int] = None,
+) -> List[Tuple[FlightRecord, ...]]:
+    """
+    Split flights into chunks that keep each trip together.
+
+    Legs are grouped by trip_id (flights without one stand alone) and
+    ordered by sequence_number; whole trips are packed into chunks in
+    chronological order. A trip that alone exceeds the limits is split
+    at leg boundaries. The result depends only on the flights, not their
+    input order, so chunked runs merge deterministically.
+
+    Args:
+        flights: Flight records
+        columns: Columns the table will use
+        token_budget: Maximum estimated tokens per table
+        max_flights: Maximum flights per chunk (bounds the response size)
+
+    Returns:
+        One or more chunks
+    """
+    header_tokens = _header_tokens(columns)
+    chunks: List[Tuple[FlightRecord, ...]] = []
+    current: List[FlightRecord] = []
+    used = header_tokens
+    for legs in group_trips(flights):
+        trip_tokens = sum(tokens for _, tokens in _row_tokens(legs, columns))
+        if header_tokens + trip_tokens > token_budget or (max_flights and len(legs) > max_flights):
+            if current:
+                chunks.append(tuple(current))
+                current, used = [], header_tokens
+            chunks.extend(chunk_flights(tuple(legs), columns, token_budget, max_flights))
+            continue
+        if current and (
+            used + trip_tokens > token_budget
+            or (max_flights and len(current) + len(legs) > max_flights)
+        ):
+            chunks.append(tuple(current))
+            current, used = [], header_tokens
+        current.extend(legs)
+        used += trip_tokens
+    if current or not chunks:
+        chunks.append(tuple(current))
+    return chunks
+
+
+def encode_daily_totals(flights: Sequence[FlightRecord]) -> str:
+    """
+    Summarize flights as one CSV row per day (legs, block and credit hours).
+
+    Used when the per-leg table would not fit the prompt budget.
+    """
+    days: Dict[Optional[date], List[int]] = {}
+    for flight in as_flight_records(flights):
+        totals = days.setdefault(flight.flight_date, [0, 0, 0])
+        totals[0] += 1
+        totals[1] += flight.block_centihours
+        totals[2] += flight.credit_centihours
+    lines = ["date,legs,block,credit"]
+    for day in sorted(days, key=lambda d: (d is None, d)):
+        legs, block, credit = days[day]
+        lines.append(
+            f"{day.isoformat() if day else ''},{legs},"
+            f"{hours(block / HOURS_SCALE)},{hours(credit / HOURS_SCALE)}"
+        )
+    return "\n".join(lines)
@@ -72,6 +72,7 @@ Return a JSON object with:
     "hourly_rate": float,
     "base_pay": float
   },
+  "confidence_score": float,
   "breakdown_by_day": [
     {
       "date": "YYYY-MM-DD",
@@ -80,8 +81,7 @@ Return a JSON object with:
       "paid_hours": float
     }
   ],
-  "notes": ["string"],
-  "confidence_score": float
+  "notes": ["string"]
 }
 
 IMPORTANT:
@@ -0,0 +1,437 @@
+"""
+Columnar roster batch for vectorized pay math.
+
+Holds every leg of a pay period (across many crew members) as NumPy
+columns so block time, credit hours, premium flags and per-crew totals are
+computed with vectorized operations and grouped reductions instead of a
+Python loop per flight.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .flight_record import HOURS_SCALE, MIN_CREDIT_CENTIHOURS, as_flight_records
+from .rules import pay_rules
+from .rules.faa_limits import CUMULATIVE_LIMITS, MIN_REST_HOURS, max_fdp_hours
+
+_EPOCH = datetime(1970, 1, 1)
+_SECONDS_PER_DAY = 86400
+
+# Table B as a (report hour, segments - 1) grid for vectorized lookups
+_FDP_GRID = np.array(
+    [
+        [max_fdp_hours(datetime(2000, 1, 1, hour), segments) for segments in range(1, 8)]
+        for hour in range(24)
+    ]
+)
+
+
+def _epoch_seconds(value: Optional[datetime]) -> int:
+    """Naive datetime to integer seconds since 1970-01-01 (0 if missing)."""
+    if value is None:
+        return 0
+    return int((value - _EPOCH).total_seconds())
+
+
+def _epoch_day(value: Optional[date]) -> int:
+    """Date to days since 1970-01-01 (0 if missing)."""
+    if value is None:
+        return 0
+    return (value - _EPOCH.date()).days
+
+
+class RosterBatch:
+    """
+    Column-oriented legs for many crew members.
+
+    Legs are kept grouped by crew_index and ordered by departure within each
+    crew member; the constructor reorders the columns if needed.
+    """
+
+    __slots__ = (
+        "crew_ids",
+        "hourly_rates",
+        "redeye_rates",
+        "crew_index",
+        "departure_epoch",
+        "arrival_epoch",
+        "block_centihours",
+        "flight_day",
+        "is_redeye",
+        "is_international",
+        "is_deadhead",
+        "has_overnight",
+        "per_diem_rate",
+        "duty_report_epoch",
+        "duty_end_epoch",
+    )
+
+    def __init__(
+        self,
+        crew_ids: Sequence[str],
+        hourly_rates: np.ndarray,
+        redeye_rates: np.ndarray,
+        crew_index: np.ndarray,
+        departure_epoch: np.ndarray,
+        arrival_epoch: np.ndarray,
+        block_centihours: np.ndarray,
+        flight_day: np.ndarray,
+        is_redeye: np.ndarray,
+        is_international: np.ndarray,
+        is_deadhead: np.ndarray,
+        has_overnight: np.ndarray,
+        per_diem_rate: np.ndarray,
+        duty_report_epoch: Optional[np.ndarray] = None,
+        duty_end_epoch: Optional[np.ndarray] = None,
+    ):
+        """
+        Initialize a batch from column arrays.
+
+        Args:
+            crew_ids: Crew member ID for each crew index
+            hourly_rates: Hourly rate per crew member (float64)
+            redeye_rates: Red-eye premium per segment per crew member (float64)
+            crew_index: Crew member index per leg (int32)
+            departure_epoch: Departure, seconds since epoch per leg (int64)
+            arrival_epoch: Arrival, seconds since epoch per leg (int64)
+            block_centihours: Block time in hundredths of an hour per leg (int32)
+            flight_day: Flight date, days since epoch per leg (int32)
+            is_redeye: Scheduled red-eye flag per leg (bool)
+            is_international: International flag per leg (bool)
+            is_deadhead: Deadhead flag per leg (bool)
+            has_overnight: Leg ends in a layover (bool)
+            per_diem_rate: Daily per diem rate at the layover (float64)
+            duty_report_epoch: Duty report, seconds since epoch per leg (int64, 0 if missing)
+            duty_end_epoch: Duty release, seconds since epoch per leg (int64, 0 if missing)
+        """
+        self.crew_ids = list(crew_ids)
+        self.hourly_rates = np.asarray(hourly_rates, dtype=np.float64)
+        self.redeye_rates = np.asarray(redeye_rates, dtype=np.float64)
+        legs = np.shape(crew_index)[0]
+
+        columns = {
+            "crew_index": np.asarray(crew_index, dtype=np.int32),
+            "departure_epoch": np.asarray(departure_epoch, dtype=np.int64),
+            "arrival_epoch": np.asarray(arrival_epoch, dtype=np.int64),
+            "block_centihours": np.asarray(block_centihours, dtype=np.int32),
+            "flight_day": np.asarray(flight_day, dtype=np.int32),
+            "is_redeye": np.asarray(is_redeye, dtype=bool),
+            "is_international": np.asarray(is_international, dtype=bool),
+            "is_deadhead": np.asarray(is_deadhead, dtype=bool),
+            "has_overnight": np.asarray(has_overnight, dtype=bool),
+            "per_diem_rate": np.asarray(per_diem_rate, dtype=np.float64),
+            "duty_report_epoch": np.asarray(
+                np.zeros(legs) if duty_report_epoch is None else duty_report_epoch,
+                dtype=np.int64,
+            ),
+            "duty_end_epoch": np.asarray(
+                np.zeros(legs) if duty_end_epoch is None else duty_end_epoch,
+                dtype=np.int64,
+            ),
+        }
+
+        sort_key = (columns["crew_index"].astype(np.int64) << 40) + columns[
+            "departure_epoch"
+        ]
+        if sort_key.size and np.any(np.diff(sort_key) < 0):
+            order = np.argsort(sort_key, kind="stable")
+            columns = {name: column[order] for name, column in columns.items()}
+
+        for name, column in columns.items():
+            column.setflags(write=False)
+            setattr(self, name, column)
+
+    @classmethod
+    def from_roster(
+        cls,
+        roster: Iterable[Tuple[Dict[str, Any], Sequence[Any]]],
+        per_diem_rates: Optional[Dict[str, Any]] = None,
+    ) -> "RosterBatch":
+        """
+        Build a batch from (crew_member_data, flights) pairs.
+
+        Args:
+            roster: Crew member profiles with their flight dicts or FlightRecords
+            per_diem_rates: Rate table keyed by airport code (optional)
+
+        Returns:
+            RosterBatch covering every leg in the roster
+        """
+        rates = per_diem_rates or {}
+        crew_ids, hourly_rates, redeye_rates = [], [], []
+        columns: Dict[str, list] = {name: [] for name in cls.__slots__[3:]}
+
+        for index, (crew_member, flights) in enumerate(roster):
+            crew_ids.append(str(crew_member.get("id") or crew_member.get("employee_id")))
+            hourly_rates.append(float(crew_member.get("hourly_rate") or 0))
+            redeye_rates.append(pay_rules.redeye_premium(crew_member.get("role")))
+
+            for flight in as_flight_records(flights):
+                departure = flight.actual_departure or flight.scheduled_departure
+                arrival = flight.actual_arrival or flight.scheduled_arrival
+                columns["crew_index"].append(index)
+                columns["departure_epoch"].append(_epoch_seconds(departure))
+                columns["arrival_epoch"].append(_epoch_seconds(arrival))
+                columns["block_centihours"].append(flight.block_centihours)
+                columns["flight_day"].append(_epoch_day(flight.flight_date))
+                columns["is_redeye"].append(flight.is_redeye)
+                columns["is_international"].append(flight.is_international)
+                columns["is_deadhead"].append(flight.is_deadhead)
+                columns["has_overnight"].append(bool(flight.overnight_location))
+                columns["per_diem_rate"].append(
+                    _layover_rate(flight.overnight_location, flight.is_international, rates)
+                )
+                columns["duty_report_epoch"].append(
+                    _epoch_seconds(flight.duty_report_time)
+                )
+                columns["duty_end_epoch"].append(_epoch_seconds(flight.duty_end_time))
+
+        return cls(crew_ids, hourly_rates, redeye_rates, **columns)
+
+    def __len__(self) -> int:
+        return int(self.crew_index.size)
+
+    @property
+    def n_crew(self) -> int:
+        """Number of crew members in the batch."""
+        return len(self.crew_ids)
+
+    def subset(self, crew_indices: Sequence[int]) -> "RosterBatch":
+        """
+        Slice out a subset of crew members (e.g. one shard).
+
+        Args:
+            crew_indices: Ascending crew indices to keep
+
+        Returns:
+            New RosterBatch with crew indices renumbered from 0
+        """
+        crew_indices = np.asarray(crew_indices, dtype=np.int64)
+        remap = np.full(self.n_crew, -1, dtype=np.int64)
+        remap[crew_indices] = np.arange(crew_indices.size)
+        new_index = remap[self.crew_index]
+        keep = new_index >= 0
+
+        return RosterBatch(
+            [self.crew_ids[i] for i in crew_indices],
+            self.hourly_rates[crew_indices],
+            self.redeye_rates[crew_indices],
+            new_index[keep],
+            *(getattr(self, name)[keep] for name in self.__slots__[4:]),
+        )
+
+    def crew_sum(self, values: np.ndarray) -> np.ndarray:
+        """Grouped sum of a per-leg column by crew member."""
+        return np.bincount(self.crew_index, weights=values, minlength=self.n_crew)
+
+    def credit_centihours(self) -> np.ndarray:
+        """Credit time per leg: MAX(block time, 1.0 hour minimum)."""
+        return np.maximum(self.block_centihours, MIN_CREDIT_CENTIHOURS)
+
+    def redeye_mask(self) -> np.ndarray:
+        """Legs flagged red-eye or departing between 2200 and 0559."""
+        hour = (self.departure_epoch % _SECONDS_PER_DAY) // 3600
+        by_time = (hour >= pay_rules.REDEYE_START_HOUR) | (
+            hour < pay_rules.REDEYE_END_HOUR
+        )
+        return self.is_redeye | (by_time & (self.departure_epoch != 0))
+
+    def holiday_mask(self, holidays: Iterable[str] = pay_rules.HOLIDAYS_2025) -> np.ndarray:
+        """Legs flown on a designated holiday."""
+        holiday_days = np.array(
+            [_epoch_day(date.fromisoformat(h)) for h in holidays], dtype=np.int32
+        )
+        return np.isin(self.flight_day, holiday_days)
+
+    def flight_totals(self) -> Dict[str, np.ndarray]:
+        """
+        Per-crew flight time totals.
+
+        Returns:
+            Arrays indexed by crew: total_flights, total_actual_hours,
+            total_credit_hours, hourly_rate, total_flight_pay
+        """
+        credit = self.crew_sum(self.credit_centihours())
+        return {
+            "total_flights": np.bincount(self.crew_index, minlength=self.n_crew),
+            "total_actual_hours": self.crew_sum(self.block_centihours) / HOURS_SCALE,
+            "total_credit_hours": credit / HOURS_SCALE,
+            "hourly_rate": self.hourly_rates,
+            "total_flight_pay": np.rint(credit * self.hourly_rates) / 100,
+        }
+
+    def premium_totals(
+        self, holidays: Iterable[str] = pay_rules.HOLIDAYS_2025
+    ) -> Dict[str, np.ndarray]:
+        """
+        Per-crew premium pay totals.
+
+        Returns:
+            Arrays indexed by crew matching the Premium Pay agent totals
+        """
+        rate_cents = self.hourly_rates[self.crew_index]  # cents per centihour
+        credit = self.credit_centihours()
+
+        holiday = np.where(
+            self.holiday_mask(holidays),
+            credit * rate_cents * (pay_rules.HOLIDAY_MULTIPLIER - 1.0),
+            0.0,
+        )
+        redeye = np.where(
+            self.redeye_mask(), self.redeye_rates[self.crew_index] * 100, 0.0
+        )
+        international = np.where(
+            self.is_international,
+            credit * rate_cents * pay_rules.INTERNATIONAL_PREMIUM_RATE,
+            0.0,
+        )
+        deadhead = np.where(
+            self.is_deadhead,
+            self.block_centihours * rate_cents * pay_rules.DEADHEAD_RATE,
+            0.0,
+        )
+
+        totals = {
+            "total_holiday_pay": np.rint(self.crew_sum(holiday)) / 100,
+            "total_redeye_premium": np.rint(self.crew_sum(redeye)) / 100,
+            "total_international_premium": np.rint(self.crew_sum(international)) / 100,
+            "total_training_pay": np.zeros(self.n_crew),
+            "total_deadhead_pay": np.rint(self.crew_sum(deadhead)) / 100,
+            "total_cancellation_pay": np.zeros(self.n_crew),
+            "total_overtime_pay": np.zeros(self.n_crew),
+        }
+        totals["total_premium_pay"] = np.round(sum(totals.values()), 2)
+        return totals
+
+    def per_diem_totals(self) -> Dict[str, np.ndarray]:
+        """
+        Per-crew per diem totals.
+
+        A layover runs from a leg's arrival to the same crew member's next
+        departure; the first and last calendar day are prorated to 75%.
+
+        Returns:
+            Arrays indexed by crew matching the Per Diem agent totals
+        """
+        next_departure = np.roll(self.departure_epoch, -1)
+        same_crew = self.crew_index == np.roll(self.crew_index, -1)
+        if same_crew.size:
+            same_crew[-1] = False
+
+        layover = self.has_overnight
+        end = np.where(same_crew, next_departure, self.arrival_epoch)
+        days = (end // _SECONDS_PER_DAY - self.arrival_epoch // _SECONDS_PER_DAY) + 1
+        days = np.where(layover, np.maximum(days, 1), 0)
+        paid_days = np.where(
+            days >= 2,
+            days - 2 * (1 - pay_rules.PER_DIEM_PRORATION),
+            days * pay_rules.PER_DIEM_PRORATION,
+        )
+        amount_cents = np.rint(paid_days * self.per_diem_rate * 100)
+
+        gross = self.crew_sum(amount_cents) / 100
+        return {
+            "total_layovers": np.bincount(
+                self.crew_index, weights=layover, minlength=self.n_crew
+            ).astype(np.int64),
+            "total_days": self.crew_sum(days.astype(np.float64)),
+            "total_gross_per_diem": gross,
+            "total_meal_deductions": np.zeros(self.n_crew),
+            "total_net_per_diem": gross,
+        }
+
+    def duty_checks(self) -> Dict[str, np.ndarray]:
+        """
+        Per-crew Part 117 checks on the duty report/release columns.
+
+        Duty periods are legs sharing a crew member and report time. Each
+        period's FDP is compared with Table B, rest between consecutive
+        periods with the 10-hour minimum, and rolling FDP/flight time sums
+        with the cumulative limits.
+
+        Returns:
+            Arrays indexed by crew: duty_periods, fdp_exceedances, short_rests,
+            peak hours per cumulative limit, and compliant
+        """
+        has_duty = (self.duty_report_epoch != 0) & (self.duty_end_epoch != 0)
+        crew = self.crew_index[has_duty].astype(np.int64)
+        report = self.duty_report_epoch[has_duty]
+        end = self.duty_end_epoch[has_duty]
+        block = self.block_centihours[has_duty]
+
+        key = (crew << 40) + report
+        order = np.argsort(key, kind="stable")
+        key, crew, report, end, block = (
+            key[order], crew[order], report[order], end[order], block[order]
+        )
+
+        results: Dict[str, np.ndarray] = {}
+        if not key.size:
+            results["duty_periods"] = np.zeros(self.n_crew, dtype=np.int64)
+            results["fdp_exceedances"] = np.zeros(self.n_crew, dtype=np.int64)
+            results["short_rests"] = np.zeros(self.n_crew, dtype=np.int64)
+            for name in CUMULATIVE_LIMITS:
+                results[name] = np.zeros(self.n_crew)
+            results["compliant"] = np.ones(self.n_crew, dtype=bool)
+            return results
+
+        starts = np.flatnonzero(np.r_[True, np.diff(key) != 0])
+        period_key = key[starts]
+        period_crew = crew[starts]
+        period_report = report[starts]
+        period_end = np.maximum.reduceat(end, starts)
+        segments = np.diff(np.r_[starts, key.size])
+        fdp_hours = (period_end - period_report) / 3600
+        flight_hours = np.add.reduceat(block, starts) / HOURS_SCALE
+
+        hour = (period_report % _SECONDS_PER_DAY) // 3600
+        limit = _FDP_GRID[hour, np.minimum(segments, 7) - 1]
+        exceeded = fdp_hours > limit
+
+        same_crew = period_crew[1:] == period_crew[:-1]
+        rest_hours = (period_report[1:] - period_end[:-1]) / 3600
+        short_rest = same_crew & (rest_hours < MIN_REST_HOURS)
+
+        compliant = np.ones(self.n_crew, dtype=bool)
+        results["duty_periods"] = np.bincount(period_crew, minlength=self.n_crew)
+        results["fdp_exceedances"] = np.bincount(
+            period_crew, weights=exceeded, minlength=self.n_crew
+        ).astype(np.int64)
+        results["short_rests"] = np.bincount(
+            period_crew[1:], weights=short_rest, minlength=self.n_crew
+        ).astype(np.int64)
+
+        for name, (window_days, hours_limit) in CUMULATIVE_LIMITS.items():
+            values = fdp_hours if name.startswith("fdp") else flight_hours
+            running = np.r_[0.0, np.cumsum(values)]
+            first = np.searchsorted(
+                period_key, period_key - window_days * _SECONDS_PER_DAY, side="right"
+            )
+            rolling = running[1:] - running[first]
+            peak = np.zeros(self.n_crew)
+            np.maximum.at(peak, period_crew, rolling)
+            results[name] = np.round(peak, 2)
+            compliant &= peak <= hours_limit
+
+        results["compliant"] = (
+            compliant
+            & (results["fdp_exceedances"] == 0)
+            & (results["short_rests"] == 0)
+        )
+        return results
+
+
+def _layover_rate(
+    airport_code: Optional[str], is_international: bool, rates: Dict[str, Any]
+) -> float:
+    """Daily per diem rate for a layover airport."""
+    if not airport_code:
+        return 0.0
+    rate_info = rates.get(airport_code)
+    if rate_info:
+        return float(rate_info.get("rate", 0))
+    if is_international:
+        return pay_rules.DEFAULT_INTERNATIONAL_PER_DIEM
+    return pay_rules.DEFAULT_DOMESTIC_PER_DIEM
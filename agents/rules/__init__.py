@@ -0,0 +1,17 @@
+"""Deterministic rule engines used alongside the Claude-backed agents."""
+
+from .faa_limits import (
+    MIN_CREDIT_PER_SEGMENT,
+    MIN_REST_HOURS,
+    CUMULATIVE_LIMITS,
+    max_fdp_hours,
+)
+from .compliance_checks import run_compliance_checks
+
+__all__ = [
+    "MIN_CREDIT_PER_SEGMENT",
+    "MIN_REST_HOURS",
+    "CUMULATIVE_LIMITS",
+    "max_fdp_hours",
+    "run_compliance_checks",
+]
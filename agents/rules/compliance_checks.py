@@ -0,0 +1,698 @@
+"""
+Deterministic Compliance Checks
+
+Re-derives and cross-checks the totals produced by the other agents so the
+Compliance Validator only needs Claude for genuine exceptions.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Sequence
+
+from ..flight_record import HOURS_SCALE, FlightRecord, as_flight_records
+from .faa_limits import (
+    MIN_REST_HOURS,
+    CUMULATIVE_LIMITS,
+    max_fdp_hours,
+)
+
+# Tolerances for comparing agent totals against re-derived values
+HOURS_TOLERANCE = 0.05
+AMOUNT_TOLERANCE = 1.00
+
+# Premium totals that make up total_premium_pay
+PREMIUM_COMPONENT_TOTALS = (
+    "total_holiday_pay",
+    "total_redeye_premium",
+    "total_international_premium",
+    "total_training_pay",
+    "total_deadhead_pay",
+    "total_cancellation_pay",
+    "total_overtime_pay",
+)
+
+
+def run_compliance_checks(
+    crew_member: Dict[str, Any],
+    flight_assignments: Sequence[Any],
+    flight_time_data: Optional[Dict[str, Any]],
+    duty_time_data: Optional[Dict[str, Any]],
+    per_diem_data: Optional[Dict[str, Any]],
+    premium_pay_data: Optional[Dict[str, Any]],
+    guarantee_data: Optional[Dict[str, Any]],
+    per_diem_rates: Optional[Dict[str, Any]] = None,
+    pay_period_start: Optional[str] = None,
+    pay_period_end: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run every deterministic compliance check for one crew member.
+
+    Args:
+        crew_member: Crew member profile
+        flight_assignments: Flight dictionaries or pre-parsed FlightRecords
+        flight_time_data: Flight time results
+        duty_time_data: Duty time results
+        per_diem_data: Per diem results
+        premium_pay_data: Premium pay results
+        guarantee_data: Guarantee results
+        per_diem_rates: Rate table keyed by airport code (optional; without
+            it only rate effective dates are checked)
+        pay_period_start: Start date (YYYY-MM-DD, optional)
+        pay_period_end: End date (YYYY-MM-DD, optional)
+
+    Returns:
+        Dictionary with validation_results, violations, warnings,
+        pay_accuracy_check and anomalies (one line per non-passing check)
+    """
+    flights = as_flight_records(flight_assignments or [])
+    upstream = {
+        "flight_time_data": flight_time_data,
+        "duty_time_data": duty_time_data,
+        "per_diem_data": per_diem_data,
+        "premium_pay_data": premium_pay_data,
+        "guarantee_data": guarantee_data,
+    }
+
+    pay_results = _check_flight_pay(crew_member, flights, flight_time_data or {})
+    guarantee_results = _check_guarantee(
+        crew_member, flight_time_data or {}, guarantee_data or {}
+    )
+    duplicate_results = _check_duplicate_legs(flights)
+    per_diem_results = _check_per_diem(
+        flights,
+        per_diem_data or {},
+        per_diem_rates or {},
+        pay_period_start,
+        pay_period_end,
+    )
+    premium_results = _check_premium_totals(premium_pay_data or {})
+    duty_results = _check_duty_limits(flights, duty_time_data or {})
+
+    validation_results = (
+        _check_upstream_data(upstream)
+        + pay_results
+        + guarantee_results
+        + duplicate_results
+        + per_diem_results
+        + premium_results
+        + duty_results
+    )
+
+    violations = [
+        {
+            "type": result["category"],
+            "regulation": result["regulation_reference"],
+            "description": result["details"],
+            "severity": "violation",
+            "recommended_action": f"Review: {result['check']}",
+            "requires_human_review": True,
+        }
+        for result in validation_results
+        if result["status"] == "fail" and result["category"] in ("FAA", "Contract")
+    ]
+    warnings = [
+        {
+            "description": result["details"],
+            "category": result["category"],
+            "recommendation": f"Verify: {result['check']}",
+        }
+        for result in validation_results
+        if result["status"] == "warning"
+    ]
+    anomalies = [
+        f"[{result['status'].upper()}] {result['check']}: {result['details']}"
+        for result in validation_results
+        if result["status"] != "pass"
+    ]
+
+    return {
+        "validation_results": validation_results,
+        "violations": violations,
+        "warnings": warnings,
+        "pay_accuracy_check": {
+            "all_rates_correct": _all_pass(pay_results + guarantee_results),
+            "all_premiums_applied": _all_pass(premium_results),
+            "no_duplicates": _all_pass(duplicate_results),
+            "totals_accurate": _all_pass(
+                pay_results + guarantee_results + per_diem_results + premium_results
+            ),
+            "discrepancies": [
+                result["details"]
+                for result in pay_results
+                + guarantee_results
+                + duplicate_results
+                + per_diem_results
+                + premium_results
+                if result["status"] != "pass"
+            ],
+        },
+        "anomalies": anomalies,
+    }
+
+
+def _result(
+    category: str,
+    check: str,
+    status: str,
+    details: str,
+    regulation_reference: str = "",
+    severity: str = "info",
+) -> Dict[str, Any]:
+    """Build one entry in the validation_results format."""
+    return {
+        "category": category,
+        "check": check,
+        "status": status,
+        "details": details,
+        "regulation_reference": regulation_reference,
+        "severity": severity,
+    }
+
+
+def _all_pass(results: List[Dict[str, Any]]) -> bool:
+    """Return True when every result passed."""
+    return all(result["status"] == "pass" for result in results)
+
+
+def _hours_between(start: datetime, end: datetime) -> float:
+    """Return the duration between two datetimes in hours."""
+    return (end - start).total_seconds() / 3600
+
+
+def _check_upstream_data(upstream: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flag agents whose output is missing (failed upstream nodes)."""
+    missing = [name for name, data in upstream.items() if data is None]
+    if missing:
+        return [
+            _result(
+                "Calculation",
+                "All agent outputs present",
+                "fail",
+                f"Missing agent output: {', '.join(missing)}",
+                severity="high",
+            )
+        ]
+    return [
+        _result("Calculation", "All agent outputs present", "pass", "All present")
+    ]
+
+
+def _check_flight_pay(
+    crew_member: Dict[str, Any],
+    flights: Sequence[FlightRecord],
+    flight_time_data: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Re-derive credit hours and flight pay and compare with the agent."""
+    if not flight_time_data:
+        return []
+
+    totals = flight_time_data.get("totals", {})
+    hourly_rate = float(crew_member.get("hourly_rate") or 0)
+    expected_credit = sum(f.credit_centihours for f in flights) / HOURS_SCALE
+    reported_credit = float(totals.get("total_credit_hours") or 0)
+    reported_pay = float(totals.get("total_flight_pay") or 0)
+    expected_pay = round(reported_credit * hourly_rate, 2)
+    hours_tolerance = max(HOURS_TOLERANCE, 0.01 * len(flights))
+
+    results = []
+
+    if int(totals.get("total_flights") or 0) == len(flights):
+        results.append(
+            _result("Calculation", "Flight count", "pass", f"{len(flights)} flights")
+        )
+    else:
+        results.append(
+            _result(
+                "Calculation",
+                "Flight count",
+                "fail",
+                f"Agent counted {totals.get('total_flights')} flights, "
+                f"assignments contain {len(flights)}",
+                severity="high",
+            )
+        )
+
+    if abs(reported_credit - expected_credit) <= hours_tolerance:
+        results.append(
+            _result(
+                "Calculation",
+                "Credit hours",
+                "pass",
+                f"{reported_credit:.2f} credit hours",
+                "Contract: 1.0 hour minimum credit per segment",
+            )
+        )
+    else:
+        results.append(
+            _result(
+                "Calculation",
+                "Credit hours",
+                "fail",
+                f"Agent reported {reported_credit:.2f} credit hours, "
+                f"re-derived {expected_credit:.2f}",
+                "Contract: 1.0 hour minimum credit per segment",
+                "high",
+            )
+        )
+
+    if abs(reported_pay - expected_pay) <= AMOUNT_TOLERANCE:
+        results.append(
+            _result(
+                "Calculation",
+                "Flight pay = credit hours × hourly rate",
+                "pass",
+                f"${reported_pay:,.2f}",
+            )
+        )
+    else:
+        results.append(
+            _result(
+                "Calculation",
+                "Flight pay = credit hours × hourly rate",
+                "fail",
+                f"Agent reported ${reported_pay:,.2f}, expected ${expected_pay:,.2f}",
+                severity="high",
+            )
+        )
+
+    reported_rate = totals.get("hourly_rate")
+    if reported_rate is not None and abs(float(reported_rate) - hourly_rate) > 0.005:
+        results.append(
+            _result(
+                "Contract",
+                "Hourly rate matches crew profile",
+                "fail",
+                f"Agent used ${float(reported_rate):.2f}/hr, "
+                f"profile rate is ${hourly_rate:.2f}/hr",
+                "Contract: hourly rate schedule",
+                "high",
+            )
+        )
+    else:
+        results.append(
+            _result(
+                "Contract",
+                "Hourly rate matches crew profile",
+                "pass",
+                f"${hourly_rate:.2f}/hr",
+            )
+        )
+
+    return results
+
+
+def _check_guarantee(
+    crew_member: Dict[str, Any],
+    flight_time_data: Dict[str, Any],
+    guarantee_data: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Verify paid hours = MAX(actual credit, guarantee) and base pay."""
+    if not guarantee_data:
+        return []
+
+    calculation = guarantee_data.get("calculation", {})
+    hourly_rate = float(crew_member.get("hourly_rate") or 0)
+    actual_hours = float(
+        flight_time_data.get("totals", {}).get("total_credit_hours") or 0
+    )
+    guarantee_hours = float(
+        calculation.get("guarantee_hours")
+        or guarantee_data.get("guarantee_applied", {}).get("hours")
+        or crew_member.get("monthly_guarantee")
+        or 0
+    )
+    expected_paid = max(actual_hours, guarantee_hours)
+    reported_paid = float(
+        guarantee_data.get("paid_hours") or calculation.get("paid_hours") or 0
+    )
+    reported_base_pay = float(calculation.get("base_pay") or 0)
+    expected_base_pay = round(reported_paid * hourly_rate, 2)
+
+    results = []
+
+    if abs(reported_paid - expected_paid) <= HOURS_TOLERANCE:
+        results.append(
+            _result(
+                "Contract",
+                "Minimum guarantee applied",
+                "pass",
+                f"Paid {reported_paid:.2f} hours "
+                f"(actual {actual_hours:.2f}, guarantee {guarantee_hours:.2f})",
+                "Contract: monthly minimum guarantee",
+            )
+        )
+    else:
+        results.append(
+            _result(
+                "Contract",
+                "Minimum guarantee applied",
+                "fail",
+                f"Paid {reported_paid:.2f} hours, expected MAX({actual_hours:.2f}, "
+                f"{guarantee_hours:.2f}) = {expected_paid:.2f}",
+                "Contract: monthly minimum guarantee",
+                "high",
+            )
+        )
+
+    if abs(reported_base_pay - expected_base_pay) <= AMOUNT_TOLERANCE:
+        results.append(
+            _result(
+                "Calculation",
+                "Guarantee base pay = paid hours × hourly rate",
+                "pass",
+                f"${reported_base_pay:,.2f}",
+            )
+        )
+    else:
+        results.append(
+            _result(
+                "Calculation",
+                "Guarantee base pay = paid hours × hourly rate",
+                "fail",
+                f"Agent reported ${reported_base_pay:,.2f}, "
+                f"expected ${expected_base_pay:,.2f}",
+                severity="high",
+            )
+        )
+
+    triggered = guarantee_data.get("guarantee_triggered")
+    if triggered is not None and bool(triggered) != (guarantee_hours > actual_hours):
+        results.append(
+            _result(
+                "Contract",
+                "Guarantee trigger flag",
+                "warning",
+                f"guarantee_triggered={triggered} but actual {actual_hours:.2f} "
+                f"vs guarantee {guarantee_hours:.2f}",
+                severity="medium",
+            )
+        )
+
+    return results
+
+
+def _check_duplicate_legs(flights: Sequence[FlightRecord]) -> List[Dict[str, Any]]:
+    """Ensure no leg is paid twice."""
+    seen = set()
+    duplicates = []
+    for flight in flights:
+        key = flight.key
+        if key in seen:
+            duplicates.append(f"{key[0]} on {key[1]}")
+        seen.add(key)
+
+    if duplicates:
+        return [
+            _result(
+                "Calculation",
+                "No duplicate legs",
+                "fail",
+                f"Duplicate legs: {', '.join(duplicates)}",
+                severity="high",
+            )
+        ]
+    return [_result("Calculation", "No duplicate legs", "pass", "No duplicates")]
+
+
+def _check_per_diem(
+    flights: Sequence[FlightRecord],
+    per_diem_data: Dict[str, Any],
+    per_diem_rates: Dict[str, Any],
+    pay_period_start: Optional[str],
+    pay_period_end: Optional[str],
+) -> List[Dict[str, Any]]:
+    """Check per diem totals add up and, given a rate table, the rates used are current."""
+    if not per_diem_data:
+        return []
+
+    totals = per_diem_data.get("totals", {})
+    layovers = per_diem_data.get("layovers", [])
+    results = []
+
+    expected_layovers = sum(1 for f in flights if f.overnight_location)
+    if int(totals.get("total_layovers") or 0) != expected_layovers:
+        results.append(
+            _result(
+                "Calculation",
+                "Layover count",
+                "fail",
+                f"Agent counted {totals.get('total_layovers')} layovers, "
+                f"assignments contain {expected_layovers}",
+                severity="medium",
+            )
+        )
+
+    net = float(totals.get("total_net_per_diem") or 0)
+    gross = float(totals.get("total_gross_per_diem") or net)
+    deductions = float(totals.get("total_meal_deductions") or 0)
+    layover_sum = sum(float(layover.get("layover_total") or 0) for layover in layovers)
+    if abs(gross - deductions - net) > AMOUNT_TOLERANCE or (
+        layovers and abs(layover_sum - net) > AMOUNT_TOLERANCE
+    ):
+        results.append(
+            _result(
+                "Calculation",
+                "Per diem totals",
+                "fail",
+                f"Net ${net:,.2f} does not reconcile with gross ${gross:,.2f}, "
+                f"deductions ${deductions:,.2f} and layover sum ${layover_sum:,.2f}",
+                severity="medium",
+            )
+        )
+    else:
+        results.append(
+            _result("Calculation", "Per diem totals", "pass", f"${net:,.2f}")
+        )
+
+    stale = []
+    for layover in layovers:
+        rate_info = per_diem_rates.get(layover.get("airport_code"))
+        if not rate_info or layover.get("daily_rate") is None:
+            continue
+        if abs(float(layover["daily_rate"]) - float(rate_info.get("rate", 0))) > 0.005:
+            stale.append(
+                f"{layover.get('airport_code')} used ${float(layover['daily_rate']):.2f}, "
+                f"current rate ${float(rate_info.get('rate', 0)):.2f}"
+            )
+    for source in per_diem_data.get("rate_sources", []):
+        effective_date = str(source.get("effective_date") or "")
+        if pay_period_end and effective_date and effective_date > str(pay_period_end):
+            stale.append(
+                f"{source.get('location')} rate effective {effective_date} "
+                f"is after the pay period"
+            )
+    for airport_code, rate_info in per_diem_rates.items():
+        expiration_date = str(rate_info.get("expiration_date") or "")
+        if pay_period_start and expiration_date and expiration_date < str(
+            pay_period_start
+        ):
+            stale.append(f"{airport_code} rate expired {expiration_date}")
+
+    if not stale and not per_diem_rates:
+        # No rate table to compare against: the check did not run
+        return results
+    if stale:
+        results.append(
+            _result(
+                "Contract",
+                "Per diem rates are current",
+                "fail",
+                "; ".join(stale),
+                "GSA / State Department per diem tables",
+                "medium",
+            )
+        )
+    else:
+        results.append(
+            _result(
+                "Contract",
+                "Per diem rates are current",
+                "pass",
+                "Rates match current table",
+                "GSA / State Department per diem tables",
+            )
+        )
+
+    return results
+
+
+def _check_premium_totals(premium_pay_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Check the premium components add up to the reported total."""
+    if not premium_pay_data:
+        return []
+
+    totals = premium_pay_data.get("totals", {})
+    reported = float(totals.get("total_premium_pay") or 0)
+    component_sum = sum(float(totals.get(key) or 0) for key in PREMIUM_COMPONENT_TOTALS)
+
+    if abs(reported - component_sum) <= AMOUNT_TOLERANCE:
+        return [
+            _result("Calculation", "Premium pay totals", "pass", f"${reported:,.2f}")
+        ]
+    return [
+        _result(
+            "Calculation",
+            "Premium pay totals",
+            "fail",
+            f"Total ${reported:,.2f} does not equal sum of components "
+            f"${component_sum:,.2f}",
+            severity="medium",
+        )
+    ]
+
+
+def _duty_periods(flights: Sequence[FlightRecord]) -> List[Dict[str, Any]]:
+    """Group flights into duty periods keyed by duty report time."""
+    periods: Dict[datetime, Dict[str, Any]] = {}
+    for flight in flights:
+        report = flight.duty_report_time
+        end = flight.duty_end_time
+        if not report or not end:
+            continue
+        period = periods.setdefault(
+            report, {"report": report, "end": end, "segments": 0, "flight_hours": 0.0}
+        )
+        period["end"] = max(period["end"], end)
+        period["segments"] += 1
+        period["flight_hours"] += flight.block_hours
+
+    ordered = sorted(periods.values(), key=lambda p: p["report"])
+    for period in ordered:
+        period["fdp_hours"] = _hours_between(period["report"], period["end"])
+    return ordered
+
+
+def _check_duty_limits(
+    flights: Sequence[FlightRecord], duty_time_data: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Check FDP, rest and cumulative limits from the raw duty times."""
+    results = []
+    periods = _duty_periods(flights)
+
+    missing = sum(1 for f in flights if not f.duty_report_time or not f.duty_end_time)
+    if missing:
+        results.append(
+            _result(
+                "FAA",
+                "Duty times present",
+                "warning",
+                f"{missing} flights missing duty report/end times",
+                "14 CFR 117.13",
+                "medium",
+            )
+        )
+
+    fdp_exceeded = []
+    for period in periods:
+        limit = max_fdp_hours(period["report"], period["segments"])
+        if period["fdp_hours"] > limit:
+            fdp_exceeded.append(
+                f"{period['report']:%Y-%m-%d %H:%M} FDP {period['fdp_hours']:.2f}h "
+                f"exceeds {limit:.2f}h ({period['segments']} segments)"
+            )
+    if fdp_exceeded:
+        results.append(
+            _result(
+                "FAA",
+                "FDP limits (Table B)",
+                "fail",
+                "; ".join(fdp_exceeded),
+                "14 CFR 117.13",
+                "critical",
+            )
+        )
+    else:
+        results.append(
+            _result(
+                "FAA",
+                "FDP limits (Table B)",
+                "pass",
+                f"{len(periods)} duty periods within limits",
+                "14 CFR 117.13",
+            )
+        )
+
+    short_rest = []
+    for previous, current in zip(periods, periods[1:]):
+        rest = _hours_between(previous["end"], current["report"])
+        if rest < MIN_REST_HOURS:
+            short_rest.append(
+                f"{rest:.2f}h rest before {current['report']:%Y-%m-%d %H:%M}"
+            )
+    if short_rest:
+        results.append(
+            _result(
+                "FAA",
+                "Minimum rest between duty periods",
+                "fail",
+                "; ".join(short_rest),
+                "14 CFR 117.25",
+                "critical",
+            )
+        )
+    else:
+        results.append(
+            _result(
+                "FAA",
+                "Minimum rest between duty periods",
+                "pass",
+                f"All rest periods >= {MIN_REST_HOURS:.0f} hours",
+                "14 CFR 117.25",
+            )
+        )
+
+    exceeded = []
+    reported_limits = duty_time_data.get("cumulative_limits", {})
+    for name, (window_days, limit) in CUMULATIVE_LIMITS.items():
+        field = "fdp_hours" if name.startswith("fdp") else "flight_hours"
+        window = timedelta(days=window_days)
+        peak = 0.0
+        for period in periods:
+            peak = max(
+                peak,
+                sum(
+                    p[field]
+                    for p in periods
+                    if period["end"] - window < p["report"] <= period["report"]
+                ),
+            )
+        reported = reported_limits.get(name, {})
+        reported_actual = float(reported.get("actual") or 0)
+        if peak > limit or reported_actual > limit or reported.get("compliant") is False:
+            exceeded.append(
+                f"{name}: {max(peak, reported_actual):.2f}h exceeds {limit:.0f}h"
+            )
+    if exceeded:
+        results.append(
+            _result(
+                "FAA",
+                "Cumulative limits",
+                "fail",
+                "; ".join(exceeded),
+                "14 CFR 117.23",
+                "critical",
+            )
+        )
+    else:
+        results.append(
+            _result(
+                "FAA",
+                "Cumulative limits",
+                "pass",
+                "All cumulative limits respected",
+                "14 CFR 117.23",
+            )
+        )
+
+    if duty_time_data.get("violations"):
+        results.append(
+            _result(
+                "FAA",
+                "Duty Time Monitor violations",
+                "fail",
+                f"{len(duty_time_data['violations'])} violations reported",
+                "14 CFR Part 117",
+                "high",
+            )
+        )
+
+    return results
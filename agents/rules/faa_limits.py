@@ -0,0 +1,55 @@
+"""
+FAA Part 117 limits and contract constants.
+
+Python mirror of database/faa_tables.sql so the deterministic checks can run
+without a database round trip.
+"""
+
+from datetime import datetime
+from typing import Dict, Tuple
+
+# Contract: minimum credit per flight segment (hours)
+MIN_CREDIT_PER_SEGMENT = 1.0
+
+# Part 117.25: minimum rest between duty periods (hours)
+MIN_REST_HOURS = 10.0
+
+# Part 117.23: cumulative limits as (window in days, limit in hours)
+CUMULATIVE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "fdp_7_days": (7, 60.0),
+    "fdp_28_days": (28, 190.0),
+    "flight_time_28_days": (28, 100.0),
+    "flight_time_365_days": (365, 1000.0),
+}
+
+# Part 117 Table B: (start hour begin, start hour end) -> max FDP by segments 1..7+
+FDP_TABLE_B: Tuple[Tuple[int, int, Tuple[float, ...]], ...] = (
+    (0, 3, (9.0, 9.0, 9.0, 9.0, 9.0, 9.0, 9.0)),
+    (4, 4, (10.0, 10.0, 10.0, 10.0, 9.0, 9.0, 9.0)),
+    (5, 5, (12.0, 12.0, 12.0, 12.0, 11.5, 11.0, 10.5)),
+    (6, 6, (13.0, 13.0, 12.0, 12.0, 11.5, 11.0, 10.5)),
+    (7, 12, (14.0, 14.0, 13.0, 13.0, 12.5, 12.0, 11.5)),
+    (13, 16, (13.0, 13.0, 12.0, 12.0, 11.5, 11.0, 10.5)),
+    (17, 21, (12.0, 12.0, 12.0, 12.0, 11.5, 11.0, 10.5)),
+    (22, 22, (11.0, 11.0, 11.0, 11.0, 10.0, 9.0, 9.0)),
+    (23, 23, (10.0, 10.0, 10.0, 10.0, 9.0, 9.0, 9.0)),
+)
+
+
+def max_fdp_hours(report_time: datetime, segments: int) -> float:
+    """
+    Look up the Table B FDP limit for a duty period.
+
+    Args:
+        report_time: Duty report time (acclimated local time)
+        segments: Number of flight segments in the duty period
+
+    Returns:
+        Maximum flight duty period in hours
+    """
+    column = min(max(segments, 1), 7) - 1
+    hour = report_time.hour
+    for begin, end, limits in FDP_TABLE_B:
+        if begin <= hour <= end:
+            return limits[column]
+    return FDP_TABLE_B[0][2][column]
@@ -0,0 +1,91 @@
+"""
+Contract pay rules shared by the agents and the local pay engines.
+
+Mirrors the premium_rules seed data in database/faa_tables.sql.
+"""
+
+from datetime import datetime
+from typing import Dict, Optional
+
+# US Federal Holidays for 2025
+HOLIDAYS_2025 = (
+    "2025-01-01",  # New Year's Day
+    "2025-01-20",  # MLK Day
+    "2025-02-17",  # Presidents Day
+    "2025-05-26",  # Memorial Day
+    "2025-06-19",  # Juneteenth
+    "2025-07-04",  # Independence Day
+    "2025-09-01",  # Labor Day
+    "2025-10-13",  # Columbus Day
+    "2025-11-11",  # Veterans Day
+    "2025-11-27",  # Thanksgiving
+    "2025-12-25",  # Christmas
+)
+
+# Holiday pay: 1.5x hourly rate (the 1.0x portion is already in flight pay)
+HOLIDAY_MULTIPLIER = 1.5
+
+# Red-eye: departure between 2200 and 0559, fixed amount per segment by role
+REDEYE_START_HOUR = 22
+REDEYE_END_HOUR = 6
+REDEYE_PREMIUM: Dict[str, float] = {"Captain": 100.0, "First Officer": 75.0}
+REDEYE_PREMIUM_DEFAULT = 50.0
+
+# International: percentage of base trip pay
+INTERNATIONAL_PREMIUM_RATE = 0.15
+
+# Deadhead: percentage of hourly rate per deadhead hour
+DEADHEAD_RATE = 0.5
+
+# Training: fixed amount per session by role
+TRAINING_PAY: Dict[str, float] = {"Captain": 125.0, "First Officer": 100.0}
+TRAINING_PAY_DEFAULT = 75.0
+
+# Per diem: first and last day of a layover are paid at 75%
+PER_DIEM_PRORATION = 0.75
+
+# Midpoints of the default ranges quoted to the Per Diem agent
+DEFAULT_DOMESTIC_PER_DIEM = 79.0
+DEFAULT_INTERNATIONAL_PER_DIEM = 117.5
+
+
+def redeye_premium(role: Optional[str]) -> float:
+    """Red-eye premium per segment for a role."""
+    return REDEYE_PREMIUM.get(role or "", REDEYE_PREMIUM_DEFAULT)
+
+
+def is_redeye_departure(departure: datetime) -> bool:
+    """Whether a departure time falls in the red-eye window."""
+    return departure.hour >= REDEYE_START_HOUR or departure.hour < REDEYE_END_HOUR
+
+
+def leg_premium(premium_type: str, basis: float, hourly_rate: float, role: Optional[str]) -> float:
+    """
+    Amount of a per-leg premium for one crew member.
+
+    Args:
+        premium_type: "holiday", "redeye", "international" or "deadhead"
+        basis: Credit hours (holiday, international), block hours (deadhead)
+            or segments (redeye)
+        hourly_rate: Crew member's hourly rate
+        role: Crew member's role
+
+    Returns:
+        Premium amount, rounded to cents
+    """
+    if premium_type == "holiday":
+        amount = basis * hourly_rate * (HOLIDAY_MULTIPLIER - 1.0)
+    elif premium_type == "redeye":
+        amount = basis * redeye_premium(role)
+    elif premium_type == "international":
+        amount = basis * hourly_rate * INTERNATIONAL_PREMIUM_RATE
+    elif premium_type == "deadhead":
+        amount = basis * hourly_rate * DEADHEAD_RATE
+    else:
+        raise ValueError(f"Unknown leg premium type: {premium_type}")
+    return round(amount, 2)
+
+
+def training_pay(role: Optional[str]) -> float:
+    """Training pay per session for a role."""
+    return TRAINING_PAY.get(role or "", TRAINING_PAY_DEFAULT)
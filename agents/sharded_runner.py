@@ -0,0 +1,229 @@
+"""
+Sharded fleet-wide pay runner.
+
+Partitions the crew roster across a process pool for the deterministic,
+CPU-bound calculations (block time, credit hours, premiums, per diem
+pairing, FDP/rest/rolling limits). Each worker receives one shard as a
+compact columnar RosterBatch and returns NumPy totals; the parent merges
+per-crew results and fleet totals.
+"""
+
+import logging
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .roster_batch import RosterBatch
+
+logger = logging.getLogger(__name__)
+
+SHARD_KEYS = ("crew_member_id", "base_airport")
+
+
+def assign_shards(
+    crew_members: Sequence[Dict[str, Any]],
+    num_shards: int,
+    shard_key: str = "crew_member_id",
+    leg_counts: Optional[Sequence[int]] = None,
+) -> np.ndarray:
+    """
+    Assign each crew member to a shard.
+
+    crew_member_id uses a stable CRC32 hash; base_airport keeps each base on
+    one shard and balances bases across shards by leg count.
+
+    Args:
+        crew_members: Crew member profiles in roster order
+        num_shards: Number of shards
+        shard_key: "crew_member_id" or "base_airport"
+        leg_counts: Legs per crew member, used to balance bases (optional)
+
+    Returns:
+        Shard number per crew member
+    """
+    if shard_key not in SHARD_KEYS:
+        raise ValueError(f"shard_key must be one of {SHARD_KEYS}")
+
+    if shard_key == "crew_member_id":
+        return np.array(
+            [
+                zlib.crc32(str(c.get("id") or c.get("employee_id")).encode())
+                % num_shards
+                for c in crew_members
+            ],
+            dtype=np.int64,
+        )
+
+    counts = leg_counts if leg_counts is not None else [1] * len(crew_members)
+    base_load: Dict[str, int] = {}
+    for crew_member, count in zip(crew_members, counts):
+        base = crew_member.get("base_airport") or ""
+        base_load[base] = base_load.get(base, 0) + count
+
+    shard_load = [0] * num_shards
+    base_shard: Dict[str, int] = {}
+    for base, load in sorted(base_load.items(), key=lambda item: -item[1]):
+        shard = shard_load.index(min(shard_load))
+        base_shard[base] = shard
+        shard_load[shard] += load
+
+    return np.array(
+        [base_shard[c.get("base_airport") or ""] for c in crew_members],
+        dtype=np.int64,
+    )
+
+
+def compute_shard(batch: RosterBatch) -> Dict[str, Any]:
+    """
+    Run every deterministic calculation for one shard (worker entry point).
+
+    Args:
+        batch: Columnar legs for the shard's crew members
+
+    Returns:
+        Dictionary with crew_ids and per-crew arrays for flight_time,
+        premium_pay, per_diem and duty_time
+    """
+    return {
+        "crew_ids": batch.crew_ids,
+        "flight_time": batch.flight_totals(),
+        "premium_pay": batch.premium_totals(),
+        "per_diem": batch.per_diem_totals(),
+        "duty_time": batch.duty_checks(),
+    }
+
+
+def merge_shard_results(shard_results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge worker outputs into per-crew results and fleet totals.
+
+    Args:
+        shard_results: Outputs of compute_shard
+
+    Returns:
+        Dictionary with "crew" (crew member ID -> section -> totals) and
+        "totals" (fleet-wide sums)
+    """
+    crew: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    fleet = {
+        "crew_members": 0,
+        "total_flights": 0,
+        "total_credit_hours": 0.0,
+        "total_flight_pay": 0.0,
+        "total_premium_pay": 0.0,
+        "total_net_per_diem": 0.0,
+        "non_compliant_crew_members": 0,
+    }
+
+    for result in shard_results:
+        sections = ("flight_time", "premium_pay", "per_diem", "duty_time")
+        for index, crew_id in enumerate(result["crew_ids"]):
+            crew[crew_id] = {
+                section: {
+                    name: values[index].item()
+                    for name, values in result[section].items()
+                }
+                for section in sections
+            }
+
+        flight = result["flight_time"]
+        fleet["crew_members"] += len(result["crew_ids"])
+        fleet["total_flights"] += int(flight["total_flights"].sum())
+        fleet["total_credit_hours"] += float(flight["total_credit_hours"].sum())
+        fleet["total_flight_pay"] += float(flight["total_flight_pay"].sum())
+        fleet["total_premium_pay"] += float(
+            result["premium_pay"]["total_premium_pay"].sum()
+        )
+        fleet["total_net_per_diem"] += float(
+            result["per_diem"]["total_net_per_diem"].sum()
+        )
+        fleet["non_compliant_crew_members"] += int(
+            (~result["duty_time"]["compliant"]).sum()
+        )
+
+    for name in (
+        "total_credit_hours",
+        "total_flight_pay",
+        "total_premium_pay",
+        "total_net_per_diem",
+    ):
+        fleet[name] = round(fleet[name], 2)
+
+    return {"crew": crew, "totals": fleet}
+
+
+class ShardedPayRunner:
+    """Fan deterministic fleet-wide calculations out across a process pool."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        shard_key: str = "crew_member_id",
+        per_diem_rates: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            max_workers: Worker processes (default: CPU count)
+            shard_key: "crew_member_id" (hash) or "base_airport"
+            per_diem_rates: Rate table keyed by airport code (optional)
+        """
+        if shard_key not in SHARD_KEYS:
+            raise ValueError(f"shard_key must be one of {SHARD_KEYS}")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.shard_key = shard_key
+        self.per_diem_rates = per_diem_rates or {}
+
+    def shard(
+        self, roster: Sequence[Tuple[Dict[str, Any], Sequence[Any]]]
+    ) -> List[RosterBatch]:
+        """
+        Split a roster into one compact RosterBatch per non-empty shard.
+
+        Args:
+            roster: (crew_member_data, flights) pairs
+
+        Returns:
+            List of shard batches
+        """
+        roster = list(roster)
+        batch = RosterBatch.from_roster(roster, self.per_diem_rates)
+        shard_of = assign_shards(
+            [crew_member for crew_member, _ in roster],
+            self.max_workers,
+            self.shard_key,
+            leg_counts=np.bincount(batch.crew_index, minlength=batch.n_crew),
+        )
+        return [
+            batch.subset(np.flatnonzero(shard_of == shard))
+            for shard in range(self.max_workers)
+            if np.any(shard_of == shard)
+        ]
+
+    def run(
+        self, roster: Sequence[Tuple[Dict[str, Any], Sequence[Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Compute deterministic pay totals for a whole roster.
+
+        Args:
+            roster: (crew_member_data, flights) pairs
+
+        Returns:
+            Merged per-crew results and fleet totals
+        """
+        batches = self.shard(roster)
+        logger.info(
+            f"Running {len(batches)} shards on {self.max_workers} workers "
+            f"(shard key: {self.shard_key})"
+        )
+
+        if self.max_workers == 1 or len(batches) <= 1:
+            return merge_shard_results(compute_shard(batch) for batch in batches)
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            return merge_shard_results(pool.map(compute_shard, batches))
@@ -4,10 +4,12 @@ State management for LangGraph orchestration.
 Defines the CrewPayState that flows through all agents.
 """
 
-from typing import TypedDict, Optional, List, Dict, Any
+from typing import TypedDict, Optional, List, Dict, Any, Tuple
 from decimal import Decimal
 from datetime import datetime
 
+from .flight_record import FlightRecord
+
 
 class CrewPayState(TypedDict):
     """State object passed between agents in the LangGraph workflow."""
@@ -24,6 +26,7 @@ class CrewPayState(TypedDict):
 
     # Flight data
     flight_assignments: List[Dict[str, Any]]
+    flight_records: Tuple[FlightRecord, ...]  # parsed once, shared read-only
 
     # Agent outputs
     flight_time_data: Optional[Dict[str, Any]]
@@ -45,6 +48,7 @@ class CrewPayState(TypedDict):
     warnings: List[str]
     requires_human_review: bool
     confidence_score: float
+    skipped_nodes: List[str]  # routed around; outputs determined by the input
 
     # Metadata
     processing_started_at: Optional[str]
@@ -0,0 +1,30 @@
+"""
+Database Session Management
+
+SQLAlchemy engine and session factory for the Crew Copilot database.
+"""
+
+from typing import Iterator
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from api.config import settings
+
+engine = create_engine(
+    settings.database_url,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_pre_ping=True,
+)
+
+SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+def get_db() -> Iterator[Session]:
+    """FastAPI dependency yielding a database session."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -1,19 +1,47 @@
 """
 Crew Copilot - FastAPI Main Application
 """
+import asyncio
+import logging
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import routers
-from api.v1 import calculations, crew
+from api.config import settings
+from api.v1 import calculations, crew, flights
+from api.services.bulk_calculations import warm_up_agents
+from api.services.health import health_monitor
+from api.services.recompute import recompute_queue
+
+logging.basicConfig(
+    level=settings.log_level,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await recompute_queue.start()
+    if settings.agent_warmup:
+        # Not awaited: the app is ready before the agent stack is loaded
+        app.state.agent_warmup = asyncio.get_running_loop().run_in_executor(
+            None, warm_up_agents
+        )
+        health_monitor.warmup = app.state.agent_warmup
+    yield
+    await recompute_queue.stop()
+
 
 app = FastAPI(
     title="Crew Copilot API",
     description="AI-powered crew pay intelligence platform for Avelo Airlines",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS
@@ -40,24 +68,37 @@ async def root():
         "endpoints": {
             "docs": "/docs",
             "health": "/health",
+            "liveness": "/health/live",
+            "readiness": "/health/ready",
             "crew": "/api/v1/crew",
             "calculations": "/api/v1/calculations/run"
         }
     }
 
+@app.get("/health/live")
+async def liveness():
+    """Liveness: the process is up and its event loop answers (no dependency checks)"""
+    return {"status": "alive", "version": "0.1.0"}
+
+@app.get("/health/ready")
+async def readiness():
+    """Readiness: database, Claude circuit, queue depth and saturation; 503 when not ready"""
+    report = await health_monitor.readiness()
+    return JSONResponse(
+        {**report, "version": "0.1.0"},
+        status_code=200 if report["status"] == "ready" else 503,
+    )
+
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint for Railway"""
-    return {
-        "status": "healthy",
-        "database": "connected",
-        "agents": "ready",
-        "version": "0.1.0"
-    }
+    """Health check endpoint for Railway (same checks as /health/ready)"""
+    return await readiness()
 
 # Include routers
 app.include_router(crew.router, prefix="/api/v1")
 app.include_router(calculations.router, prefix="/api/v1")
+app.include_router(flights.router, prefix="/api/v1")
 
 if __name__ == "__main__":
     import uvicorn
@@ -25,10 +25,17 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import and_, text
 import uuid
 
 Base = declarative_base()
 
+# Stands in for "no flight" in the pay_calculations line-item key so that
+# aggregate rows (guarantee, unmatched per diem) are unique per crew/period
+PAY_LINE_FLIGHT_KEY = text(
+    "COALESCE(flight_assignment_id, '00000000-0000-0000-0000-000000000000'::uuid)"
+)
+
 
 class CrewMember(Base):
     """Crew member profile."""
@@ -76,12 +83,14 @@ class FlightAssignment(Base):
 
     __tablename__ = "flight_assignments"
 
+    # Range-partitioned by month of flight_date, which is therefore part of
+    # the primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    flight_date = Column(Date, primary_key=True)
     crew_member_id = Column(
-        UUID(as_uuid=True), ForeignKey("crew_members.id", ondelete="CASCADE"), index=True
+        UUID(as_uuid=True), ForeignKey("crew_members.id", ondelete="CASCADE")
     )
     flight_number = Column(String(20), nullable=False, index=True)
-    flight_date = Column(Date, nullable=False, index=True)
     origin_airport = Column(String(3), nullable=False)
     destination_airport = Column(String(3), nullable=False)
     scheduled_departure = Column(DateTime, nullable=False)
@@ -106,7 +115,36 @@ class FlightAssignment(Base):
 
     # Relationships
     crew_member = relationship("CrewMember", back_populates="flight_assignments")
-    pay_calculations = relationship("PayCalculation", back_populates="flight_assignment")
+    pay_calculations = relationship(
+        "PayCalculation",
+        primaryjoin="FlightAssignment.id == foreign(PayCalculation.flight_assignment_id)",
+        back_populates="flight_assignment",
+        viewonly=True,
+    )
+
+    __table_args__ = (
+        Index("idx_flight_crew_date", "crew_member_id", "flight_date"),
+        Index(
+            "uq_flight_leg",
+            "crew_member_id",
+            "flight_date",
+            "flight_number",
+            "origin_airport",
+            "destination_airport",
+            unique=True,
+        ),
+        {"postgresql_partition_by": "RANGE (flight_date)"},
+    )
+
+    @classmethod
+    def in_period(cls, start, end):
+        """
+        Filter on the partition key so only the period's months are scanned.
+
+        Every flight_assignments query should include this (or another
+        flight_date bound); without it PostgreSQL scans all partitions.
+        """
+        return and_(cls.flight_date >= start, cls.flight_date <= end)
 
 
 class PayCalculation(Base):
@@ -120,10 +158,8 @@ class PayCalculation(Base):
     )
     pay_period_start = Column(Date, nullable=False, index=True)
     pay_period_end = Column(Date, nullable=False, index=True)
-    flight_assignment_id = Column(
-        UUID(as_uuid=True),
-        ForeignKey("flight_assignments.id", ondelete="SET NULL"),
-    )
+    # flight_assignments.id; no FK because that table is partitioned
+    flight_assignment_id = Column(UUID(as_uuid=True))
     calculation_type = Column(String(50), nullable=False, index=True)
     base_hours = Column(Numeric(10, 4))
     credit_hours = Column(Numeric(10, 4))
@@ -137,7 +173,12 @@ class PayCalculation(Base):
 
     # Relationships
     crew_member = relationship("CrewMember", back_populates="pay_calculations")
-    flight_assignment = relationship("FlightAssignment", back_populates="pay_calculations")
+    flight_assignment = relationship(
+        "FlightAssignment",
+        primaryjoin="foreign(PayCalculation.flight_assignment_id) == FlightAssignment.id",
+        back_populates="pay_calculations",
+        viewonly=True,
+    )
 
     __table_args__ = (
         CheckConstraint(
@@ -157,6 +198,49 @@ class PayCalculation(Base):
             ),
             name="valid_calculation_type",
         ),
+        Index(
+            "uq_pay_line_item",
+            crew_member_id,
+            pay_period_start,
+            pay_period_end,
+            calculation_type,
+            PAY_LINE_FLIGHT_KEY,
+            unique=True,
+        ),
+    )
+
+
+class CrewPaySummary(Base):
+    """Per-crew, per-pay-period totals maintained when results are persisted."""
+
+    __tablename__ = "crew_pay_summaries"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    crew_member_id = Column(
+        UUID(as_uuid=True), ForeignKey("crew_members.id", ondelete="CASCADE"), nullable=False
+    )
+    pay_period_start = Column(Date, nullable=False)
+    pay_period_end = Column(Date, nullable=False)
+    credit_hours = Column(Numeric(10, 4), nullable=False, default=0)
+    flight_pay = Column(Numeric(10, 2), nullable=False, default=0)
+    per_diem = Column(Numeric(10, 2), nullable=False, default=0)
+    premium_pay = Column(Numeric(10, 2), nullable=False, default=0)
+    guarantee_pay = Column(Numeric(10, 2), nullable=False, default=0)
+    total_pay = Column(Numeric(10, 2), nullable=False, default=0)
+    line_items = Column(Integer, nullable=False, default=0)
+    compliance_status = Column(String(20))
+    confidence_score = Column(Numeric(5, 4))
+    requires_review = Column(Boolean, default=False)
+    execution_id = Column(String(64))
+    calculated_at = Column(DateTime, default=datetime.utcnow)
+
+    crew_member = relationship("CrewMember")
+
+    __table_args__ = (
+        UniqueConstraint(
+            "crew_member_id", "pay_period_start", "pay_period_end", name="unique_crew_period"
+        ),
+        Index("idx_summary_crew_period", "crew_member_id", pay_period_start.desc()),
     )
 
 
@@ -170,10 +254,8 @@ class Claim(Base):
     crew_member_id = Column(
         UUID(as_uuid=True), ForeignKey("crew_members.id", ondelete="CASCADE"), index=True
     )
-    flight_assignment_id = Column(
-        UUID(as_uuid=True),
-        ForeignKey("flight_assignments.id", ondelete="SET NULL"),
-    )
+    # flight_assignments.id; no FK because that table is partitioned
+    flight_assignment_id = Column(UUID(as_uuid=True))
     claim_type = Column(String(50), nullable=False)
     description = Column(Text, nullable=False)
     amount_claimed = Column(Numeric(10, 2))
@@ -222,8 +304,10 @@ class AgentExecutionLog(Base):
 
     __tablename__ = "agent_execution_log"
 
+    # Range-partitioned by month of created_at
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    agent_name = Column(String(100), nullable=False, index=True)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
+    agent_name = Column(String(100), nullable=False)
     execution_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     crew_member_id = Column(UUID(as_uuid=True), ForeignKey("crew_members.id", ondelete="SET NULL"))
     input_data = Column(JSONB)
@@ -231,7 +315,17 @@ class AgentExecutionLog(Base):
     execution_time_ms = Column(Integer)
     success = Column(Boolean, default=True)
     error_message = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        Index("idx_agent_name_created", "agent_name", "created_at"),
+        Index("idx_agent_crew_created", "crew_member_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    @classmethod
+    def created_between(cls, start, end):
+        """Filter on the partition key (start inclusive, end exclusive)."""
+        return and_(cls.created_at >= start, cls.created_at < end)
 
 
 class PayPeriod(Base):
@@ -250,7 +344,46 @@ class PayPeriod(Base):
 
     __table_args__ = (
         UniqueConstraint("year", "period_number", name="unique_period"),
-        CheckConstraint(status.in_(["open", "closed", "paid"]), name="valid_period_status"),
+        CheckConstraint(
+            status.in_(["open", "closing", "closed", "paid"]), name="valid_period_status"
+        ),
+    )
+
+
+class PayPeriodCloseItem(Base):
+    """
+    One crew member's progress through a pay period close.
+
+    Inputs are snapshotted when the close starts so a resumed close computes
+    against the same roster and flights; each row is a durable checkpoint.
+    """
+
+    __tablename__ = "pay_period_close_items"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    pay_period_id = Column(
+        UUID(as_uuid=True), ForeignKey("pay_periods.id", ondelete="CASCADE"), nullable=False
+    )
+    crew_member_id = Column(
+        UUID(as_uuid=True), ForeignKey("crew_members.id", ondelete="CASCADE"), nullable=False
+    )
+    employee_id = Column(String(50), nullable=False)
+    crew_snapshot = Column(JSONB, nullable=False)
+    flights_snapshot = Column(JSONB, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    execution_id = Column(String(64))
+    node_outputs = Column(JSONB)
+    total_pay = Column(Numeric(10, 2))
+    error = Column(Text)
+    completed_at = Column(DateTime)
+
+    __table_args__ = (
+        UniqueConstraint("pay_period_id", "crew_member_id", name="unique_close_item"),
+        Index("idx_close_item_status", "pay_period_id", "status"),
+        CheckConstraint(
+            status.in_(["pending", "failed", "complete", "review"]), name="valid_close_item_status"
+        ),
     )
 
 
@@ -116,6 +116,40 @@ class PayCalculationResponse(BaseModel):
         from_attributes = True
 
 
+class CrewPaySummaryResponse(BaseModel):
+    """Precomputed pay totals for one crew member and pay period."""
+
+    pay_period_start: date
+    pay_period_end: date
+    credit_hours: float
+    flight_pay: float
+    per_diem: float
+    premium_pay: float
+    guarantee_pay: float
+    total_pay: float
+    compliance_status: Optional[str] = None
+    confidence_score: Optional[float] = None
+    requires_review: bool = False
+    calculated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CrewPayHistoryResponse(BaseModel):
+    """Crew member profile with recent pay period summaries."""
+
+    id: str
+    employee_id: str
+    name: str
+    role: str
+    base: Optional[str] = None
+    hourly_rate: float
+    monthly_guarantee: Optional[float] = None
+    current_period: Optional[CrewPaySummaryResponse] = None
+    pay_history: List[CrewPaySummaryResponse] = []
+
+
 class PayCalculationDetail(BaseModel):
     """Detailed pay calculation results."""
 
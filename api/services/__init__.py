@@ -0,0 +1 @@
+"""Service layer shared by the API endpoints and batch jobs."""
@@ -0,0 +1,312 @@
+"""
+Bulk Pay Calculations
+
+Runs the orchestrator over a roster with bounded concurrency and yields one
+NDJSON line per crew member as soon as that crew member completes.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from agents.coalescing import Coalescer, coalescing_scope
+from api.config import settings
+from api.services.pay_persistence import build_line_items, build_summary
+
+if TYPE_CHECKING:
+    from agents.orchestrator import CrewPayOrchestrator
+
+# Writes (summaries, line_items) and returns the number of rows written
+PersistCallback = Callable[[Sequence[Dict[str, Any]], Sequence[Dict[str, Any]]], int]
+
+logger = logging.getLogger(__name__)
+
+# Bulk runs in this process: active runs, their worker slots and the crew
+# members being calculated (updated on the event loop; read by readiness)
+bulk_load = {"runs": 0, "workers": 0, "in_flight": 0}
+
+
+def _build_orchestrator(checkpointer: Optional[Any] = None) -> "CrewPayOrchestrator":
+    """Orchestrator with the API's model tiers and speculation settings."""
+    # The agent stack (LangGraph, Anthropic client) is imported on first use
+    # rather than at API startup; see warm_up_agents()
+    from agents.core.call_policy import ModelTiers
+    from agents.orchestrator import CrewPayOrchestrator
+
+    model_tiers = ModelTiers(
+        fast_model=settings.claude_fast_model,
+        strong_model=settings.claude_strong_model,
+        fast_agents=frozenset(
+            name.strip() for name in settings.claude_fast_agents.split(",") if name.strip()
+        ),
+        escalation_confidence=settings.claude_escalation_confidence,
+    )
+    return CrewPayOrchestrator(
+        checkpointer=checkpointer,
+        model_tiers=model_tiers,
+        speculate=settings.speculative_downstream,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_orchestrator() -> "CrewPayOrchestrator":
+    """
+    Shared orchestrator for bulk runs, period close and recompute.
+
+    Agents and the compiled graph are reused across calls. It does not
+    checkpoint: every checkpoint write goes through one lock on the
+    checkpoint store, which would serialize the worker threads, and period
+    close keeps its own durable progress.
+    """
+    return _build_orchestrator()
+
+
+@lru_cache(maxsize=1)
+def get_checkpointing_orchestrator() -> "CrewPayOrchestrator":
+    """
+    Shared orchestrator for /calculations/start and /resume.
+
+    Saves every node's output to WORKFLOW_CHECKPOINT_DB so a failed run can
+    be resumed; the plain orchestrator when checkpointing is disabled.
+    """
+    if not settings.workflow_checkpoint_db:
+        return get_orchestrator()
+    from agents.checkpoint import create_checkpointer
+
+    return _build_orchestrator(create_checkpointer(settings.workflow_checkpoint_db))
+
+
+def warm_up_agents() -> None:
+    """
+    Import the agent stack and build the shared orchestrators.
+
+    Run in the background from the app lifespan, so the API answers health
+    checks immediately and the first calculation does not pay the import.
+    A failure is logged and retried on first use (lru_cache keeps no errors).
+    """
+    started = time.perf_counter()
+    try:
+        get_orchestrator()
+        get_checkpointing_orchestrator()
+    except Exception as e:
+        logger.warning(f"Agent warm-up failed, will retry on first use: {str(e)}")
+        return
+    logger.info(f"Agent stack ready in {time.perf_counter() - started:.2f}s")
+
+
+def summarize_result(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a final CrewPayState to the fields payroll consumers need."""
+    compliance = state.get("compliance_status") or {}
+    return {
+        "crew_member_id": state.get("crew_member_id"),
+        "employee_id": state.get("employee_id"),
+        "execution_id": state.get("execution_id"),
+        "pay_period_start": state.get("pay_period_start"),
+        "pay_period_end": state.get("pay_period_end"),
+        "status": state.get("status"),
+        "total_pay": state.get("total_pay"),
+        "total_hours": state.get("total_hours"),
+        "breakdown": state.get("breakdown"),
+        "compliance": compliance.get("overall_compliance", "unknown"),
+        "confidence_score": state.get("confidence_score"),
+        "requires_human_review": state.get("requires_human_review", True),
+        "warnings": state.get("warnings", []),
+        "errors": state.get("error_log", []),
+    }
+
+
+def _process_crew_member(
+    crew_member: Dict[str, Any],
+    flights: Tuple[Any, ...],
+    pay_period_start: str,
+    pay_period_end: str,
+    with_line_items: bool = False,
+    coalescer: Optional[Coalescer] = None,
+) -> Tuple[Dict[str, Any], Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]]:
+    """
+    Run one crew member through the orchestrator (worker thread).
+
+    Returns the summary line and, when requested and the calculation
+    completed, the crew period summary and its pay_calculations line items.
+    """
+    try:
+        with coalescing_scope(coalescer):
+            state = get_orchestrator().process(
+                crew_member_data=crew_member,
+                flight_assignments=flights,
+                pay_period_start=pay_period_start,
+                pay_period_end=pay_period_end,
+            )
+        line_items = None
+        if with_line_items and state.get("status") == "complete":
+            rows = build_line_items(state)
+            line_items = (build_summary(state, rows), rows)
+        return summarize_result(state), line_items
+    except Exception as e:
+        logger.error(f"Bulk calculation error for {crew_member.get('employee_id')}: {e}")
+        return {
+            "crew_member_id": crew_member.get("id"),
+            "employee_id": crew_member.get("employee_id"),
+            "pay_period_start": pay_period_start,
+            "pay_period_end": pay_period_end,
+            "status": "error",
+            "requires_human_review": True,
+            "errors": [str(e)],
+        }, None
+
+
+def to_ndjson(record: Dict[str, Any]) -> str:
+    """Serialize one result as a newline-terminated JSON line."""
+    return json.dumps(record, default=str, separators=(",", ":")) + "\n"
+
+
+async def stream_bulk_results(
+    roster: Iterator[Tuple[Dict[str, Any], Tuple[Any, ...]]],
+    pay_period_start: str,
+    pay_period_end: str,
+    max_in_flight: int,
+    persist: Optional[PersistCallback] = None,
+    persist_batch_size: int = 200,
+) -> AsyncIterator[str]:
+    """
+    Yield NDJSON lines as crew members complete.
+
+    At most max_in_flight crew members are being calculated at once and the
+    roster iterator is only advanced when a slot frees up, so memory stays
+    flat regardless of roster size. With persist, line items are written
+    persist_batch_size crew members at a time. Crew members on the same
+    trips share crew-neutral agent calls through one Coalescer per run.
+
+    Args:
+        roster: Iterator of (crew_member_data, flights) pairs
+        pay_period_start: Start date (YYYY-MM-DD)
+        pay_period_end: End date (YYYY-MM-DD)
+        max_in_flight: Maximum concurrent crew member calculations
+        persist: Writes a batch of line items (optional)
+        persist_batch_size: Crew members per persist call
+
+    Yields:
+        One JSON line per crew member, then a summary line
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max_in_flight)
+    pending = set()
+    counts = {"crew_members": 0, "complete": 0, "needs_review": 0, "error": 0}
+    if persist is not None:
+        counts["persisted_rows"] = 0
+        # Crew members whose rows failed to save (already counted above)
+        counts["persist_failed"] = 0
+    summaries: List[Dict[str, Any]] = []
+    rows: List[Dict[str, Any]] = []
+    coalescer = Coalescer() if settings.bulk_coalesce_shared_legs else None
+
+    def record(outcome) -> str:
+        result, line_items = outcome
+        bulk_load["in_flight"] -= 1
+        counts["crew_members"] += 1
+        if result.get("status") == "error":
+            counts["error"] += 1
+        elif result.get("requires_human_review"):
+            counts["needs_review"] += 1
+        else:
+            counts["complete"] += 1
+        if line_items is not None:
+            summaries.append(line_items[0])
+            rows.extend(line_items[1])
+        return to_ndjson(result)
+
+    async def flush() -> Optional[str]:
+        if not summaries:
+            return None
+        batch_summaries, batch_rows = list(summaries), list(rows)
+        summaries.clear()
+        rows.clear()
+        try:
+            counts["persisted_rows"] += await loop.run_in_executor(
+                None, persist, batch_summaries, batch_rows
+            )
+            return None
+        except Exception as e:
+            logger.error(f"Failed to persist bulk results: {e}")
+            counts["persist_failed"] += len(batch_summaries)
+            return to_ndjson(
+                {
+                    "status": "persist_error",
+                    "crew_member_ids": [str(s["crew_member_id"]) for s in batch_summaries],
+                    "errors": [str(e)],
+                }
+            )
+
+    bulk_load["runs"] += 1
+    bulk_load["workers"] += max_in_flight
+    try:
+        while True:
+            item = await loop.run_in_executor(None, next, roster, None)
+            if item is None:
+                break
+            crew_member, flights = item
+            pending.add(
+                loop.run_in_executor(
+                    executor,
+                    _process_crew_member,
+                    crew_member,
+                    flights,
+                    pay_period_start,
+                    pay_period_end,
+                    persist is not None,
+                    coalescer,
+                )
+            )
+            bulk_load["in_flight"] += 1
+            if len(pending) >= max_in_flight:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield record(future.result())
+            if len(summaries) >= persist_batch_size:
+                error = await flush()
+                if error:
+                    yield error
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                yield record(future.result())
+            if len(summaries) >= persist_batch_size:
+                error = await flush()
+                if error:
+                    yield error
+
+        error = await flush()
+        if error:
+            yield error
+
+        if coalescer is not None:
+            logger.info(f"Bulk run shared leg computations: {coalescer.stats()}")
+        yield to_ndjson({"summary": counts})
+
+    finally:
+        for future in pending:
+            future.cancel()
+        bulk_load["runs"] -= 1
+        bulk_load["workers"] -= max_in_flight
+        bulk_load["in_flight"] -= len(pending)
+        executor.shutdown(wait=False, cancel_futures=True)
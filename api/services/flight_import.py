@@ -0,0 +1,421 @@
+"""
+Flight Assignment Import
+
+Streams scheduling / ACARS exports (CSV or JSON lines) into
+flight_assignments. Rows are validated and normalised in Python (block
+time, red-eye flag and FDP are derived from the timestamps), employee IDs
+are resolved through an in-memory map, and each batch is COPY'd into a
+staging table and merged with one INSERT ... ON CONFLICT on the leg's
+natural key, so re-importing a file is idempotent.
+
+Usage:
+    python -m api.services.flight_import flights.csv [--format jsonl]
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from agents.flight_record import parse_date, parse_datetime
+from agents.rules import pay_rules
+from api.config import settings
+from api.models import CrewMember
+from api.services.partitions import ensure_partitions
+
+logger = logging.getLogger(__name__)
+
+# Columns written to flight_assignments, in COPY order
+IMPORT_COLUMNS = (
+    "id",
+    "crew_member_id",
+    "flight_number",
+    "flight_date",
+    "origin_airport",
+    "destination_airport",
+    "scheduled_departure",
+    "actual_departure",
+    "scheduled_arrival",
+    "actual_arrival",
+    "scheduled_block_time",
+    "actual_block_time",
+    "duty_report_time",
+    "duty_end_time",
+    "flight_duty_period",
+    "aircraft_type",
+    "position",
+    "overnight_location",
+    "is_international",
+    "is_redeye",
+    "is_deadhead",
+    "trip_id",
+    "sequence_number",
+)
+
+# Natural key of a leg (matches the uq_flight_leg index)
+LEG_KEY = (
+    "crew_member_id",
+    "flight_date",
+    "flight_number",
+    "origin_airport",
+    "destination_airport",
+)
+
+REQUIRED_FIELDS = (
+    "employee_id",
+    "flight_number",
+    "origin_airport",
+    "destination_airport",
+    "scheduled_departure",
+    "scheduled_arrival",
+)
+
+# Longest plausible block or duty period, in hours
+MAX_PERIOD_HOURS = 24.0
+
+# Rejected rows reported back in full; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+_TRUE = {"1", "true", "t", "yes", "y"}
+
+
+class RowError(ValueError):
+    """A source row that cannot be imported."""
+
+
+def read_rows(source: IO[str], fmt: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream raw rows from a CSV or JSON lines export.
+
+    Args:
+        source: Open text file
+        fmt: "csv" or "jsonl"
+
+    Yields:
+        One dictionary per source row
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(source)
+    elif fmt == "jsonl":
+        for line in source:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def detect_format(path: str) -> str:
+    """Infer the export format from a file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    return "jsonl" if extension in (".jsonl", ".ndjson", ".json") else "csv"
+
+
+def load_crew_map(session: Session) -> Dict[str, uuid.UUID]:
+    """Map every employee ID to its crew_members.id in one query."""
+    return dict(session.execute(select(CrewMember.employee_id, CrewMember.id)).all())
+
+
+def _text(raw: Dict[str, Any], name: str) -> Optional[str]:
+    value = raw.get(name)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _flag(raw: Dict[str, Any], name: str) -> bool:
+    value = raw.get(name)
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in _TRUE if value is not None else False
+
+
+def _timestamp(raw: Dict[str, Any], name: str, required: bool = False) -> Optional[datetime]:
+    value = _text(raw, name)
+    if value is None:
+        if required:
+            raise RowError(f"missing {name}")
+        return None
+    parsed = parse_datetime(value.replace("T", " ").rstrip("Z"))
+    if parsed is None:
+        raise RowError(f"invalid {name}: {value!r}")
+    return parsed
+
+
+def _airport(raw: Dict[str, Any], name: str) -> str:
+    value = (_text(raw, name) or "").upper()
+    if len(value) != 3 or not value.isalpha():
+        raise RowError(f"invalid {name}: {value!r}")
+    return value
+
+
+def _hours(
+    raw: Dict[str, Any], start: Optional[datetime], end: Optional[datetime], name: str
+) -> Optional[float]:
+    if start is not None and end is not None:
+        hours = (end - start).total_seconds() / 3600
+    elif _text(raw, name):
+        try:
+            hours = float(_text(raw, name))
+        except ValueError:
+            raise RowError(f"invalid {name}: {raw.get(name)!r}")
+    else:
+        return None
+    if not 0 < hours <= MAX_PERIOD_HOURS:
+        raise RowError(f"implausible {name}: {hours:.2f} hours")
+    return round(hours, 2)
+
+
+def normalize_row(raw: Dict[str, Any], crew_map: Dict[str, uuid.UUID]) -> Dict[str, Any]:
+    """
+    Validate one export row and convert it to the flight_assignments shape.
+
+    Block times and FDP are derived from the timestamps, falling back to
+    the export's own hour values only when a timestamp pair is missing. The
+    red-eye flag is also set from the scheduled departure time.
+
+    Args:
+        raw: Source row
+        crew_map: employee_id -> crew_members.id
+
+    Returns:
+        Row keyed by IMPORT_COLUMNS
+
+    Raises:
+        RowError: If the row is invalid or the employee is unknown
+    """
+    missing = [name for name in REQUIRED_FIELDS if not _text(raw, name)]
+    if missing:
+        raise RowError(f"missing {', '.join(missing)}")
+
+    employee_id = _text(raw, "employee_id")
+    crew_member_id = crew_map.get(employee_id)
+    if crew_member_id is None:
+        raise RowError(f"unknown employee_id {employee_id}")
+
+    scheduled_departure = _timestamp(raw, "scheduled_departure", required=True)
+    scheduled_arrival = _timestamp(raw, "scheduled_arrival", required=True)
+    actual_departure = _timestamp(raw, "actual_departure")
+    actual_arrival = _timestamp(raw, "actual_arrival")
+    duty_report_time = _timestamp(raw, "duty_report_time")
+    duty_end_time = _timestamp(raw, "duty_end_time")
+
+    flight_date = scheduled_departure.date()
+    if _text(raw, "flight_date"):
+        flight_date = parse_date(_text(raw, "flight_date"))
+        if flight_date is None:
+            raise RowError(f"invalid flight_date: {raw.get('flight_date')!r}")
+
+    sequence_number = _text(raw, "sequence_number")
+    try:
+        sequence_number = int(sequence_number) if sequence_number else None
+    except ValueError:
+        raise RowError(f"invalid sequence_number: {sequence_number!r}")
+
+    return {
+        "id": uuid.uuid4(),
+        "crew_member_id": crew_member_id,
+        "flight_number": _text(raw, "flight_number").upper(),
+        "flight_date": flight_date,
+        "origin_airport": _airport(raw, "origin_airport"),
+        "destination_airport": _airport(raw, "destination_airport"),
+        "scheduled_departure": scheduled_departure,
+        "actual_departure": actual_departure,
+        "scheduled_arrival": scheduled_arrival,
+        "actual_arrival": actual_arrival,
+        "scheduled_block_time": _hours(
+            raw, scheduled_departure, scheduled_arrival, "scheduled_block_time"
+        ),
+        "actual_block_time": _hours(
+            raw, actual_departure, actual_arrival, "actual_block_time"
+        ),
+        "duty_report_time": duty_report_time,
+        "duty_end_time": duty_end_time,
+        "flight_duty_period": _hours(
+            raw, duty_report_time, duty_end_time, "flight_duty_period"
+        ),
+        "aircraft_type": _text(raw, "aircraft_type"),
+        "position": _text(raw, "position"),
+        "overnight_location": (_text(raw, "overnight_location") or "").upper() or None,
+        "is_international": _flag(raw, "is_international"),
+        "is_redeye": _flag(raw, "is_redeye")
+        or pay_rules.is_redeye_departure(scheduled_departure),
+        "is_deadhead": _flag(raw, "is_deadhead"),
+        "trip_id": _text(raw, "trip_id"),
+        "sequence_number": sequence_number,
+    }
+
+
+def _copy_value(value: Any) -> Any:
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return value
+
+
+def write_copy_buffer(rows: Iterable[Dict[str, Any]]) -> io.StringIO:
+    """Encode rows as COPY CSV (NULL as \\N) in IMPORT_COLUMNS order."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        writer.writerow([_copy_value(row[name]) for name in IMPORT_COLUMNS])
+    buffer.seek(0)
+    return buffer
+
+
+def _merge_sql() -> str:
+    columns = ", ".join(IMPORT_COLUMNS)
+    updates = ", ".join(
+        f"{name} = EXCLUDED.{name}"
+        for name in IMPORT_COLUMNS
+        if name != "id" and name not in LEG_KEY
+    )
+    return (
+        f"INSERT INTO flight_assignments ({columns}) "
+        f"SELECT {columns} FROM flight_import_stage "
+        f"ON CONFLICT ({', '.join(LEG_KEY)}) DO UPDATE SET {updates}, updated_at = NOW()"
+    )
+
+
+def load_batch(session: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    COPY one batch into staging and merge it into flight_assignments.
+
+    Args:
+        session: Database session (committed on success)
+        rows: Normalised rows, unique on LEG_KEY
+
+    Returns:
+        Number of rows merged
+    """
+    if not rows:
+        return 0
+
+    try:
+        first = min(row["flight_date"] for row in rows)
+        last = max(row["flight_date"] for row in rows)
+        ensure_partitions(session, "flight_assignments", first, last)
+
+        session.execute(
+            text(
+                "CREATE TEMP TABLE IF NOT EXISTS flight_import_stage "
+                "(LIKE flight_assignments INCLUDING DEFAULTS)"
+            )
+        )
+        session.execute(text("TRUNCATE flight_import_stage"))
+
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY flight_import_stage ({', '.join(IMPORT_COLUMNS)}) "
+                "FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                write_copy_buffer(rows),
+            )
+        finally:
+            cursor.close()
+
+        session.execute(text(_merge_sql()))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    return len(rows)
+
+
+def import_flights(
+    session: Session,
+    rows: Iterable[Dict[str, Any]],
+    batch_size: Optional[int] = None,
+    crew_map: Optional[Dict[str, uuid.UUID]] = None,
+) -> Dict[str, Any]:
+    """
+    Import a stream of export rows.
+
+    Invalid rows are skipped and reported; valid rows are loaded in batches
+    of batch_size. Within a batch the last row for a leg wins.
+
+    Args:
+        session: Database session
+        rows: Raw source rows (see read_rows)
+        batch_size: Rows per COPY batch (default: settings.import_batch_size)
+        crew_map: employee_id -> crew_members.id (default: loaded from DB)
+
+    Returns:
+        Dictionary with rows_read, rows_loaded, rows_rejected, batches and
+        errors (line number and reason for the first rejected rows)
+    """
+    batch_size = batch_size or settings.import_batch_size
+    crew_map = crew_map if crew_map is not None else load_crew_map(session)
+    result = {
+        "rows_read": 0,
+        "rows_loaded": 0,
+        "rows_rejected": 0,
+        "batches": 0,
+        "errors": [],
+    }
+
+    batch: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+    def flush() -> None:
+        if batch:
+            result["rows_loaded"] += load_batch(session, list(batch.values()))
+            result["batches"] += 1
+            logger.info(f"Imported batch {result['batches']}: {len(batch)} rows")
+            batch.clear()
+
+    for line_number, raw in enumerate(rows, start=1):
+        result["rows_read"] += 1
+        try:
+            row = normalize_row(raw, crew_map)
+        except RowError as e:
+            result["rows_rejected"] += 1
+            if len(result["errors"]) < MAX_REPORTED_ERRORS:
+                result["errors"].append({"line": line_number, "error": str(e)})
+            continue
+
+        batch[tuple(row[name] for name in LEG_KEY)] = row
+        if len(batch) >= batch_size:
+            flush()
+
+    flush()
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from api.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Import flight assignments")
+    parser.add_argument("path", help="CSV or JSON lines export")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Override format detection")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        with open(args.path, newline="") as source:
+            summary = import_flights(
+                session,
+                read_rows(source, args.format or detect_format(args.path)),
+                batch_size=args.batch_size,
+            )
+    finally:
+        session.close()
+
+    for error in summary["errors"]:
+        logger.warning(f"Line {error['line']}: {error['error']}")
+    logger.info(
+        f"Read {summary['rows_read']}, loaded {summary['rows_loaded']}, "
+        f"rejected {summary['rows_rejected']} in {summary['batches']} batches"
+    )
@@ -0,0 +1,166 @@
+"""
+Health Checks
+
+Liveness says the process is up and its event loop answers; readiness says
+this instance should receive traffic. Readiness probes the database with
+SELECT 1 under a timeout and checks pool headroom, the Claude circuit
+(agents.llm_health), recompute queue depth and bulk run saturation. The
+report is cached for a short interval and concurrent probes share one
+check, so load balancers can poll it often.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from agents.llm_health import OPEN, CircuitBreaker, claude_circuit
+from api.config import settings
+from api.database import engine
+from api.services.bulk_calculations import bulk_load, get_orchestrator
+from api.services.recompute import RecomputeQueue, recompute_queue
+
+logger = logging.getLogger(__name__)
+
+
+def _agent_status(warmup: Optional[asyncio.Future]) -> str:
+    """ready, loading (warm-up running) or not_loaded (loads on first use)."""
+    if get_orchestrator.cache_info().currsize:
+        return "ready"
+    if warmup is not None and not warmup.done():
+        return "loading"
+    return "not_loaded"
+
+
+class HealthMonitor:
+    """
+    Cached readiness report for one API process.
+
+    The database probe runs on its own single thread: a probe stuck on a
+    hung connection makes later probes time out too (not ready) instead of
+    piling up threads.
+    """
+
+    def __init__(
+        self,
+        db_engine: Engine = engine,
+        queue: RecomputeQueue = recompute_queue,
+        circuit: CircuitBreaker = claude_circuit,
+        load: Dict[str, int] = bulk_load,
+        pool_capacity: int = settings.db_pool_size + settings.db_max_overflow,
+        cache_seconds: float = settings.health_cache_seconds,
+        db_timeout_seconds: float = settings.health_db_timeout_seconds,
+        max_queue_fill: float = settings.health_max_queue_fill,
+        max_bulk_runs: int = settings.health_max_bulk_runs,
+        llm_configured: Callable[[], bool] = lambda: bool(settings.anthropic_api_key),
+    ):
+        self.engine = db_engine
+        self.queue = queue
+        self.circuit = circuit
+        self.load = load
+        self.pool_capacity = pool_capacity
+        self.cache_seconds = cache_seconds
+        self.db_timeout_seconds = db_timeout_seconds
+        self.max_queue_fill = max_queue_fill
+        self.max_bulk_runs = max_bulk_runs
+        self.llm_configured = llm_configured
+
+        # Agent warm-up future set by the app lifespan (None: no warm-up)
+        self.warmup: Optional[asyncio.Future] = None
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="health-probe")
+        self._report: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._refresh: Optional[asyncio.Future] = None
+
+    async def readiness(self) -> Dict[str, Any]:
+        """Readiness report, at most cache_seconds old."""
+        if self._report is not None and time.monotonic() - self._checked_at < self.cache_seconds:
+            return self._report
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.ensure_future(self._check())
+        return await asyncio.shield(self._refresh)
+
+    async def _check(self) -> Dict[str, Any]:
+        reasons: List[str] = []
+
+        database = await self._check_database()
+        if database["status"] != "connected":
+            reasons.append(f"database {database['status']}")
+
+        llm = {"configured": self.llm_configured(), **self.circuit.snapshot()}
+        if llm["state"] == OPEN:
+            reasons.append("claude circuit open")
+
+        queue = {
+            "running": self.queue.started,
+            "depth": self.queue.depth,
+            "capacity": self.queue.max_size,
+            "in_progress": self.queue.in_progress,
+            "max_concurrency": self.queue.max_concurrency,
+            "stats": dict(self.queue.stats),
+        }
+        if not queue["running"]:
+            reasons.append("recompute queue not running")
+        elif queue["depth"] >= self.max_queue_fill * queue["capacity"]:
+            reasons.append(f"recompute queue saturated ({queue['depth']}/{queue['capacity']})")
+
+        bulk = {**self.load, "max_runs": self.max_bulk_runs}
+        if self.max_bulk_runs and bulk["runs"] >= self.max_bulk_runs:
+            reasons.append(f"bulk runs saturated ({bulk['runs']}/{self.max_bulk_runs})")
+
+        report = {
+            "status": "not_ready" if reasons else "ready",
+            "reasons": reasons,
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "database": database,
+            "llm": llm,
+            "recompute_queue": queue,
+            "bulk": bulk,
+            "agents": _agent_status(self.warmup),
+        }
+        if reasons:
+            logger.warning(f"Not ready: {', '.join(reasons)}")
+        self._report = report
+        self._checked_at = time.monotonic()
+        return report
+
+    async def _check_database(self) -> Dict[str, Any]:
+        """SELECT 1 under a timeout, skipped when the pool has no free connection."""
+        result: Dict[str, Any] = {}
+        pool = self.engine.pool
+        if isinstance(pool, QueuePool):
+            checked_out = pool.checkedout()
+            result["pool"] = {"checked_out": checked_out, "capacity": self.pool_capacity}
+            if checked_out >= self.pool_capacity:
+                # Checking out would block for the pool timeout
+                return {"status": "exhausted", **result}
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                loop.run_in_executor(self._executor, self._select_one),
+                timeout=self.db_timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            return {"status": "timeout", **result}
+        except Exception as e:
+            # Only the error type is exposed on the (unauthenticated) endpoint
+            logger.warning(f"Database readiness probe failed: {e}")
+            return {"status": "error", "error": type(e).__name__, **result}
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        return {"status": "connected", "latency_ms": latency_ms, **result}
+
+    def _select_one(self) -> None:
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+
+health_monitor = HealthMonitor()
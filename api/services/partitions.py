@@ -0,0 +1,206 @@
+"""
+Partition Maintenance
+
+flight_assignments and agent_execution_log are range-partitioned by month
+(see database/schema.sql). This job creates partitions ahead of time and
+applies the execution log retention policy by detaching old partitions and
+archiving or dropping them. Flight assignments are never removed.
+
+Run daily:
+    python -m api.services.partitions
+"""
+
+import logging
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Partitioned table -> partition key column
+PARTITIONED_TABLES = {
+    "flight_assignments": "flight_date",
+    "agent_execution_log": "created_at",
+}
+
+_PARTITION_SUFFIX = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing day."""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Shift a month start by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of the partition holding month, e.g. flight_assignments_y2025m11."""
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def partitions_for_period(table: str, start: date, end: date) -> List[str]:
+    """
+    Partitions a query bounded by [start, end] touches after pruning.
+
+    A pay period within one month touches one partition; one spanning a
+    month boundary touches two.
+    """
+    months = []
+    month = month_start(start)
+    while month <= end:
+        months.append(partition_name(table, month))
+        month = add_months(month, 1)
+    return months
+
+
+def ensure_partitions(session: Session, table: str, start: date, end: date) -> List[str]:
+    """
+    Create any missing monthly partitions covering [start, end].
+
+    Args:
+        session: Database session (caller commits)
+        table: Partitioned table name
+        start: First date that must be insertable
+        end: Last date that must be insertable
+
+    Returns:
+        Partition names covering the range
+    """
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"{table} is not a partitioned table")
+
+    names = []
+    month = month_start(start)
+    while month <= end:
+        names.append(
+            session.execute(
+                text("SELECT create_monthly_partition(:parent, :month)"),
+                {"parent": table, "month": month},
+            ).scalar_one()
+        )
+        month = add_months(month, 1)
+    return names
+
+
+def list_partitions(session: Session, table: str) -> List[Tuple[str, date]]:
+    """
+    Monthly partitions currently attached to a table.
+
+    Returns:
+        (partition name, month start) pairs, oldest first
+    """
+    rows = session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent"
+        ),
+        {"parent": table},
+    ).scalars()
+
+    partitions = []
+    for name in rows:
+        match = _PARTITION_SUFFIX.search(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def expire_partitions(
+    session: Session,
+    table: str,
+    retain_months: int,
+    archive_schema: Optional[str],
+    today: Optional[date] = None,
+) -> List[str]:
+    """
+    Detach partitions older than the retention window.
+
+    Detached partitions are moved to archive_schema (kept queryable for
+    audits, out of the hot table) or dropped when archive_schema is empty.
+    Detaching is a metadata operation; no rows are rewritten.
+
+    Args:
+        session: Database session (caller commits)
+        table: Partitioned table name
+        retain_months: Whole months to keep before the current month
+        archive_schema: Schema for detached partitions, or None/"" to drop
+        today: Reference date (default: today)
+
+    Returns:
+        Names of the partitions removed from the table
+    """
+    cutoff = add_months(month_start(today or date.today()), -retain_months)
+    expired = [name for name, month in list_partitions(session, table) if month < cutoff]
+
+    if expired and archive_schema:
+        session.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+
+    for name in expired:
+        session.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+        if archive_schema:
+            session.execute(text(f'ALTER TABLE "{name}" SET SCHEMA "{archive_schema}"'))
+            logger.info(f"Archived partition {name} to schema {archive_schema}")
+        else:
+            session.execute(text(f'DROP TABLE "{name}"'))
+            logger.info(f"Dropped partition {name}")
+
+    return expired
+
+
+def run_maintenance(session: Session, today: Optional[date] = None) -> Dict[str, List[str]]:
+    """
+    Create upcoming partitions and apply execution log retention.
+
+    Args:
+        session: Database session (committed on success)
+        today: Reference date (default: today)
+
+    Returns:
+        Dictionary with "ensured" and "expired" partition names
+    """
+    current = month_start(today or date.today())
+    horizon = add_months(current, settings.partition_months_ahead + 1)
+
+    try:
+        ensured = []
+        for table in PARTITIONED_TABLES:
+            ensured += ensure_partitions(session, table, current, horizon - date.resolution)
+        expired = expire_partitions(
+            session,
+            "agent_execution_log",
+            settings.execution_log_retention_months,
+            settings.execution_log_archive_schema or None,
+            today=today,
+        )
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    return {"ensured": ensured, "expired": expired}
+
+
+if __name__ == "__main__":
+    from api.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        result = run_maintenance(session)
+        logger.info(
+            f"Partitions ensured: {len(result['ensured'])}, "
+            f"expired: {', '.join(result['expired']) or 'none'}"
+        )
+    finally:
+        session.close()
@@ -0,0 +1,416 @@
+"""
+Pay Calculation Persistence
+
+Explodes a finished CrewPayState into pay_calculations line items and writes
+batches of crew members with multi-row upserts keyed on
+(crew, period, type, flight), so re-running a period is idempotent. The
+crew_pay_summaries row for each crew period is rewritten in the same
+transaction, so read APIs never aggregate raw line items.
+"""
+
+import uuid
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, func, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from agents.flight_record import as_flight_records
+from api.database import SessionLocal
+from api.models import PAY_LINE_FLIGHT_KEY, CrewPaySummary, PayCalculation
+
+# Rows per INSERT statement (14 bind parameters each, well under the
+# PostgreSQL limit of 65535 per statement)
+UPSERT_CHUNK_SIZE = 1000
+
+# Premium component type -> pay_calculations.calculation_type
+PREMIUM_CALCULATION_TYPES = {
+    "holiday": "premium_holiday",
+    "redeye": "premium_redeye",
+    "international": "premium_international",
+    "training": "premium_training",
+    "overtime": "premium_overtime",
+    "deadhead": "deadhead",
+    "cancellation": "cancellation",
+}
+
+# Premium totals key -> calculation_type, used when the agent returned
+# totals without itemized components
+PREMIUM_TOTAL_TYPES = {
+    "total_holiday_pay": "premium_holiday",
+    "total_redeye_premium": "premium_redeye",
+    "total_international_premium": "premium_international",
+    "total_training_pay": "premium_training",
+    "total_overtime_pay": "premium_overtime",
+    "total_deadhead_pay": "deadhead",
+    "total_cancellation_pay": "cancellation",
+}
+
+CrewPeriod = Tuple[uuid.UUID, date, date]
+
+
+def _as_uuid(value: Any) -> Optional[uuid.UUID]:
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _as_date(value: Any) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _round(value: Any, places: int = 2) -> Optional[float]:
+    return None if value is None else round(float(value), places)
+
+
+def crew_period(state: Dict[str, Any]) -> CrewPeriod:
+    """The (crew_member_id, pay_period_start, pay_period_end) a state covers."""
+    return (
+        _as_uuid(state["crew_member_id"]),
+        _as_date(state["pay_period_start"]),
+        _as_date(state["pay_period_end"]),
+    )
+
+
+def build_line_items(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Explode a final CrewPayState into pay_calculations rows.
+
+    Flight pay and premiums become one row per flight (matched to the
+    flight assignment by flight number and date), per diem one row per
+    layover (matched to the inbound flight when possible) and guarantee a
+    single row holding the top-up over flight pay, so the rows sum to
+    total_pay. Rows sharing a key are merged.
+
+    Args:
+        state: Final orchestrator state
+
+    Returns:
+        Row dictionaries ready for upsert_line_items
+    """
+    crew_member_id, period_start, period_end = crew_period(state)
+    execution_id = state.get("execution_id")
+    flights = as_flight_records(
+        state.get("flight_records") or state.get("flight_assignments") or ()
+    )
+    flight_ids = {}
+    inbound_ids = {}
+    for f in flights:
+        flight_date = f.flight_date.isoformat() if f.flight_date else None
+        flight_ids[(f.flight_number, flight_date)] = _as_uuid(f.id)
+        arrival = f.actual_arrival or f.scheduled_arrival
+        if arrival is not None:
+            inbound_ids[(f.destination_airport, arrival.date().isoformat())] = _as_uuid(f.id)
+
+    rows: "OrderedDict[Tuple[str, Optional[uuid.UUID]], Dict[str, Any]]" = OrderedDict()
+
+    def add(
+        calculation_type: str,
+        flight_id: Optional[uuid.UUID],
+        amount: float,
+        agent: str,
+        confidence: Any,
+        details: Dict[str, Any],
+        base_hours: Any = None,
+        credit_hours: Any = None,
+        rate: Any = None,
+    ) -> None:
+        key = (calculation_type, flight_id)
+        row = rows.get(key)
+        if row is None:
+            rows[key] = {
+                "crew_member_id": crew_member_id,
+                "pay_period_start": period_start,
+                "pay_period_end": period_end,
+                "flight_assignment_id": flight_id,
+                "calculation_type": calculation_type,
+                "base_hours": _round(base_hours, 4),
+                "credit_hours": _round(credit_hours, 4),
+                "rate": _round(rate),
+                "amount": _round(amount),
+                "calculation_details": {"execution_id": execution_id, "items": [details]},
+                "calculated_by_agent": agent,
+                "confidence_score": _round(confidence if confidence is not None else 1.0, 4),
+            }
+            return
+        row["amount"] = _round(row["amount"] + float(amount))
+        row["calculation_details"]["items"].append(details)
+
+    flight_time = state.get("flight_time_data") or {}
+    hourly_rate = float(
+        flight_time.get("totals", {}).get("hourly_rate")
+        or (state.get("crew_member_data") or {}).get("hourly_rate")
+        or 0
+    )
+    flight_pay = float(flight_time.get("totals", {}).get("total_flight_pay", 0) or 0)
+    if flight_time.get("flights"):
+        for flight in flight_time["flights"]:
+            credit = float(flight.get("credit_hours") or 0)
+            add(
+                "flight_pay",
+                flight_ids.get((flight.get("flight_number"), flight.get("flight_date"))),
+                credit * hourly_rate,
+                "FlightTimeCalculator",
+                flight_time.get("confidence_score"),
+                flight,
+                base_hours=flight.get("actual_block_time"),
+                credit_hours=credit,
+                rate=hourly_rate,
+            )
+    elif flight_pay:
+        add(
+            "flight_pay",
+            None,
+            flight_pay,
+            "FlightTimeCalculator",
+            flight_time.get("confidence_score"),
+            flight_time.get("totals", {}),
+            credit_hours=flight_time.get("totals", {}).get("total_credit_hours"),
+            rate=hourly_rate,
+        )
+
+    premium = state.get("premium_pay_data") or {}
+    if not premium.get("premium_components"):
+        for total_key, calculation_type in PREMIUM_TOTAL_TYPES.items():
+            amount = float(premium.get("totals", {}).get(total_key) or 0)
+            if amount:
+                add(
+                    calculation_type,
+                    None,
+                    amount,
+                    "PremiumPayCalculator",
+                    premium.get("confidence_score"),
+                    {total_key: amount},
+                )
+    for component in premium.get("premium_components", []):
+        calculation_type = PREMIUM_CALCULATION_TYPES.get(component.get("type"))
+        if calculation_type is None:
+            continue
+        add(
+            calculation_type,
+            flight_ids.get((component.get("flight_number"), component.get("date"))),
+            float(component.get("premium_amount") or 0),
+            "PremiumPayCalculator",
+            premium.get("confidence_score"),
+            component,
+            rate=component.get("rate_or_multiplier"),
+        )
+
+    per_diem = state.get("per_diem_data") or {}
+    net_per_diem = float(per_diem.get("totals", {}).get("total_net_per_diem") or 0)
+    if not per_diem.get("layovers") and net_per_diem:
+        add(
+            "per_diem",
+            None,
+            net_per_diem,
+            "PerDiemCalculator",
+            per_diem.get("confidence_score"),
+            per_diem.get("totals", {}),
+        )
+    for layover in per_diem.get("layovers", []):
+        arrival = str(layover.get("arrival") or "")[:10]
+        add(
+            "per_diem",
+            inbound_ids.get((layover.get("airport_code"), arrival)),
+            float(layover.get("layover_total") or 0),
+            "PerDiemCalculator",
+            per_diem.get("confidence_score"),
+            layover,
+            base_hours=layover.get("duration_hours"),
+            rate=layover.get("daily_rate"),
+        )
+
+    guarantee = state.get("guarantee_data") or {}
+    calculation = guarantee.get("calculation") or {}
+    top_up = float(calculation.get("base_pay", 0) or 0) - flight_pay
+    if top_up > 0:
+        add(
+            "guarantee",
+            None,
+            top_up,
+            "GuaranteeCalculator",
+            guarantee.get("confidence_score"),
+            calculation,
+            base_hours=calculation.get("actual_credit_hours"),
+            credit_hours=calculation.get("paid_hours"),
+            rate=calculation.get("hourly_rate"),
+        )
+
+    return list(rows.values())
+
+
+def build_summary(state: Dict[str, Any], rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the crew_pay_summaries row for one crew period.
+
+    Amounts are summed from the line items being written, so the summary
+    always matches pay_calculations for that period.
+
+    Args:
+        state: Final orchestrator state
+        rows: build_line_items output for the same state
+
+    Returns:
+        Summary row dictionary
+    """
+    crew_member_id, period_start, period_end = crew_period(state)
+    amounts = {"flight_pay": 0.0, "per_diem": 0.0, "guarantee": 0.0, "premium": 0.0}
+    for row in rows:
+        category = row["calculation_type"]
+        amounts[category if category in amounts else "premium"] += row["amount"]
+
+    compliance = state.get("compliance_status") or {}
+    return {
+        "crew_member_id": crew_member_id,
+        "pay_period_start": period_start,
+        "pay_period_end": period_end,
+        "credit_hours": _round(state.get("total_hours") or 0, 4),
+        "flight_pay": _round(amounts["flight_pay"]),
+        "per_diem": _round(amounts["per_diem"]),
+        "premium_pay": _round(amounts["premium"]),
+        "guarantee_pay": _round(amounts["guarantee"]),
+        "total_pay": _round(sum(amounts.values())),
+        "line_items": len(rows),
+        "compliance_status": compliance.get("overall_compliance"),
+        "confidence_score": _round(state.get("confidence_score"), 4),
+        "requires_review": bool(state.get("requires_human_review")),
+        "execution_id": state.get("execution_id"),
+    }
+
+
+def _summary_key(summary: Dict[str, Any]) -> CrewPeriod:
+    return (summary["crew_member_id"], summary["pay_period_start"], summary["pay_period_end"])
+
+
+def upsert_line_items(
+    session: Session,
+    summaries: Sequence[Dict[str, Any]],
+    rows: Sequence[Dict[str, Any]],
+) -> int:
+    """
+    Write line items and summaries for a batch of crew members in one transaction.
+
+    Rows are inserted with multi-row INSERT ... ON CONFLICT DO UPDATE on the
+    line-item key. Rows previously written for the same crew periods that
+    this run no longer produces are deleted, so a re-run leaves exactly the
+    new result. A changed amount clears the verified flag. Summaries are
+    upserted on (crew, period).
+
+    Args:
+        session: Database session (committed on success)
+        summaries: build_summary output, one per crew period in the batch
+            (including crew members that produced no rows)
+        rows: build_line_items output for those crew members
+
+    Returns:
+        Number of line items written
+    """
+    table = PayCalculation.__table__
+    crew_periods = [_summary_key(summary) for summary in summaries]
+
+    try:
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            chunk = rows[start:start + UPSERT_CHUNK_SIZE]
+            stmt = insert(table).values([dict(row, created_at=func.now()) for row in chunk])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    table.c.crew_member_id,
+                    table.c.pay_period_start,
+                    table.c.pay_period_end,
+                    table.c.calculation_type,
+                    PAY_LINE_FLIGHT_KEY,
+                ],
+                set_={
+                    "base_hours": stmt.excluded.base_hours,
+                    "credit_hours": stmt.excluded.credit_hours,
+                    "rate": stmt.excluded.rate,
+                    "amount": stmt.excluded.amount,
+                    "calculation_details": stmt.excluded.calculation_details,
+                    "calculated_by_agent": stmt.excluded.calculated_by_agent,
+                    "confidence_score": stmt.excluded.confidence_score,
+                    "verified": and_(
+                        table.c.verified, table.c.amount == stmt.excluded.amount
+                    ),
+                    "created_at": func.now(),
+                },
+            )
+            session.execute(stmt)
+
+        # Everything written above carries this transaction's now(); older
+        # rows for the same crew periods are stale
+        if crew_periods:
+            session.execute(
+                delete(table).where(
+                    tuple_(
+                        table.c.crew_member_id,
+                        table.c.pay_period_start,
+                        table.c.pay_period_end,
+                    ).in_(list(crew_periods)),
+                    or_(table.c.created_at.is_(None), table.c.created_at != func.now()),
+                )
+            )
+
+            summary_table = CrewPaySummary.__table__
+            for start in range(0, len(summaries), UPSERT_CHUNK_SIZE):
+                chunk = summaries[start:start + UPSERT_CHUNK_SIZE]
+                stmt = insert(summary_table).values(
+                    [dict(summary, calculated_at=func.now()) for summary in chunk]
+                )
+                stmt = stmt.on_conflict_do_update(
+                    constraint="unique_crew_period",
+                    set_={
+                        name: stmt.excluded[name]
+                        for name in chunk[0]
+                        if name not in ("crew_member_id", "pay_period_start", "pay_period_end")
+                    }
+                    | {"calculated_at": func.now()},
+                )
+                session.execute(stmt)
+
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    return len(rows)
+
+
+def persist_results(session: Session, states: Iterable[Dict[str, Any]]) -> int:
+    """
+    Persist completed calculations for a batch of crew members.
+
+    States that did not complete are skipped and their existing rows left
+    untouched.
+
+    Args:
+        session: Database session
+        states: Final orchestrator states
+
+    Returns:
+        Number of rows written
+    """
+    summaries: List[Dict[str, Any]] = []
+    rows: List[Dict[str, Any]] = []
+    for state in states:
+        if state.get("status") != "complete":
+            continue
+        state_rows = build_line_items(state)
+        summaries.append(build_summary(state, state_rows))
+        rows.extend(state_rows)
+    return upsert_line_items(session, summaries, rows)
+
+
+def save_line_items(
+    summaries: Sequence[Dict[str, Any]], rows: Sequence[Dict[str, Any]]
+) -> int:
+    """upsert_line_items in a fresh session (for worker threads and batch jobs)."""
+    session = SessionLocal()
+    try:
+        return upsert_line_items(session, summaries, rows)
+    finally:
+        session.close()
@@ -0,0 +1,56 @@
+"""
+Pay Summary Reads
+
+Lookups served from crew_pay_summaries for the crew self-service APIs.
+"""
+
+import uuid
+from typing import List, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from api.models import CrewMember, CrewPaySummary
+
+
+def find_crew_member(session: Session, crew_member_id: str) -> Optional[CrewMember]:
+    """
+    Look up a crew member by employee ID or database UUID.
+
+    Args:
+        session: Database session
+        crew_member_id: Employee ID (e.g., "P12345") or crew member UUID
+
+    Returns:
+        CrewMember, or None if not found
+    """
+    condition = CrewMember.employee_id == crew_member_id
+    try:
+        condition = or_(condition, CrewMember.id == uuid.UUID(crew_member_id))
+    except ValueError:
+        pass
+    return session.execute(select(CrewMember).where(condition)).scalar_one_or_none()
+
+
+def get_pay_summaries(
+    session: Session, crew_member_id: uuid.UUID, limit: int = 12
+) -> List[CrewPaySummary]:
+    """
+    Most recent pay period summaries for a crew member, newest first.
+
+    Args:
+        session: Database session
+        crew_member_id: Crew member UUID
+        limit: Maximum number of periods
+
+    Returns:
+        Summary rows
+    """
+    return list(
+        session.execute(
+            select(CrewPaySummary)
+            .where(CrewPaySummary.crew_member_id == crew_member_id)
+            .order_by(CrewPaySummary.pay_period_start.desc())
+            .limit(limit)
+        ).scalars()
+    )
@@ -0,0 +1,394 @@
+"""
+Pay Period Close
+
+Closes a pay period by running every active crew member through the
+orchestrator and flipping the period to closed once each one is computed
+or routed to review.
+
+The close is resumable. Starting it snapshots each crew member's profile
+and flights into pay_period_close_items and moves the period to
+"closing"; crew members are then claimed in chunks (FOR UPDATE SKIP LOCKED,
+so several workers can share a close), and each chunk's results, node
+outputs and pay rows are committed together. A crashed close picks up
+from the first unfinished crew member when run again.
+
+With CLOSE_SHARD_WORKERS set, the deterministic totals (credit hours,
+flight pay, premiums, per diem, Part 117 duty checks) for every
+unfinished crew member are first computed across a process pool by
+ShardedPayRunner. Each crew member's local totals are stored with their
+node outputs, and a run whose flight pay disagrees with them goes to
+review.
+
+Run:
+    python -m api.services.period_close <pay_period_id>
+"""
+
+import json
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from agents.coalescing import Coalescer, coalescing_scope
+from agents.sharded_runner import ShardedPayRunner
+from api.config import settings
+from api.models import PayPeriod, PayPeriodCloseItem
+from api.services.bulk_calculations import get_orchestrator
+from api.services.pay_persistence import persist_results
+from api.services.roster import iter_roster
+
+logger = logging.getLogger(__name__)
+
+# Close items inserted per statement while snapshotting
+SNAPSHOT_CHUNK_SIZE = 500
+
+# Statuses that still need a run
+OPEN_ITEM_STATUSES = ("pending", "failed")
+
+# Largest flight pay difference from the local sharded totals before a
+# crew member is routed to review
+LOCAL_PAY_TOLERANCE = 0.01
+
+# (final state or None, node outputs, error message or None)
+ItemResult = Tuple[Optional[Dict[str, Any]], Dict[str, Any], Optional[str]]
+
+
+def snapshot_period(session: Session, period: PayPeriod) -> int:
+    """
+    Snapshot every active crew member's inputs for a close.
+
+    Idempotent: crew members already snapshotted are left as they are.
+
+    Args:
+        session: Database session (caller commits)
+        period: Pay period being closed
+
+    Returns:
+        Number of crew members seen
+    """
+    table = PayPeriodCloseItem.__table__
+    rows: List[Dict[str, Any]] = []
+    count = 0
+
+    def flush() -> None:
+        if rows:
+            session.execute(
+                insert(table).values(rows).on_conflict_do_nothing(constraint="unique_close_item")
+            )
+            rows.clear()
+
+    for crew_member, flights in iter_roster(session, period.period_start, period.period_end):
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "pay_period_id": period.id,
+                "crew_member_id": uuid.UUID(crew_member["id"]),
+                "employee_id": crew_member["employee_id"],
+                "crew_snapshot": crew_member,
+                "flights_snapshot": [flight.to_dict() for flight in flights],
+                "status": "pending",
+                "attempts": 0,
+            }
+        )
+        count += 1
+        if len(rows) >= SNAPSHOT_CHUNK_SIZE:
+            flush()
+    flush()
+    return count
+
+
+def run_close_item(
+    crew_member: Dict[str, Any],
+    flights: Sequence[Dict[str, Any]],
+    pay_period_start: date,
+    pay_period_end: date,
+    coalescer: Optional[Coalescer] = None,
+) -> ItemResult:
+    """
+    Run one snapshotted crew member through the orchestrator (worker thread).
+
+    Returns:
+        (final state, per-node outputs, error); state is None on failure
+    """
+    node_outputs: Dict[str, Any] = {}
+
+    def record(execution_id: str, event: Dict[str, Any]) -> None:
+        if event.get("event") == "node_completed":
+            node_outputs[event["node"]] = {
+                "result": event.get("result"),
+                "errors": event.get("errors") or [],
+                "duration_ms": event.get("duration_ms"),
+            }
+
+    try:
+        with coalescing_scope(coalescer):
+            state = get_orchestrator().process(
+                crew_member_data=crew_member,
+                flight_assignments=list(flights),
+                pay_period_start=pay_period_start.isoformat(),
+                pay_period_end=pay_period_end.isoformat(),
+                on_progress=record,
+            )
+    except Exception as e:
+        return None, node_outputs, str(e)
+
+    if state.get("status") == "error":
+        return state, node_outputs, "; ".join(state.get("error_log") or ["calculation failed"])
+    return state, node_outputs, None
+
+
+def local_totals(
+    session: Session, pay_period_id: uuid.UUID, workers: int, shard_key: str
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Deterministic totals for every unfinished crew member of a close.
+
+    Runs ShardedPayRunner over the close snapshots, so the CPU-bound local
+    math scales with worker processes.
+
+    Args:
+        session: Database session
+        pay_period_id: Pay period being closed
+        workers: Worker processes
+        shard_key: "crew_member_id" or "base_airport"
+
+    Returns:
+        Crew member ID -> section -> totals (see merge_shard_results)
+    """
+    roster = session.execute(
+        select(PayPeriodCloseItem.crew_snapshot, PayPeriodCloseItem.flights_snapshot).where(
+            PayPeriodCloseItem.pay_period_id == pay_period_id,
+            PayPeriodCloseItem.status.in_(OPEN_ITEM_STATUSES),
+        )
+    ).all()
+    result = ShardedPayRunner(max_workers=workers, shard_key=shard_key).run(
+        [(crew_member, flights) for crew_member, flights in roster]
+    )
+    logger.info(f"Local totals for {len(roster)} crew members: {result['totals']}")
+    return result["crew"]
+
+
+def _local_mismatch(state: Dict[str, Any], local: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Why a completed run disagrees with its local totals (None: it agrees)."""
+    if local is None:
+        return None
+    flight_pay = (state.get("breakdown") or {}).get("flight_pay")
+    expected = local["flight_time"]["total_flight_pay"]
+    if flight_pay is None or abs(float(flight_pay) - expected) <= LOCAL_PAY_TOLERANCE:
+        return None
+    return f"Flight pay {float(flight_pay):.2f} differs from local calculation {expected:.2f}"
+
+
+def checkpoint_item(
+    item: PayPeriodCloseItem,
+    result: ItemResult,
+    max_attempts: int,
+    local: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Record a run's outcome on its close item.
+
+    Completed runs become "complete", or "review" when the orchestrator
+    flagged them or their flight pay disagrees with the local totals.
+    Failures are retried on a later chunk until max_attempts, after which
+    the crew member is routed to review.
+    """
+    state, node_outputs, error = result
+    if local is not None:
+        node_outputs = dict(node_outputs, local_totals=local)
+    item.attempts = (item.attempts or 0) + 1
+    item.node_outputs = json.loads(json.dumps(node_outputs, default=str))
+    if state is not None:
+        item.execution_id = state.get("execution_id")
+
+    if error is None:
+        mismatch = _local_mismatch(state, local)
+        flagged = state.get("requires_human_review") or mismatch is not None
+        item.status = "review" if flagged else "complete"
+        item.total_pay = state.get("total_pay")
+        item.error = mismatch
+        item.completed_at = datetime.utcnow()
+    elif item.attempts >= max_attempts:
+        item.status = "review"
+        item.error = error
+        item.completed_at = datetime.utcnow()
+    else:
+        item.status = "failed"
+        item.error = error
+
+
+def _claim_chunk(
+    session: Session, pay_period_id: uuid.UUID, chunk_size: int
+) -> List[PayPeriodCloseItem]:
+    """Lock the next unfinished crew members, skipping ones another worker holds."""
+    return (
+        session.execute(
+            select(PayPeriodCloseItem)
+            .where(
+                PayPeriodCloseItem.pay_period_id == pay_period_id,
+                PayPeriodCloseItem.status.in_(OPEN_ITEM_STATUSES),
+            )
+            .order_by(PayPeriodCloseItem.employee_id)
+            .limit(chunk_size)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+
+
+def close_progress(session: Session, pay_period_id: uuid.UUID) -> Dict[str, int]:
+    """Close item counts by status."""
+    rows = session.execute(
+        select(PayPeriodCloseItem.status, func.count())
+        .where(PayPeriodCloseItem.pay_period_id == pay_period_id)
+        .group_by(PayPeriodCloseItem.status)
+    ).all()
+    return {status: count for status, count in rows}
+
+
+def close_pay_period(
+    session: Session,
+    pay_period_id: uuid.UUID,
+    chunk_size: Optional[int] = None,
+    max_attempts: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Close (or resume closing) a pay period.
+
+    Args:
+        session: Database session (committed per chunk)
+        pay_period_id: Pay period to close
+        chunk_size: Crew members per checkpoint (default: settings)
+        max_attempts: Runs before a failing crew member goes to review
+            (default: settings)
+        max_in_flight: Concurrent orchestrator runs (default: settings)
+
+    Returns:
+        Dictionary with the period status and close item counts
+
+    Raises:
+        ValueError: If the pay period does not exist
+    """
+    chunk_size = chunk_size or settings.close_chunk_size
+    max_attempts = max_attempts or settings.close_max_attempts
+
+    period = session.get(PayPeriod, pay_period_id, with_for_update=True)
+    if period is None:
+        raise ValueError(f"Pay period {pay_period_id} not found")
+
+    if period.status == "open":
+        try:
+            crew_count = snapshot_period(session, period)
+            period.status = "closing"
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        logger.info(
+            f"Pay period {period.period_start} - {period.period_end}: "
+            f"snapshotted {crew_count} crew members"
+        )
+    else:
+        session.commit()
+
+    if period.status == "closing":
+        _process_items(
+            session,
+            period,
+            chunk_size,
+            max_attempts,
+            max_in_flight or settings.bulk_max_in_flight,
+        )
+        _finalize(session, period)
+
+    return {
+        "pay_period_id": str(period.id),
+        "status": period.status,
+        "items": close_progress(session, period.id),
+    }
+
+
+def _process_items(
+    session: Session, period: PayPeriod, chunk_size: int, max_attempts: int, max_in_flight: int
+) -> None:
+    start, end = period.period_start, period.period_end
+    done = 0
+    # Before the thread pool starts, so worker processes fork from one thread
+    local: Dict[str, Dict[str, Any]] = {}
+    if settings.close_shard_workers:
+        local = local_totals(
+            session, period.id, settings.close_shard_workers, settings.close_shard_key
+        )
+    # Crew members on the same trips share crew-neutral agent calls
+    coalescer = Coalescer() if settings.bulk_coalesce_shared_legs else None
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        while True:
+            items = _claim_chunk(session, period.id, chunk_size)
+            if not items:
+                session.commit()
+                break
+
+            results = list(
+                executor.map(
+                    lambda item: run_close_item(
+                        item.crew_snapshot, item.flights_snapshot, start, end, coalescer
+                    ),
+                    items,
+                )
+            )
+            states = []
+            for item, result in zip(items, results):
+                crew = item.crew_snapshot
+                crew_local = local.get(str(crew.get("id") or crew.get("employee_id")))
+                checkpoint_item(item, result, max_attempts, crew_local)
+                if result[2] is None:
+                    states.append(result[0])
+
+            # Pay rows and checkpoints commit together; a crash before this
+            # line reruns the whole chunk
+            persist_results(session, states)
+            done += len(items)
+            logger.info(f"Pay period {start} - {end}: checkpointed {done} crew members this run")
+
+
+def _finalize(session: Session, period: PayPeriod) -> None:
+    """Flip the period to closed once no crew member is left unfinished."""
+    try:
+        session.refresh(period, with_for_update=True)
+        remaining = session.execute(
+            select(func.count())
+            .select_from(PayPeriodCloseItem)
+            .where(
+                PayPeriodCloseItem.pay_period_id == period.id,
+                PayPeriodCloseItem.status.in_(OPEN_ITEM_STATUSES),
+            )
+        ).scalar_one()
+        if period.status == "closing" and remaining == 0:
+            period.status = "closed"
+            period.closed_at = datetime.utcnow()
+            logger.info(f"Pay period {period.period_start} - {period.period_end} closed")
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+
+if __name__ == "__main__":
+    import sys
+
+    from api.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        result = close_pay_period(session, uuid.UUID(sys.argv[1]))
+        logger.info(f"Pay period {result['pay_period_id']}: {result['status']} {result['items']}")
+    finally:
+        session.close()
@@ -0,0 +1,165 @@
+"""
+Execution Progress
+
+In-process broker for orchestrator progress events. Workflows publish from
+worker threads; SSE subscribers consume on the event loop. Each execution
+keeps its event history so late subscribers (or reconnects with
+Last-Event-ID) replay what they missed before receiving live events.
+"""
+
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from api.config import settings
+
+TERMINAL_EVENT = "execution_completed"
+
+
+class _Channel:
+    """Event history and live subscribers for one execution."""
+
+    __slots__ = ("events", "subscribers", "done")
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self.subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self.done = False
+
+
+class ProgressBroker:
+    """Fan progress events out to per-execution subscribers."""
+
+    def __init__(self, max_executions: int = 1000):
+        """
+        Initialize the broker.
+
+        Args:
+            max_executions: Finished executions kept for replay; the oldest
+                are evicted first
+        """
+        self.max_executions = max_executions
+        self._channels: "OrderedDict[str, _Channel]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _channel(self, execution_id: str) -> _Channel:
+        channel = self._channels.get(execution_id)
+        if channel is None:
+            channel = self._channels[execution_id] = _Channel()
+            self._evict()
+        return channel
+
+    def _evict(self) -> None:
+        finished = [eid for eid, c in self._channels.items() if c.done]
+        for execution_id in finished[: max(0, len(self._channels) - self.max_executions)]:
+            del self._channels[execution_id]
+
+    def register(self, execution_id: str) -> None:
+        """Create the channel up front so subscribers can attach before the run starts."""
+        with self._lock:
+            self._channel(execution_id)
+
+    def publish(self, execution_id: str, event: Dict[str, Any]) -> None:
+        """
+        Record an event and deliver it to live subscribers (thread-safe).
+
+        Args:
+            execution_id: Execution the event belongs to
+            event: Event payload with an "event" type field
+        """
+        with self._lock:
+            channel = self._channel(execution_id)
+            event = dict(event, execution_id=execution_id, seq=len(channel.events) + 1)
+            channel.events.append(event)
+            if event["event"] == TERMINAL_EVENT:
+                channel.done = True
+            subscribers = list(channel.subscribers)
+
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    def fail(self, execution_id: str, error: str) -> None:
+        """
+        End an execution's stream with an error, unless it already ended.
+
+        For failures the workflow never reported (e.g. loading the agent
+        stack), so subscribers are released and the channel can be evicted.
+        """
+        with self._lock:
+            if self._channel(execution_id).done:
+                return
+        self.publish(
+            execution_id,
+            {
+                "event": TERMINAL_EVENT,
+                "status": "error",
+                "error": error,
+                "total_pay": None,
+                "requires_human_review": True,
+                "at": datetime.now().isoformat(),
+            },
+        )
+
+    def exists(self, execution_id: str) -> bool:
+        """Whether the broker knows about this execution."""
+        with self._lock:
+            return execution_id in self._channels
+
+    async def subscribe(
+        self, execution_id: str, last_event_id: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Replay recorded events, then yield live ones until the run completes.
+
+        Args:
+            execution_id: Execution to follow
+            last_event_id: Skip events up to and including this sequence number
+
+        Yields:
+            Progress events in publish order
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            channel = self._channel(execution_id)
+            history = list(channel.events)
+            done = channel.done
+            if not done:
+                channel.subscribers.append(subscriber)
+
+        try:
+            seen = last_event_id or 0
+            for event in history:
+                if event["seq"] > seen:
+                    seen = event["seq"]
+                    yield event
+            if done:
+                return
+
+            while True:
+                event = await queue.get()
+                if event["seq"] <= seen:
+                    continue
+                seen = event["seq"]
+                yield event
+                if event["event"] == TERMINAL_EVENT:
+                    return
+        finally:
+            with self._lock:
+                if subscriber in channel.subscribers:
+                    channel.subscribers.remove(subscriber)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Encode one event as a Server-Sent Events message."""
+    return (
+        f"id: {event['seq']}\n"
+        f"event: {event['event']}\n"
+        f"data: {json.dumps(event, default=str)}\n\n"
+    )
+
+
+progress_broker = ProgressBroker(settings.progress_history_size)
@@ -0,0 +1,327 @@
+"""
+Incremental Recompute
+
+Applies ACARS actual-time updates to flight legs and recomputes only the
+affected crew members' pay period. Updates are published to a local queue
+(a stand-in for a message broker); the consumer writes each update to
+flight_assignments, marks every crew member on the leg dirty for the leg's
+pay period, and recomputes a dirty (crew member, pay period) once updates
+for it have been quiet for the debounce window. A burst of OUT/OFF/ON/IN
+messages for the same trip therefore costs one orchestrator run per crew
+member instead of one per message.
+"""
+
+import asyncio
+import calendar
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from api.config import settings
+from api.database import SessionLocal
+from api.models import FlightAssignment, PayPeriod
+from api.services.bulk_calculations import get_orchestrator
+from api.services.pay_persistence import persist_results
+from api.services.roster import iter_roster
+
+logger = logging.getLogger(__name__)
+
+# (crew_member_id, pay_period_start, pay_period_end)
+RecomputeKey = Tuple[uuid.UUID, date, date]
+
+
+@dataclass(frozen=True)
+class LegTimeUpdate:
+    """Actual times reported for one flight leg."""
+
+    flight_number: str
+    flight_date: date
+    origin_airport: str
+    actual_departure: Optional[datetime] = None
+    actual_arrival: Optional[datetime] = None
+
+
+def pay_period_for(session: Session, day: date) -> Tuple[date, date]:
+    """
+    Pay period containing a date.
+
+    Uses the pay_periods table, falling back to semi-monthly periods
+    (1st-15th, 16th-end of month) when no period is defined.
+    """
+    period = session.execute(
+        select(PayPeriod.period_start, PayPeriod.period_end)
+        .where(PayPeriod.period_start <= day, PayPeriod.period_end >= day)
+        .order_by(PayPeriod.period_start.desc())
+        .limit(1)
+    ).first()
+    if period is not None:
+        return period.period_start, period.period_end
+    if day.day <= 15:
+        return day.replace(day=1), day.replace(day=15)
+    return day.replace(day=16), day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def apply_leg_update(session: Session, event: LegTimeUpdate) -> List[RecomputeKey]:
+    """
+    Write actual times to every crew member's row for a leg.
+
+    Args:
+        session: Database session (committed on success)
+        event: Leg time update
+
+    Returns:
+        (crew_member_id, period start, period end) for each crew member on
+        the leg; empty if the leg is unknown
+    """
+    values: Dict[str, Any] = {"updated_at": func.now()}
+    if event.actual_departure is not None:
+        values["actual_departure"] = event.actual_departure
+    if event.actual_arrival is not None:
+        values["actual_arrival"] = event.actual_arrival
+    # OUT and IN arrive as separate messages, so a stored block time would
+    # go stale; cleared, it is derived from the actual times (FlightRecord)
+    values["actual_block_time"] = None
+
+    try:
+        crew_member_ids = session.execute(
+            update(FlightAssignment)
+            .where(
+                # flight_date first so the update prunes to one partition
+                FlightAssignment.flight_date == event.flight_date,
+                FlightAssignment.flight_number == event.flight_number,
+                FlightAssignment.origin_airport == event.origin_airport,
+            )
+            .values(**values)
+            .returning(FlightAssignment.crew_member_id)
+        ).scalars().all()
+        period_start, period_end = pay_period_for(session, event.flight_date)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    if not crew_member_ids:
+        logger.warning(
+            f"No flight assignments for {event.flight_number} "
+            f"{event.flight_date} from {event.origin_airport}"
+        )
+    return [(crew_member_id, period_start, period_end) for crew_member_id in set(crew_member_ids)]
+
+
+def recompute_crew_period(
+    session: Session, crew_member_id: uuid.UUID, pay_period_start: date, pay_period_end: date
+) -> Optional[Dict[str, Any]]:
+    """
+    Recalculate and persist one crew member's pay period.
+
+    Updates the pay_calculations line items and the crew_pay_summaries row
+    (period totals and compliance state). A period that is closing, closed
+    or paid is left as the close computed it.
+
+    Returns:
+        Final orchestrator state, or None if the crew member is not active
+        or the pay period is no longer open
+    """
+    period_status = session.execute(
+        select(PayPeriod.status).where(
+            PayPeriod.period_start == pay_period_start, PayPeriod.period_end == pay_period_end
+        )
+    ).scalar()
+    if period_status not in (None, "open"):
+        logger.warning(
+            f"Not recomputing crew member {crew_member_id}: pay period "
+            f"{pay_period_start} - {pay_period_end} is {period_status}; "
+            f"late actual times need review"
+        )
+        return None
+
+    entry = next(
+        iter_roster(session, pay_period_start, pay_period_end, crew_member_ids=[crew_member_id]),
+        None,
+    )
+    if entry is None:
+        return None
+
+    crew_member, flights = entry
+    state = get_orchestrator().process(
+        crew_member_data=crew_member,
+        flight_assignments=flights,
+        pay_period_start=pay_period_start.isoformat(),
+        pay_period_end=pay_period_end.isoformat(),
+    )
+    persist_results(session, [state])
+    return state
+
+
+def _apply_in_session(event: LegTimeUpdate) -> List[RecomputeKey]:
+    session = SessionLocal()
+    try:
+        return apply_leg_update(session, event)
+    finally:
+        session.close()
+
+
+def _recompute_in_session(key: RecomputeKey) -> Optional[Dict[str, Any]]:
+    session = SessionLocal()
+    try:
+        return recompute_crew_period(session, *key)
+    finally:
+        session.close()
+
+
+class RecomputeQueue:
+    """
+    Local change-event queue with a coalescing consumer.
+
+    apply_update and recompute are blocking callables run in the default
+    executor; they are injectable so the queue can be exercised without a
+    database.
+    """
+
+    def __init__(
+        self,
+        apply_update: Callable[[LegTimeUpdate], List[RecomputeKey]] = _apply_in_session,
+        recompute: Callable[[RecomputeKey], Any] = _recompute_in_session,
+        debounce_seconds: float = settings.recompute_debounce_seconds,
+        max_delay_seconds: float = settings.recompute_max_delay_seconds,
+        max_concurrency: int = settings.recompute_max_concurrency,
+        max_size: int = settings.recompute_queue_size,
+    ):
+        self.apply_update = apply_update
+        self.recompute = recompute
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.max_concurrency = max_concurrency
+        self.max_size = max_size
+
+        self._events: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        # key -> [first change, last change] (loop time)
+        self._dirty: Dict[RecomputeKey, List[float]] = {}
+        self._running: Set[RecomputeKey] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._recomputes: Set[asyncio.Task] = set()
+        self.stats = {"events": 0, "failed_events": 0, "recomputes": 0, "failed_recomputes": 0}
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def depth(self) -> int:
+        """Events waiting to be applied plus crew periods waiting to recompute."""
+        pending = self._events.qsize() if self._events is not None else 0
+        return pending + len(self._dirty)
+
+    @property
+    def in_progress(self) -> int:
+        """Crew periods being recomputed right now."""
+        return len(self._running)
+
+    async def start(self) -> None:
+        """Start the consumer and scheduler on the running loop."""
+        if self.started:
+            return
+        self._events = asyncio.Queue(maxsize=self.max_size)
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._consume()),
+            asyncio.create_task(self._schedule()),
+        ]
+
+    async def stop(self) -> None:
+        """Stop consuming; in-flight recomputes are allowed to finish."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._recomputes:
+            await asyncio.gather(*self._recomputes, return_exceptions=True)
+
+    def publish(self, event: LegTimeUpdate) -> None:
+        """
+        Enqueue a leg update.
+
+        Raises:
+            RuntimeError: If the consumer is not running
+            asyncio.QueueFull: If the queue is at capacity
+        """
+        if not self.started:
+            raise RuntimeError("Recompute queue is not running")
+        self._events.put_nowait(event)
+
+    def mark_dirty(self, key: RecomputeKey) -> None:
+        """Schedule a crew period for recompute, extending its debounce window."""
+        now = asyncio.get_running_loop().time()
+        window = self._dirty.get(key)
+        if window is None:
+            self._dirty[key] = [now, now]
+        else:
+            window[1] = now
+        self._wakeup.set()
+
+    async def _consume(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            event = await self._events.get()
+            self.stats["events"] += 1
+            try:
+                keys = await loop.run_in_executor(None, self.apply_update, event)
+            except Exception as e:
+                self.stats["failed_events"] += 1
+                logger.error(f"Failed to apply update for {event.flight_number} {event.flight_date}: {e}")
+                continue
+            for key in keys:
+                self.mark_dirty(key)
+
+    def _due(self, now: float) -> Tuple[List[RecomputeKey], Optional[float]]:
+        """Keys ready to recompute, and seconds until the next one is."""
+        due = []
+        next_wait = None
+        for key, (first, last) in self._dirty.items():
+            if key in self._running:
+                continue
+            ready_at = min(last + self.debounce_seconds, first + self.max_delay_seconds)
+            if ready_at <= now:
+                due.append(key)
+            else:
+                wait = ready_at - now
+                next_wait = wait if next_wait is None else min(next_wait, wait)
+        return due, next_wait
+
+    async def _schedule(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            due, next_wait = self._due(loop.time())
+            for key in due[: self.max_concurrency - len(self._running)]:
+                del self._dirty[key]
+                self._running.add(key)
+                task = asyncio.create_task(self._run(key))
+                self._recomputes.add(task)
+                task.add_done_callback(self._recomputes.discard)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=next_wait)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, key: RecomputeKey) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self.recompute, key)
+            self.stats["recomputes"] += 1
+        except Exception as e:
+            self.stats["failed_recomputes"] += 1
+            logger.error(f"Recompute failed for crew member {key[0]} ({key[1]} - {key[2]}): {e}")
+        finally:
+            self._running.discard(key)
+            # Updates that arrived mid-recompute are still dirty; re-evaluate
+            self._wakeup.set()
+
+
+recompute_queue = RecomputeQueue()
@@ -0,0 +1,147 @@
+"""
+Roster Loading
+
+Streams crew members and their flights for a pay period from the database
+without materialising the whole roster.
+"""
+
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from agents.flight_record import FlightRecord
+from api.models import CrewMember, FlightAssignment
+
+# Rows fetched per round trip when streaming the roster
+ROSTER_FETCH_SIZE = 1000
+
+
+def crew_member_to_dict(crew_member: CrewMember) -> Dict[str, Any]:
+    """Convert a CrewMember row into the crew_member_data shape."""
+    return {
+        "id": str(crew_member.id),
+        "employee_id": crew_member.employee_id,
+        "first_name": crew_member.first_name,
+        "last_name": crew_member.last_name,
+        "email": crew_member.email,
+        "role": crew_member.role,
+        "crew_type": crew_member.crew_type,
+        "hourly_rate": float(crew_member.hourly_rate),
+        "monthly_guarantee": (
+            float(crew_member.monthly_guarantee)
+            if crew_member.monthly_guarantee is not None
+            else None
+        ),
+        "base_airport": crew_member.base_airport,
+    }
+
+
+def _crew_filters(
+    employee_ids: Optional[List[str]],
+    base_airport: Optional[str],
+    role: Optional[str],
+    crew_type: Optional[str],
+    crew_member_ids: Optional[List[Any]] = None,
+) -> List[Any]:
+    """Build WHERE clauses for a crew filter."""
+    filters = [CrewMember.status == "active"]
+    if employee_ids:
+        filters.append(CrewMember.employee_id.in_(employee_ids))
+    if crew_member_ids:
+        filters.append(CrewMember.id.in_(crew_member_ids))
+    if base_airport:
+        filters.append(CrewMember.base_airport == base_airport)
+    if role:
+        filters.append(CrewMember.role == role)
+    if crew_type:
+        filters.append(CrewMember.crew_type == crew_type)
+    return filters
+
+
+def iter_roster(
+    session: Session,
+    pay_period_start: date,
+    pay_period_end: date,
+    employee_ids: Optional[List[str]] = None,
+    base_airport: Optional[str] = None,
+    role: Optional[str] = None,
+    crew_type: Optional[str] = None,
+    crew_member_ids: Optional[List[Any]] = None,
+) -> Iterator[Tuple[Dict[str, Any], Tuple[FlightRecord, ...]]]:
+    """
+    Stream (crew_member_data, flight_records) pairs for a pay period.
+
+    Crew members and flights are read as two server-side streams ordered by
+    crew member ID and merge-joined, so memory stays flat regardless of
+    roster size. The flight query is bounded on flight_date, so only the
+    period's monthly partitions are scanned, and its ordering follows the
+    (crew_member_id, flight_date) index.
+
+    Args:
+        session: Database session
+        pay_period_start: Start date
+        pay_period_end: End date
+        employee_ids: Restrict to these employee IDs (optional)
+        base_airport: Restrict to one base (optional)
+        role: Restrict to one role (optional)
+        crew_type: Restrict to line_holder or reserve (optional)
+        crew_member_ids: Restrict to these crew member UUIDs (optional)
+
+    Yields:
+        Crew member profile and that crew member's flights for the period
+    """
+    filters = _crew_filters(employee_ids, base_airport, role, crew_type, crew_member_ids)
+
+    crew_rows = session.execute(
+        select(CrewMember)
+        .where(*filters)
+        .order_by(CrewMember.id)
+        .execution_options(yield_per=ROSTER_FETCH_SIZE)
+    ).scalars()
+
+    flight_rows = session.execute(
+        select(FlightAssignment)
+        .join(CrewMember, FlightAssignment.crew_member_id == CrewMember.id)
+        .where(*filters, FlightAssignment.in_period(pay_period_start, pay_period_end))
+        .order_by(
+            FlightAssignment.crew_member_id,
+            FlightAssignment.flight_date,
+            FlightAssignment.scheduled_departure,
+        )
+        .execution_options(yield_per=ROSTER_FETCH_SIZE)
+    ).scalars()
+
+    pending = next(flight_rows, None)
+    for crew_member in crew_rows:
+        flights = []
+        while pending is not None and pending.crew_member_id == crew_member.id:
+            flights.append(FlightRecord.from_model(pending))
+            pending = next(flight_rows, None)
+        yield crew_member_to_dict(crew_member), tuple(flights)
+
+
+def get_roster_entry(
+    session: Session,
+    employee_id: str,
+    pay_period_start: date,
+    pay_period_end: date,
+) -> Optional[Tuple[Dict[str, Any], Tuple[FlightRecord, ...]]]:
+    """
+    Load one crew member and their flights for a pay period.
+
+    Args:
+        session: Database session
+        employee_id: Employee ID (e.g., "P12345")
+        pay_period_start: Start date
+        pay_period_end: End date
+
+    Returns:
+        (crew_member_data, flight_records), or None if no active crew member
+        has that employee ID
+    """
+    return next(
+        iter_roster(session, pay_period_start, pay_period_end, employee_ids=[employee_id]),
+        None,
+    )
@@ -1,25 +1,51 @@
 """
 Crew Pay Calculations API Endpoints
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import date
-from typing import Optional
-import sys
-import os
+from typing import List, Optional
+import asyncio
+import logging
+import uuid
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from api.config import settings
+from api.database import SessionLocal
+from api.services.bulk_calculations import (
+    get_checkpointing_orchestrator,
+    stream_bulk_results,
+    summarize_result,
+)
+from api.services.pay_persistence import persist_results, save_line_items
+from api.services.progress import format_sse, progress_broker
+from api.services.roster import get_roster_entry, iter_roster
 
-from agents.orchestrator import run_crew_pay_workflow
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/calculations", tags=["calculations"])
 
+# Keeps background calculations referenced until they finish
+_running_calculations = set()
+
 class PayCalculationRequest(BaseModel):
     crew_member_id: str
     pay_period_start: date
     pay_period_end: date
 
+class BulkCalculationRequest(BaseModel):
+    pay_period_start: date
+    pay_period_end: date
+    employee_ids: Optional[List[str]] = None
+    base_airport: Optional[str] = None
+    role: Optional[str] = None
+    crew_type: Optional[str] = None
+    persist: bool = True
+
+class CalculationStartedResponse(BaseModel):
+    execution_id: str
+    events_url: str
+
 class PayCalculationResponse(BaseModel):
     status: str
     total_pay: float
@@ -42,6 +68,9 @@ async def calculate_crew_pay(request: PayCalculationRequest):
     }
 ```
     """
+    # Imported on first use so the agent stack stays out of API startup
+    from agents.orchestrator import run_crew_pay_workflow
+
     try:
         # Run the orchestrator
         result = run_crew_pay_workflow(
@@ -62,6 +91,169 @@ async def calculate_crew_pay(request: PayCalculationRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/bulk")
+async def calculate_bulk_pay(request: BulkCalculationRequest):
+    """
+    Calculate pay for every matching crew member, streamed as NDJSON
+
+    Each line is one crew member's result, emitted as soon as that crew
+    member completes (completion order, not roster order). The final line
+    is a {"summary": {...}} record with counts. Unless "persist" is false,
+    completed results are upserted into pay_calculations in batches.
+
+    Example:
+```json
+    {
+        "pay_period_start": "2025-11-01",
+        "pay_period_end": "2025-11-15",
+        "base_airport": "ORD"
+    }
+```
+    """
+    if request.pay_period_end < request.pay_period_start:
+        raise HTTPException(status_code=400, detail="pay_period_end is before pay_period_start")
+
+    async def body():
+        # The session lives inside the generator: it must stay open until
+        # the last line has been streamed.
+        session = SessionLocal()
+        try:
+            roster = iter_roster(
+                session,
+                request.pay_period_start,
+                request.pay_period_end,
+                employee_ids=request.employee_ids,
+                base_airport=request.base_airport,
+                role=request.role,
+                crew_type=request.crew_type,
+            )
+            async for line in stream_bulk_results(
+                roster,
+                request.pay_period_start.isoformat(),
+                request.pay_period_end.isoformat(),
+                settings.bulk_max_in_flight,
+                persist=save_line_items if request.persist else None,
+                persist_batch_size=settings.bulk_persist_batch_size,
+            ):
+                yield line
+        finally:
+            session.close()
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+def _load_roster_entry(request: PayCalculationRequest):
+    session = SessionLocal()
+    try:
+        return get_roster_entry(
+            session,
+            request.crew_member_id,
+            request.pay_period_start,
+            request.pay_period_end,
+        )
+    finally:
+        session.close()
+
+@router.post("/start", response_model=CalculationStartedResponse, status_code=202)
+async def start_calculation(request: PayCalculationRequest):
+    """
+    Start a pay calculation in the background
+
+    Returns the execution ID immediately; follow progress on
+    GET /calculations/{execution_id}/events.
+    """
+    loop = asyncio.get_running_loop()
+    entry = await loop.run_in_executor(None, _load_roster_entry, request)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Crew member not found")
+
+    crew_member, flights = entry
+    execution_id = str(uuid.uuid4())
+    progress_broker.register(execution_id)
+
+    def run():
+        try:
+            state = get_checkpointing_orchestrator().process(
+                crew_member_data=crew_member,
+                flight_assignments=flights,
+                pay_period_start=request.pay_period_start.isoformat(),
+                pay_period_end=request.pay_period_end.isoformat(),
+                execution_id=execution_id,
+                on_progress=progress_broker.publish,
+            )
+            session = SessionLocal()
+            try:
+                persist_results(session, [state])
+            finally:
+                session.close()
+        except Exception as e:
+            logger.error(f"Calculation {execution_id} failed: {str(e)}")
+            progress_broker.fail(execution_id, str(e))
+
+    task = loop.run_in_executor(None, run)
+    _running_calculations.add(task)
+    task.add_done_callback(_running_calculations.discard)
+
+    return CalculationStartedResponse(
+        execution_id=execution_id,
+        events_url=f"/api/v1/calculations/{execution_id}/events",
+    )
+
+@router.post("/{execution_id}/resume")
+async def resume_calculation(execution_id: str):
+    """
+    Retry a failed calculation from the node that failed
+
+    Earlier nodes' outputs are restored from the execution's checkpoints
+    rather than recomputed. A completed result is persisted as for /start.
+    """
+    def persist(state):
+        session = SessionLocal()
+        try:
+            persist_results(session, [state])
+        finally:
+            session.close()
+
+    loop = asyncio.get_running_loop()
+    try:
+        state = await loop.run_in_executor(
+            None, lambda: get_checkpointing_orchestrator().resume(execution_id)
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail="No checkpoints for execution")
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    await loop.run_in_executor(None, persist, state)
+
+    return summarize_result(state)
+
+@router.get("/{execution_id}/events")
+async def stream_calculation_events(
+    execution_id: str,
+    last_event_id: Optional[int] = Header(None),
+):
+    """
+    Server-Sent Events stream of a calculation's progress
+
+    Emits execution_started, node_started / node_completed for each
+    workflow node (completed events carry the node's partial result and
+    duration_ms), then execution_completed. With streaming Claude calls
+    (CLAUDE_STREAM), node_field events carry each top-level response field
+    as soon as it is generated. Reconnecting clients send Last-Event-ID to
+    resume without duplicates.
+    """
+    if not progress_broker.exists(execution_id):
+        raise HTTPException(status_code=404, detail="Execution not found")
+
+    async def body():
+        async for event in progress_broker.subscribe(execution_id, last_event_id):
+            yield format_sse(event)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/status/{execution_id}")
 async def get_calculation_status(execution_id: str):
     """Get status of a pay calculation"""
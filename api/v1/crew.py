@@ -1,7 +1,14 @@
 """
 Crew Member API Endpoints
 """
-from fastapi import APIRouter
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from api.database import get_db
+from api.schemas import CrewPayHistoryResponse, CrewPaySummaryResponse
+from api.services.pay_summary import find_crew_member, get_pay_summaries
 
 router = APIRouter(prefix="/crew", tags=["crew"])
 
@@ -17,14 +24,51 @@ async def list_crew():
         ]
     }
 
-@router.get("/{crew_member_id}")
-async def get_crew_member(crew_member_id: str):
-    """Get specific crew member details"""
-    return {
-        "id": crew_member_id,
-        "name": "Sarah Chen",
-        "role": "Captain",
-        "base": "BUR",
-        "hourly_rate": 140.00,
-        "monthly_guarantee": 70.0
-    }
+@router.get("/{crew_member_id}", response_model=CrewPayHistoryResponse)
+def get_crew_member(
+    crew_member_id: str,
+    history: int = Query(6, ge=0, le=36),
+    db: Session = Depends(get_db),
+):
+    """
+    Get crew member details with recent pay periods
+
+    Pay figures come from the precomputed crew_pay_summaries table (one
+    indexed lookup), never from aggregating pay_calculations.
+    """
+    crew_member = find_crew_member(db, crew_member_id)
+    if crew_member is None:
+        raise HTTPException(status_code=404, detail="Crew member not found")
+
+    summaries = [
+        CrewPaySummaryResponse.model_validate(summary)
+        for summary in get_pay_summaries(db, crew_member.id, limit=max(history, 1))
+    ]
+
+    return CrewPayHistoryResponse(
+        id=str(crew_member.id),
+        employee_id=crew_member.employee_id,
+        name=f"{crew_member.first_name} {crew_member.last_name}",
+        role=crew_member.role,
+        base=crew_member.base_airport,
+        hourly_rate=float(crew_member.hourly_rate),
+        monthly_guarantee=(
+            float(crew_member.monthly_guarantee)
+            if crew_member.monthly_guarantee is not None
+            else None
+        ),
+        current_period=summaries[0] if summaries else None,
+        pay_history=summaries[:history],
+    )
+
+@router.get("/{crew_member_id}/pay-history", response_model=List[CrewPaySummaryResponse])
+def get_pay_history(
+    crew_member_id: str,
+    limit: int = Query(12, ge=1, le=120),
+    db: Session = Depends(get_db),
+):
+    """Pay period summaries for a crew member, newest first"""
+    crew_member = find_crew_member(db, crew_member_id)
+    if crew_member is None:
+        raise HTTPException(status_code=404, detail="Crew member not found")
+    return get_pay_summaries(db, crew_member.id, limit=limit)
@@ -0,0 +1,69 @@
+"""
+Flight Leg Update API Endpoints
+"""
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from typing import List, Optional
+import asyncio
+
+from api.services.recompute import LegTimeUpdate, recompute_queue
+
+router = APIRouter(prefix="/flights", tags=["flights"])
+
+
+class LegActualsRequest(BaseModel):
+    flight_number: str
+    flight_date: date
+    origin_airport: str = Field(min_length=3, max_length=3)
+    actual_departure: Optional[datetime] = None
+    actual_arrival: Optional[datetime] = None
+
+
+class LegActualsResponse(BaseModel):
+    accepted: int
+    queue_depth: int
+
+
+@router.post("/actuals", response_model=LegActualsResponse, status_code=202)
+async def publish_leg_actuals(updates: List[LegActualsRequest]):
+    """
+    Publish ACARS actual departure/arrival times for one or more legs.
+
+    Each update is queued; the consumer writes it to flight_assignments and
+    recomputes the pay period of every crew member on the leg, coalescing
+    bursts of updates for the same crew member into one recompute.
+    """
+    for item in updates:
+        if item.actual_departure is None and item.actual_arrival is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{item.flight_number} {item.flight_date}: no actual times given",
+            )
+        if (
+            item.actual_departure is not None
+            and item.actual_arrival is not None
+            and item.actual_arrival <= item.actual_departure
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=f"{item.flight_number} {item.flight_date}: arrival before departure",
+            )
+
+    try:
+        for item in updates:
+            recompute_queue.publish(
+                LegTimeUpdate(
+                    flight_number=item.flight_number,
+                    flight_date=item.flight_date,
+                    origin_airport=item.origin_airport.upper(),
+                    actual_departure=item.actual_departure,
+                    actual_arrival=item.actual_arrival,
+                )
+            )
+    except RuntimeError:
+        raise HTTPException(status_code=503, detail="Recompute queue is not running")
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Recompute queue is full, retry later")
+
+    return LegActualsResponse(accepted=len(updates), queue_depth=recompute_queue.depth)
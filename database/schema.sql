@@ -8,6 +8,8 @@ CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 DROP TABLE IF EXISTS agent_execution_log CASCADE;
 DROP TABLE IF EXISTS faa_compliance_log CASCADE;
 DROP TABLE IF EXISTS claims CASCADE;
+DROP TABLE IF EXISTS pay_period_close_items CASCADE;
+DROP TABLE IF EXISTS crew_pay_summaries CASCADE;
 DROP TABLE IF EXISTS pay_calculations CASCADE;
 DROP TABLE IF EXISTS flight_assignments CASCADE;
 DROP TABLE IF EXISTS crew_members CASCADE;
@@ -44,9 +46,26 @@ CREATE INDEX idx_crew_employee_id ON crew_members(employee_id);
 CREATE INDEX idx_crew_base ON crew_members(base_airport);
 CREATE INDEX idx_crew_role ON crew_members(role);
 
--- Flight Assignments Table
+-- Monthly range partitions: <parent>_yYYYYmMM covering [month, month + 1)
+CREATE OR REPLACE FUNCTION create_monthly_partition(parent TEXT, month DATE)
+RETURNS TEXT AS $$
+DECLARE
+    month_start DATE := date_trunc('month', month)::DATE;
+    partition_name TEXT := format('%s_y%sm%s', parent,
+        to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, parent, month_start, (month_start + INTERVAL '1 month')::DATE
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Flight Assignments Table (partitioned by month of flight_date; the
+-- partition key must be part of the primary key)
 CREATE TABLE flight_assignments (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     crew_member_id UUID REFERENCES crew_members(id) ON DELETE CASCADE,
     flight_number VARCHAR(20) NOT NULL,
     flight_date DATE NOT NULL,
@@ -70,11 +89,17 @@ CREATE TABLE flight_assignments (
     trip_id VARCHAR(50),  -- groups multi-day pairings
     sequence_number INTEGER,  -- order in trip
     created_at TIMESTAMP DEFAULT NOW(),
-    updated_at TIMESTAMP DEFAULT NOW()
-);
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (id, flight_date)
+) PARTITION BY RANGE (flight_date);
 
-CREATE INDEX idx_flight_crew ON flight_assignments(crew_member_id);
-CREATE INDEX idx_flight_date ON flight_assignments(flight_date);
+-- Period loads filter on (crew_member_id, flight_date); flight_date alone is
+-- served by partition pruning
+CREATE INDEX idx_flight_crew_date ON flight_assignments(crew_member_id, flight_date);
+-- Natural key of a leg, used by the importer's upsert
+CREATE UNIQUE INDEX uq_flight_leg ON flight_assignments(
+    crew_member_id, flight_date, flight_number, origin_airport, destination_airport
+);
 CREATE INDEX idx_flight_number ON flight_assignments(flight_number);
 CREATE INDEX idx_trip_id ON flight_assignments(trip_id);
 
@@ -84,7 +109,7 @@ CREATE TABLE pay_calculations (
     crew_member_id UUID REFERENCES crew_members(id) ON DELETE CASCADE,
     pay_period_start DATE NOT NULL,
     pay_period_end DATE NOT NULL,
-    flight_assignment_id UUID REFERENCES flight_assignments(id) ON DELETE SET NULL,
+    flight_assignment_id UUID,  -- flight_assignments.id (no FK: that table is partitioned)
     calculation_type VARCHAR(50) NOT NULL,  -- flight_pay, per_diem, premium, guarantee
     base_hours DECIMAL(10,4),
     credit_hours DECIMAL(10,4),
@@ -105,13 +130,42 @@ CREATE TABLE pay_calculations (
 CREATE INDEX idx_pay_crew ON pay_calculations(crew_member_id);
 CREATE INDEX idx_pay_period ON pay_calculations(pay_period_start, pay_period_end);
 CREATE INDEX idx_pay_type ON pay_calculations(calculation_type);
+-- One line item per (crew, period, type, flight); aggregate rows have no flight
+CREATE UNIQUE INDEX uq_pay_line_item ON pay_calculations(
+    crew_member_id, pay_period_start, pay_period_end, calculation_type,
+    COALESCE(flight_assignment_id, '00000000-0000-0000-0000-000000000000'::uuid)
+);
+
+-- Crew Pay Summaries Table (one row per crew member and pay period,
+-- rewritten whenever that period's pay_calculations are persisted)
+CREATE TABLE crew_pay_summaries (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    crew_member_id UUID NOT NULL REFERENCES crew_members(id) ON DELETE CASCADE,
+    pay_period_start DATE NOT NULL,
+    pay_period_end DATE NOT NULL,
+    credit_hours DECIMAL(10,4) NOT NULL DEFAULT 0,
+    flight_pay DECIMAL(10,2) NOT NULL DEFAULT 0,
+    per_diem DECIMAL(10,2) NOT NULL DEFAULT 0,
+    premium_pay DECIMAL(10,2) NOT NULL DEFAULT 0,
+    guarantee_pay DECIMAL(10,2) NOT NULL DEFAULT 0,  -- top-up over flight pay
+    total_pay DECIMAL(10,2) NOT NULL DEFAULT 0,
+    line_items INTEGER NOT NULL DEFAULT 0,
+    compliance_status VARCHAR(20),  -- pass, warning, fail
+    confidence_score DECIMAL(5,4),
+    requires_review BOOLEAN DEFAULT FALSE,
+    execution_id VARCHAR(64),
+    calculated_at TIMESTAMP DEFAULT NOW(),
+    CONSTRAINT unique_crew_period UNIQUE (crew_member_id, pay_period_start, pay_period_end)
+);
+
+CREATE INDEX idx_summary_crew_period ON crew_pay_summaries(crew_member_id, pay_period_start DESC);
 
 -- Claims Table
 CREATE TABLE claims (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     claim_number VARCHAR(50) UNIQUE NOT NULL,
     crew_member_id UUID REFERENCES crew_members(id) ON DELETE CASCADE,
-    flight_assignment_id UUID REFERENCES flight_assignments(id) ON DELETE SET NULL,
+    flight_assignment_id UUID,  -- flight_assignments.id (no FK: that table is partitioned)
     claim_type VARCHAR(50) NOT NULL,
     description TEXT NOT NULL,
     amount_claimed DECIMAL(10,2),
@@ -140,9 +194,10 @@ CREATE INDEX idx_claim_crew ON claims(crew_member_id);
 CREATE INDEX idx_claim_status ON claims(status);
 CREATE INDEX idx_claim_number ON claims(claim_number);
 
--- Agent Execution Log Table
+-- Agent Execution Log Table (partitioned by month of created_at; old
+-- partitions are detached and archived or dropped by the retention job)
 CREATE TABLE agent_execution_log (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     agent_name VARCHAR(100) NOT NULL,
     execution_id UUID NOT NULL,  -- groups related agent calls
     crew_member_id UUID REFERENCES crew_members(id) ON DELETE SET NULL,
@@ -151,18 +206,27 @@ CREATE TABLE agent_execution_log (
     execution_time_ms INTEGER,
     success BOOLEAN DEFAULT TRUE,
     error_message TEXT,
-    created_at TIMESTAMP DEFAULT NOW()
-);
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
 
-CREATE INDEX idx_agent_name ON agent_execution_log(agent_name);
+CREATE INDEX idx_agent_name_created ON agent_execution_log(agent_name, created_at);
 CREATE INDEX idx_execution_id ON agent_execution_log(execution_id);
-CREATE INDEX idx_agent_created ON agent_execution_log(created_at);
+CREATE INDEX idx_agent_crew_created ON agent_execution_log(crew_member_id, created_at);
+
+-- Initial partitions from January 2025 through three months ahead; the
+-- maintenance job (python -m api.services.partitions) keeps them rolling
+SELECT create_monthly_partition('flight_assignments', month::DATE),
+       create_monthly_partition('agent_execution_log', month::DATE)
+FROM generate_series(
+    DATE '2025-01-01', date_trunc('month', NOW()) + INTERVAL '3 months', INTERVAL '1 month'
+) AS month;
 
 -- FAA Compliance Log Table
 CREATE TABLE faa_compliance_log (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     crew_member_id UUID REFERENCES crew_members(id) ON DELETE CASCADE,
-    flight_assignment_id UUID REFERENCES flight_assignments(id) ON DELETE SET NULL,
+    flight_assignment_id UUID,  -- flight_assignments.id (no FK: that table is partitioned)
     regulation VARCHAR(50) NOT NULL,  -- Part 117.23, Part 121.471, etc.
     check_type VARCHAR(100) NOT NULL,  -- fdp_limit, rest_requirement, flight_time_limit
     is_compliant BOOLEAN NOT NULL,
@@ -182,15 +246,36 @@ CREATE TABLE pay_periods (
     period_end DATE NOT NULL,
     year INTEGER NOT NULL,
     period_number INTEGER NOT NULL,
-    status VARCHAR(20) DEFAULT 'open',  -- open, closed, paid
+    status VARCHAR(20) DEFAULT 'open',  -- open, closing, closed, paid
     closed_at TIMESTAMP,
     paid_at TIMESTAMP,
     CONSTRAINT unique_period UNIQUE (year, period_number),
-    CONSTRAINT valid_period_status CHECK (status IN ('open', 'closed', 'paid'))
+    CONSTRAINT valid_period_status CHECK (status IN ('open', 'closing', 'closed', 'paid'))
 );
 
 CREATE INDEX idx_pay_period_dates ON pay_periods(period_start, period_end);
 
+-- Pay Period Close Items (per-crew checkpoints for a period close)
+CREATE TABLE pay_period_close_items (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    pay_period_id UUID NOT NULL REFERENCES pay_periods(id) ON DELETE CASCADE,
+    crew_member_id UUID NOT NULL REFERENCES crew_members(id) ON DELETE CASCADE,
+    employee_id VARCHAR(50) NOT NULL,
+    crew_snapshot JSONB NOT NULL,  -- crew_member_data at close start
+    flights_snapshot JSONB NOT NULL,  -- flight assignments at close start
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',  -- pending, failed, complete, review
+    attempts INTEGER NOT NULL DEFAULT 0,
+    execution_id VARCHAR(64),
+    node_outputs JSONB,  -- per-node results of the last run
+    total_pay DECIMAL(10,2),
+    error TEXT,
+    completed_at TIMESTAMP,
+    CONSTRAINT unique_close_item UNIQUE (pay_period_id, crew_member_id),
+    CONSTRAINT valid_close_item_status CHECK (status IN ('pending', 'failed', 'complete', 'review'))
+);
+
+CREATE INDEX idx_close_item_status ON pay_period_close_items(pay_period_id, status);
+
 -- Premium Rules Table (Contract-based)
 CREATE TABLE premium_rules (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
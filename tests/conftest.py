@@ -0,0 +1,9 @@
+"""
+Shared test setup
+"""
+
+from dotenv import load_dotenv
+
+# Agents read ANTHROPIC_API_KEY and CLAUDE_* settings from the environment;
+# tests that skip api.config (which loads .env itself) still see .env
+load_dotenv()
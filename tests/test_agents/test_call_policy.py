@@ -0,0 +1,186 @@
+"""
+Test Claude call retries, deadlines and hedging
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+import httpx
+import pytest
+from anthropic import APIConnectionError
+
+from agents.core.base_agent import BaseAgent
+from agents.core.call_policy import CallDeadlineExceeded, CallPolicy, ModelTiers, deadline_scope
+from agents.core.json_stream import field_scope
+from agents.core.output_models import AgentOutput
+
+REQUEST = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+
+
+def _response(text='{"ok": true}'):
+    return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+class FakeMessages:
+    """messages.create stand-in that plays back a script of outcomes."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.timeouts = []
+        self.models = []
+        self._lock = threading.Lock()
+
+    def create(self, timeout=None, **request):
+        with self._lock:
+            self.timeouts.append(timeout)
+            self.models.append(request["model"])
+            outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        if isinstance(outcome, tuple):
+            delay, outcome = outcome
+            time.sleep(delay)
+        return outcome
+
+
+def _agent(messages, **policy):
+    agent = BaseAgent("PolicyTest")
+    agent.client = SimpleNamespace(messages=messages)
+    agent.policy = CallPolicy(backoff_base_seconds=0.01, **policy)
+    return agent
+
+
+def test_transient_errors_are_retried():
+    messages = FakeMessages(APIConnectionError(request=REQUEST), _response())
+    agent = _agent(messages, max_retries=2)
+
+    assert agent.call_claude("system", "user") == {"ok": True}
+    assert len(messages.timeouts) == 2
+
+
+def test_non_transient_errors_are_not_retried():
+    messages = FakeMessages(ValueError("bad request"), _response())
+    agent = _agent(messages, max_retries=2)
+
+    with pytest.raises(ValueError):
+        agent.call_claude("system", "user")
+    assert len(messages.timeouts) == 1
+
+
+def test_node_deadline_bounds_timeout():
+    messages = FakeMessages(_response())
+    agent = _agent(messages, timeout_seconds=60)
+
+    with deadline_scope(5):
+        agent.call_claude("system", "user")
+    assert messages.timeouts[0] <= 5
+
+    with deadline_scope(0), pytest.raises(CallDeadlineExceeded):
+        agent.call_claude("system", "user")
+
+
+def test_slow_call_is_hedged():
+    messages = FakeMessages((1.0, _response('{"from": "primary"}')), _response('{"from": "hedge"}'))
+    agent = _agent(messages, hedge=True, hedge_after_seconds=0.05)
+
+    started = time.monotonic()
+    assert agent.call_claude("system", "user") == {"from": "hedge"}
+    assert time.monotonic() - started < 1.0
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.text_stream = iter(chunks)
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+
+def test_streaming_stops_once_required_fields_parsed():
+    chunks = [
+        '{"totals": {"pay": 1',
+        '00}, "confidence_score": 0.9',
+        ', "notes": ["long"',
+        ", ...]}",
+    ]
+    consumed = []
+
+    def text_stream():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    stream = FakeStream(text_stream())
+    agent = _agent(SimpleNamespace(stream=lambda timeout=None, **request: stream))
+    agent.required_fields = ("totals", "confidence_score")
+
+    fields = []
+    with field_scope(lambda name, value: fields.append(name)):
+        result = agent.call_claude("system", "user", stream=True)
+
+    assert result == {"totals": {"pay": 100}, "confidence_score": 0.9}
+    assert fields == ["totals", "confidence_score"]
+    assert len(consumed) == 3 and stream.closed
+
+
+class StreamedOutput(AgentOutput):
+    totals: Dict[str, float]
+    notes: List[str]
+
+
+def test_early_stop_is_validated_against_required_fields():
+    """Required model fields after the cut point do not force a repair turn."""
+    stream = FakeStream(iter(['{"confidence_score": 0.9, "totals": {"pay": 1', '00}, "notes": [']))
+    agent = _agent(SimpleNamespace(stream=lambda timeout=None, **request: stream))
+    agent.output_model = StreamedOutput
+    agent.required_fields = ("confidence_score", "totals")
+
+    result = agent.call_claude("system", "user", stream=True)
+
+    # No create() on the fake client: a repair turn would have raised
+    assert result == {"confidence_score": 0.9, "totals": {"pay": 100.0}}
+
+
+def test_truncated_stream_raises():
+    """A stream that ends before the required fields is an error, not a partial result."""
+    stream = FakeStream(iter(['{"totals": {"pay": 100}, "notes": ["long"']))
+    agent = _agent(SimpleNamespace(stream=lambda timeout=None, **request: stream))
+    agent.required_fields = ("totals", "confidence_score")
+
+    with pytest.raises(ValueError):
+        agent.call_claude("system", "user", stream=True)
+
+
+def test_fast_tier_escalates_on_low_confidence_or_rejection():
+    tiers = ModelTiers(
+        fast_model="fast", strong_model="strong", fast_agents=frozenset({"PolicyTest"})
+    )
+
+    messages = FakeMessages(_response('{"confidence_score": 0.95}'))
+    agent = _agent(messages)
+    agent.tiers = tiers
+    assert agent.call_claude("system", "user") == {"confidence_score": 0.95}
+    assert messages.models == ["fast"]
+
+    messages = FakeMessages(
+        _response('{"confidence_score": 0.5}'), _response('{"confidence_score": 0.9}')
+    )
+    agent.client = SimpleNamespace(messages=messages)
+    assert agent.call_claude("system", "user") == {"confidence_score": 0.9}
+    assert messages.models == ["fast", "strong"]
+
+    messages = FakeMessages(_response('{"total": 1}'), _response('{"total": 2}'))
+    agent.client = SimpleNamespace(messages=messages)
+    assert agent.call_claude("system", "user", accept=lambda r: r["total"] == 2) == {"total": 2}
+    assert messages.models == ["fast", "strong"]
+
+    messages = FakeMessages(_response())
+    agent.client = SimpleNamespace(messages=messages)
+    agent.call_claude("system", "user", escalate=True)
+    assert messages.models == ["strong"]
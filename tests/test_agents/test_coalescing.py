@@ -0,0 +1,110 @@
+"""
+Test cross-crew coalescing of shared leg computations
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from agents.coalescing import Coalescer, coalescing_scope
+from agents.core.premium_pay_calculator import PremiumPayCalculator
+from tests.fixtures.sample_data import SAMPLE_CREW_MEMBER, SAMPLE_FLIGHTS
+
+
+def test_each_key_computed_once_across_threads():
+    """Concurrent callers wait for the first claim instead of recomputing."""
+    coalescer = Coalescer()
+    calls = []
+    release = threading.Event()
+
+    def compute(keys):
+        calls.append(keys)
+        release.wait(1)
+        return {key: key.upper() for key in keys}
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(coalescer.get_many, ["a", "b"], compute) for _ in range(4)]
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert calls == [["a", "b"]]
+    assert results == [{"a": "A", "b": "B"}] * 4
+    assert coalescer.stats() == {"computed": 2, "shared": 6}
+
+
+def test_failed_computation_is_released():
+    """A failure propagates, and the keys can be computed again later."""
+    coalescer = Coalescer()
+
+    def fail(keys):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        coalescer.get_many(["a"], fail)
+    assert coalescer.get_many(["a"], lambda keys: {"a": 1}) == {"a": 1}
+
+
+def test_premium_legs_shared_between_crew_members(monkeypatch):
+    """Captain and first officer on the same trip share one Claude call."""
+    agent = PremiumPayCalculator()
+    calls = []
+
+    def fake_call_claude(system_prompt, user_message, response_model=None, max_tokens=4096):
+        calls.append(user_message)
+        return {
+            "leg_premiums": [
+                {"type": "redeye", "flight_number": "XP101", "date": "2025-11-03", "basis": 1}
+            ],
+            "confidence_score": 0.95,
+        }
+
+    monkeypatch.setattr(agent, "call_claude", fake_call_claude)
+    first_officer = dict(SAMPLE_CREW_MEMBER, role="First Officer", hourly_rate=80.0)
+
+    with coalescing_scope(Coalescer()):
+        captain = agent.calculate(
+            {"crew_member_data": SAMPLE_CREW_MEMBER, "flight_assignments": SAMPLE_FLIGHTS}
+        )
+        officer = agent.calculate(
+            {"crew_member_data": first_officer, "flight_assignments": SAMPLE_FLIGHTS}
+        )
+
+    assert len(calls) == 1
+    assert captain["totals"]["total_redeye_premium"] == 100.0
+    assert officer["totals"]["total_redeye_premium"] == 75.0
+    assert officer["totals"]["total_premium_pay"] == 75.0
+    assert officer["premium_components"][0]["premium_amount"] == 75.0
+    assert officer["confidence_score"] == 0.95
+
+
+def test_coalesced_and_single_crew_totals_match(monkeypatch):
+    """A batch run prices premiums exactly like a single-crew calculation."""
+    agent = PremiumPayCalculator()
+    flights = [dict(SAMPLE_FLIGHTS[0], flight_date="2025-11-27", is_international=True)]
+
+    def fake_call_claude(system_prompt, user_message, response_model=None, max_tokens=4096):
+        return {
+            "leg_premiums": [
+                {"type": "holiday", "flight_number": "XP101", "date": "2025-11-27", "basis": 2.58},
+                {"type": "redeye", "flight_number": "XP101", "date": "2025-11-27", "basis": 1},
+                {
+                    "type": "international",
+                    "flight_number": "XP101",
+                    "date": "2025-11-27",
+                    "basis": 2.58,
+                },
+            ],
+            "confidence_score": 0.9,
+        }
+
+    monkeypatch.setattr(agent, "call_claude", fake_call_claude)
+    input_data = {"crew_member_data": SAMPLE_CREW_MEMBER, "flight_assignments": flights}
+
+    single = agent.calculate(input_data)
+    with coalescing_scope(Coalescer()):
+        coalesced = agent.calculate(input_data)
+
+    assert coalesced["totals"] == single["totals"]
+    # Holiday premium is the 0.5x on top of flight pay: 2.58 h × $105 × 0.5
+    assert single["totals"]["total_holiday_pay"] == 135.45
+    assert single["totals"]["total_premium_pay"] == 276.09  # + 100 red-eye + 40.64 international
@@ -0,0 +1,178 @@
+"""
+Test Compliance Validator Agent (rules-first path)
+"""
+
+import copy
+from datetime import datetime
+
+import pytest
+from agents.core.compliance_validator import ComplianceValidator
+from agents.rules import max_fdp_hours, run_compliance_checks
+from tests.fixtures.sample_data import SAMPLE_CREW_MEMBER, SAMPLE_FLIGHTS
+
+
+@pytest.fixture
+def compliance_agent():
+    """Create ComplianceValidator instance."""
+    return ComplianceValidator()
+
+
+@pytest.fixture
+def clean_input():
+    """Agent outputs that agree with SAMPLE_FLIGHTS."""
+    return {
+        "crew_member_data": SAMPLE_CREW_MEMBER,
+        "flight_assignments": copy.deepcopy(SAMPLE_FLIGHTS),
+        "flight_time_data": {
+            "totals": {
+                "total_flights": 2,
+                "total_actual_hours": 5.33,
+                "total_credit_hours": 5.33,
+                "hourly_rate": 105.0,
+                "total_flight_pay": 559.65,
+            },
+            "discrepancies": [],
+            "confidence_score": 0.98,
+        },
+        "duty_time_data": {
+            "cumulative_limits": {
+                "fdp_7_days": {"actual": 9.0, "limit": 60.0, "compliant": True},
+            },
+            "violations": [],
+            "compliance_status": "compliant",
+            "confidence_score": 0.95,
+        },
+        "per_diem_data": {
+            "layovers": [{"airport_code": "PDX", "daily_rate": 79.0, "layover_total": 59.25}],
+            "totals": {
+                "total_layovers": 1,
+                "total_gross_per_diem": 59.25,
+                "total_meal_deductions": 0.0,
+                "total_net_per_diem": 59.25,
+            },
+            "rate_sources": [],
+            "confidence_score": 0.95,
+        },
+        "premium_pay_data": {
+            "totals": {
+                "total_holiday_pay": 0.0,
+                "total_redeye_premium": 100.0,
+                "total_international_premium": 0.0,
+                "total_premium_pay": 100.0,
+            },
+            "confidence_score": 0.95,
+        },
+        "guarantee_data": {
+            "paid_hours": 75.0,
+            "guarantee_triggered": True,
+            "guarantee_applied": {"hours": 75.0},
+            "calculation": {"guarantee_hours": 75.0, "base_pay": 7875.0},
+            "confidence_score": 1.0,
+        },
+        "pay_period_start": "2025-11-01",
+        "pay_period_end": "2025-11-15",
+        "execution_id": "test-123",
+    }
+
+
+def test_clean_input_skips_claude(compliance_agent, clean_input, monkeypatch):
+    """Clean crew members are validated without an LLM call."""
+
+    def fail_call(*args, **kwargs):
+        raise AssertionError("Claude should not be called for clean input")
+
+    monkeypatch.setattr(compliance_agent, "call_claude", fail_call)
+
+    result = compliance_agent.calculate(clean_input)
+
+    assert result["overall_compliance"] == "pass"
+    assert result["validation_mode"] == "rules"
+    assert result["requires_human_review"] is False
+    assert result["pay_accuracy_check"]["totals_accurate"] is True
+
+
+def test_pay_anomaly_escalates_to_claude(compliance_agent, clean_input, monkeypatch):
+    """A flight pay mismatch sends the findings to Claude."""
+    clean_input["flight_time_data"]["totals"]["total_flight_pay"] = 600.0
+    captured = {}
+
+    def fake_call(system_prompt, user_message, **kwargs):
+        captured["message"] = user_message
+        return {"overall_compliance": "needs_review", "requires_human_review": True}
+
+    monkeypatch.setattr(compliance_agent, "call_claude", fake_call)
+
+    result = compliance_agent.calculate(clean_input)
+
+    assert result["validation_mode"] == "llm"
+    assert "Flight pay = credit hours × hourly rate" in captured["message"]
+    assert result["rule_findings"]
+
+
+def test_duplicate_leg_and_short_rest_flagged(compliance_agent, clean_input, monkeypatch):
+    """Duplicate legs and rest violations are detected locally."""
+    duplicate = copy.deepcopy(clean_input["flight_assignments"][1])
+    duplicate["duty_report_time"] = "2025-11-04 06:00:00"
+    clean_input["flight_assignments"].append(duplicate)
+    monkeypatch.setattr(
+        compliance_agent, "call_claude", lambda *a, **k: {"overall_compliance": "fail"}
+    )
+
+    result = compliance_agent.calculate(clean_input)
+
+    assert any("Duplicate legs" in f for f in result["rule_findings"])
+    assert any("Minimum rest" in f for f in result["rule_findings"])
+
+
+def test_low_upstream_confidence_escalates(compliance_agent, clean_input, monkeypatch):
+    """Low upstream confidence is reviewed by Claude even when totals match."""
+    clean_input["flight_time_data"]["confidence_score"] = 0.5
+    monkeypatch.setattr(
+        compliance_agent, "call_claude", lambda *a, **k: {"overall_compliance": "pass"}
+    )
+
+    result = compliance_agent.calculate(clean_input)
+
+    assert result["validation_mode"] == "llm"
+
+
+def test_max_fdp_hours_table_b():
+    """Table B lookup by report hour and segment count."""
+    assert max_fdp_hours(datetime(2025, 11, 3, 8, 0), 1) == 14.0
+    assert max_fdp_hours(datetime(2025, 11, 3, 8, 0), 9) == 11.5
+    assert max_fdp_hours(datetime(2025, 11, 3, 23, 30), 2) == 10.0
+
+
+def _run_checks(data, **kwargs):
+    return run_compliance_checks(
+        data["crew_member_data"],
+        data["flight_assignments"],
+        data["flight_time_data"],
+        data["duty_time_data"],
+        data["per_diem_data"],
+        data["premium_pay_data"],
+        data["guarantee_data"],
+        **kwargs,
+    )
+
+
+def _check(checks, name):
+    return [r for r in checks["validation_results"] if r["check"] == name]
+
+
+def test_per_diem_rate_check_needs_rate_table(clean_input):
+    """Rates are only reported current when there is a table to compare them with."""
+    assert _check(_run_checks(clean_input), "Per diem rates are current") == []
+
+    checks = _run_checks(clean_input, per_diem_rates={"PDX": {"rate": 74.0}})
+    (rate_check,) = _check(checks, "Per diem rates are current")
+    assert rate_check["status"] == "fail"
+    assert "PDX used $79.00, current rate $74.00" in rate_check["details"]
+
+
+def test_premium_subtotals_are_not_double_counted(clean_input):
+    """Only the component totals are summed against total_premium_pay."""
+    clean_input["premium_pay_data"]["totals"]["total_leg_premiums"] = 100.0
+
+    (premium_check,) = _check(_run_checks(clean_input), "Premium pay totals")
+    assert premium_check["status"] == "pass"
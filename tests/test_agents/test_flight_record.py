@@ -0,0 +1,55 @@
+"""
+Test compact FlightRecord representation
+"""
+
+import pickle
+from datetime import date, datetime
+
+import pytest
+from agents.flight_record import FlightRecord, as_flight_records, load_flight_records
+from tests.fixtures.sample_data import SAMPLE_FLIGHTS
+
+
+def test_record_parses_once():
+    """Timestamps and block times are pre-parsed at load time."""
+    record = FlightRecord.from_dict(SAMPLE_FLIGHTS[0])
+
+    assert record.flight_date == date(2025, 11, 3)
+    assert record.actual_departure == datetime(2025, 11, 3, 22, 45)
+    assert record.actual_block_centihours == 258
+    assert record.actual_block_time == 2.58
+    assert record.credit_hours == 2.58
+
+
+def test_round_trip_to_dict():
+    """Conversion back to the dict shape is lossless for the sample data."""
+    for flight in SAMPLE_FLIGHTS:
+        assert FlightRecord.from_dict(flight).to_dict() == flight
+
+
+def test_records_are_read_only():
+    """Records are shared across nodes and cannot be mutated."""
+    record = FlightRecord.from_dict(SAMPLE_FLIGHTS[0])
+
+    with pytest.raises(AttributeError):
+        record.actual_block_centihours = 0
+    assert not hasattr(record, "__dict__")
+
+
+def test_minimum_credit_and_derived_block():
+    """Missing actual block time falls back to actual times, then scheduled."""
+    flight = dict(SAMPLE_FLIGHTS[1], actual_block_time=None)
+    flight["actual_arrival"] = "2025-11-04 15:40:00"
+
+    record = FlightRecord.from_dict(flight)
+
+    assert record.block_hours == 0.5
+    assert record.credit_hours == 1.0
+
+
+def test_load_reuses_records_and_pickles():
+    """Loaded tuples are passed through and survive pickling."""
+    records = load_flight_records(SAMPLE_FLIGHTS)
+
+    assert as_flight_records(records) is records
+    assert pickle.loads(pickle.dumps(records)) == records
@@ -2,7 +2,11 @@
 Test Flight Time Calculator Agent
 """
 
+import time
+from dataclasses import replace
+
 import pytest
+from agents.core.call_policy import ModelTiers
 from agents.core.flight_time_calculator import FlightTimeCalculator
 from tests.fixtures.sample_data import SAMPLE_CREW_MEMBER, SAMPLE_FLIGHTS
 
@@ -41,14 +45,100 @@ def test_prepare_flight_data(flight_time_agent):
         SAMPLE_FLIGHTS, SAMPLE_CREW_MEMBER
     )
 
-    assert "Flight 1:" in formatted
-    assert "Flight 2:" in formatted
+    lines = formatted.splitlines()
+    assert lines[0].startswith("flight,date,route,")
+    assert len(lines) == len(SAMPLE_FLIGHTS) + 1
+    assert lines[1].startswith("XP101,2025-11-03,BUR-PDX,22:30,22:45,01:15+1,01:20+1,")
     assert "XP101" in formatted
     assert "XP102" in formatted
     assert "BUR" in formatted
     assert "PDX" in formatted
 
 
+def test_large_roster_is_chunked_and_merged(flight_time_agent, monkeypatch):
+    """Flights beyond the prompt budget are split, run concurrently and merged in order."""
+    flights = [dict(SAMPLE_FLIGHTS[0], flight_number=f"XP{n}") for n in range(40)]
+    prompts = []
+
+    def fake_call_claude(system_prompt, user_message, max_tokens=4096, **kwargs):
+        legs = user_message.count("BUR-PDX")
+        first = user_message.split("BUR-PDX")[0].rsplit("\n", 1)[-1].split(",")[0]
+        prompts.append(legs)
+        # Earlier chunks finish last
+        time.sleep(0.05 if first == "XP0" else 0)
+        return {
+            "flights": [{"flight_number": first}],
+            "totals": {
+                "total_flights": legs,
+                "total_actual_hours": round(legs * 2.58, 2),
+                "total_credit_hours": round(legs * 2.58, 2),
+                "hourly_rate": 105.0,
+                "total_flight_pay": round(legs * 2.58 * 105.0, 2),
+            },
+            "discrepancies": [],
+            "confidence_score": 0.9 if first == "XP0" else 0.95,
+        }
+
+    monkeypatch.setattr(flight_time_agent, "call_claude", fake_call_claude)
+    monkeypatch.setattr(
+        flight_time_agent, "policy", replace(flight_time_agent.policy, prompt_token_budget=300)
+    )
+
+    result = flight_time_agent.calculate(
+        {"crew_member_data": SAMPLE_CREW_MEMBER, "flight_assignments": flights}
+    )
+
+    assert len(prompts) > 1 and sum(prompts) == 40
+    assert result["totals"]["total_flights"] == 40
+    assert result["totals"]["total_credit_hours"] == 103.2
+    assert result["totals"]["total_flight_pay"] == 10836.0
+    assert result["confidence_score"] == 0.9
+    assert result["flights"][0]["flight_number"] == "XP0"
+
+
+def test_merge_tolerates_missing_optional_totals(flight_time_agent):
+    """Chunks without total_actual_hours (unvalidated JSON) still merge."""
+    results = [
+        {
+            "totals": {"total_flights": 1, "total_credit_hours": 2.58, "hourly_rate": 105.0},
+            "confidence_score": 0.95,
+        },
+        {"totals": {"total_flights": 1, "total_actual_hours": 2.75, "total_credit_hours": 2.75}},
+    ]
+
+    merged = flight_time_agent._merge_results(results, {})
+
+    assert merged["totals"]["total_actual_hours"] == 2.75
+    assert merged["totals"]["total_credit_hours"] == 5.33
+    assert merged["totals"]["total_flight_pay"] == 559.65
+    assert merged["confidence_score"] == 0
+
+
+def test_null_total_escalates_to_strong_model(flight_time_agent, monkeypatch):
+    """A null total from the fast model fails the local check instead of raising."""
+    models = []
+
+    def fake_call_model(claude_model, *call):
+        models.append(claude_model)
+        credit_hours = None if claude_model == "fast" else 5.33
+        return {
+            "totals": {"total_credit_hours": credit_hours, "total_flight_pay": 559.65},
+            "confidence_score": 0.95,
+        }
+
+    monkeypatch.setattr(flight_time_agent, "_call_model", fake_call_model)
+    flight_time_agent.tiers = ModelTiers(
+        fast_model="fast", strong_model="strong", fast_agents=frozenset({"FlightTimeCalculator"})
+    )
+
+    result = flight_time_agent.calculate(
+        {"crew_member_data": SAMPLE_CREW_MEMBER, "flight_assignments": SAMPLE_FLIGHTS}
+    )
+
+    assert models == ["fast", "strong"]
+    assert result["totals"]["total_credit_hours"] == 5.33
+
+
 # Note: Full integration tests with Claude API require ANTHROPIC_API_KEY
 # and would make actual API calls. These are marked as integration tests.
 
@@ -0,0 +1,48 @@
+"""
+Test incremental JSON parsing of agent responses
+"""
+
+import pytest
+
+from agents.core.json_stream import IncrementalJSONParser, parse_json_response
+
+RESPONSE = (
+    'Here is the calculation:\n```json\n'
+    '{"totals": {"total_flight_pay": 559.65, "note": "a, b {c}"}, '
+    '"flights": [{"flight_number": "XP101"}], "confidence_score": 0.95}\n```\nDone.'
+)
+
+
+def test_fields_complete_as_chunks_arrive():
+    """Each top-level field is yielded as soon as its value closes."""
+    parser = IncrementalJSONParser()
+    seen = []
+    for start in range(0, len(RESPONSE), 7):
+        seen += [name for name, _ in parser.feed(RESPONSE[start:start + 7])]
+        if "totals" in seen:
+            assert not parser.complete
+            break
+
+    assert seen == ["totals"]
+    assert parser.fields["totals"]["note"] == "a, b {c}"
+
+
+def test_parse_ignores_prose_and_fences():
+    result = parse_json_response(RESPONSE)
+    assert result["flights"] == [{"flight_number": "XP101"}]
+    assert result["confidence_score"] == 0.95
+
+
+def test_unparseable_response_raises():
+    with pytest.raises(ValueError):
+        parse_json_response("I could not compute this.")
+
+
+def test_truncated_response_raises():
+    """A response cut off mid-object (e.g. at max_tokens) is not returned partially."""
+    with pytest.raises(ValueError):
+        parse_json_response('{"totals": {"a": 1}, "flights": [1, 2')
+
+    parser = IncrementalJSONParser()
+    parser.feed('{"totals": {"a": 1}, "flights": [1, 2')
+    assert parser.result(partial=True) == {"totals": {"a": 1}}
@@ -0,0 +1,89 @@
+"""
+Test compact prompt encoding of flights
+"""
+
+from agents.prompt_encoding import (
+    ACT_BLOCK,
+    DATE,
+    FLIGHT,
+    ROUTE,
+    chunk_flights,
+    encode_daily_totals,
+    encode_flights,
+    estimate_tokens,
+    trip_chunks,
+)
+from agents.flight_record import load_flight_records
+from tests.fixtures.sample_data import SAMPLE_FLIGHTS
+
+COLUMNS = (FLIGHT, DATE, ROUTE, ACT_BLOCK)
+
+
+def test_one_row_per_flight():
+    """Flights render as a CSV header plus one row each."""
+    table = encode_flights(SAMPLE_FLIGHTS, COLUMNS)
+
+    assert table.splitlines() == [
+        "flight,date,route,act_block",
+        "XP101,2025-11-03,BUR-PDX,2.58",
+        "XP102,2025-11-04,PDX-BUR,2.75",
+    ]
+
+
+def test_prompt_grows_gently_with_flights():
+    """Each extra leg costs a short row, not a multi-line block."""
+    flights = load_flight_records([SAMPLE_FLIGHTS[0]] * 80)
+    one = estimate_tokens(encode_flights(flights[:1], COLUMNS))
+    eighty = estimate_tokens(encode_flights(flights, COLUMNS))
+
+    assert (eighty - one) / 79 < 12
+
+
+def test_chunks_fit_budget_and_keep_order():
+    """Chunking splits at row boundaries and keeps every flight once, in order."""
+    flights = load_flight_records(
+        [dict(SAMPLE_FLIGHTS[0], flight_number=f"XP{n}") for n in range(50)]
+    )
+
+    chunks = chunk_flights(flights, COLUMNS, token_budget=100)
+
+    assert len(chunks) > 1
+    assert [f for chunk in chunks for f in chunk] == list(flights)
+    assert all(estimate_tokens(encode_flights(chunk, COLUMNS)) <= 100 for chunk in chunks)
+    assert chunk_flights(flights, COLUMNS, token_budget=100_000) == [flights]
+
+
+def test_daily_totals_cover_every_flight():
+    """The per-day fallback keeps the whole period's legs and hours."""
+    summary = encode_daily_totals(SAMPLE_FLIGHTS + SAMPLE_FLIGHTS[:1])
+
+    assert summary.splitlines() == [
+        "date,legs,block,credit",
+        "2025-11-03,2,5.16,5.16",
+        "2025-11-04,1,2.75,2.75",
+    ]
+
+
+def test_trip_chunks_keep_trips_together():
+    """Whole trips are packed in date order, whatever the input order."""
+    flights = load_flight_records(
+        [
+            dict(
+                SAMPLE_FLIGHTS[n % 2],
+                flight_number=f"XP{trip}{n}",
+                flight_date=f"2025-11-{trip + 1:02d}",
+                trip_id=f"TRIP-{trip}",
+                sequence_number=n + 1,
+            )
+            for trip in range(6)
+            for n in range(4)
+        ]
+    )
+
+    chunks = trip_chunks(flights, COLUMNS, token_budget=100_000, max_flights=10)
+    shuffled = trip_chunks(flights[::-1], COLUMNS, token_budget=100_000, max_flights=10)
+
+    assert [len(chunk) for chunk in chunks] == [8, 8, 8]
+    assert chunks == shuffled
+    assert [f.trip_id for f in chunks[0]] == ["TRIP-0"] * 4 + ["TRIP-1"] * 4
+    assert [f.sequence_number for f in chunks[0][:4]] == [1, 2, 3, 4]
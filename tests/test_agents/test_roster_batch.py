@@ -0,0 +1,73 @@
+"""
+Test columnar RosterBatch pay math
+"""
+
+import pytest
+from agents.roster_batch import RosterBatch
+from tests.fixtures.sample_data import (
+    SAMPLE_CREW_MEMBER,
+    SAMPLE_FLIGHTS,
+    EXPECTED_CREDIT_HOURS,
+)
+
+FIRST_OFFICER = dict(
+    SAMPLE_CREW_MEMBER, id="fo-1", employee_id="P12346", role="First Officer",
+    hourly_rate=85.00,
+)
+
+
+@pytest.fixture
+def batch():
+    """Two crew members flying the sample trip (legs given out of order)."""
+    return RosterBatch.from_roster(
+        [
+            (SAMPLE_CREW_MEMBER, SAMPLE_FLIGHTS),
+            (FIRST_OFFICER, list(reversed(SAMPLE_FLIGHTS))),
+        ]
+    )
+
+
+def test_flight_totals(batch):
+    """Credit hours and flight pay are grouped per crew member."""
+    totals = batch.flight_totals()
+
+    assert len(batch) == 4
+    assert totals["total_flights"].tolist() == [2, 2]
+    assert totals["total_credit_hours"][0] == pytest.approx(EXPECTED_CREDIT_HOURS)
+    assert totals["total_flight_pay"].tolist() == [559.65, 453.05]
+
+
+def test_premium_totals(batch):
+    """Red-eye premium uses the role rate; no holidays in the sample."""
+    totals = batch.premium_totals()
+
+    assert totals["total_redeye_premium"].tolist() == [100.0, 75.0]
+    assert totals["total_holiday_pay"].tolist() == [0.0, 0.0]
+    assert totals["total_premium_pay"].tolist() == [100.0, 75.0]
+
+
+def test_holiday_premium():
+    """Holiday legs earn the extra 0.5x on top of flight pay."""
+    holiday_flight = dict(SAMPLE_FLIGHTS[1], flight_date="2025-11-27")
+    batch = RosterBatch.from_roster([(SAMPLE_CREW_MEMBER, [holiday_flight])])
+
+    assert batch.premium_totals()["total_holiday_pay"][0] == pytest.approx(144.38)
+
+
+def test_per_diem_totals(batch):
+    """PDX layover is a single calendar day at 75% of the default rate."""
+    totals = batch.per_diem_totals()
+
+    assert totals["total_layovers"].tolist() == [1, 1]
+    assert totals["total_net_per_diem"].tolist() == [59.25, 59.25]
+
+
+def test_batch_benchmark_runs():
+    """The batch benchmark builds and totals a synthetic roster."""
+    from agents import benchmark
+
+    stats = benchmark.batch_run(legs=10_000, legs_per_crew=40, runs=1)
+
+    assert stats["legs"] == 10_000
+    assert stats["crew_members"] == 250
+    assert stats["pay_seconds"] > 0
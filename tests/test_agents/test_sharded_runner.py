@@ -0,0 +1,67 @@
+"""
+Test sharded fleet-wide pay runner
+"""
+
+import pytest
+from agents.roster_batch import RosterBatch
+from agents.sharded_runner import ShardedPayRunner, assign_shards
+from tests.fixtures.sample_data import SAMPLE_CREW_MEMBER, SAMPLE_FLIGHTS
+
+
+def _roster(size):
+    """Build a roster of crew members flying the sample trip."""
+    roster = []
+    for i in range(size):
+        crew_member = dict(
+            SAMPLE_CREW_MEMBER,
+            id=f"crew-{i}",
+            base_airport=["BUR", "LAX", "SFO"][i % 3],
+        )
+        roster.append((crew_member, SAMPLE_FLIGHTS))
+    return roster
+
+
+@pytest.mark.parametrize("shard_key", ["crew_member_id", "base_airport"])
+def test_sharded_run_matches_single_batch(shard_key):
+    """Process-pool results equal a single in-process batch."""
+    roster = _roster(12)
+    expected = RosterBatch.from_roster(roster).flight_totals()
+
+    result = ShardedPayRunner(max_workers=2, shard_key=shard_key).run(roster)
+
+    assert result["totals"]["crew_members"] == 12
+    assert result["totals"]["total_flights"] == 24
+    assert result["totals"]["total_flight_pay"] == pytest.approx(
+        expected["total_flight_pay"].sum()
+    )
+    assert result["crew"]["crew-5"]["flight_time"]["total_flight_pay"] == 559.65
+    assert result["crew"]["crew-5"]["duty_time"]["compliant"] is True
+
+
+def test_base_airport_shards_keep_bases_together():
+    """Every crew member at a base lands on the same shard."""
+    crew_members = [crew_member for crew_member, _ in _roster(9)]
+
+    shards = assign_shards(crew_members, 2, "base_airport")
+
+    for base in ("BUR", "LAX", "SFO"):
+        base_shards = {
+            shard
+            for crew_member, shard in zip(crew_members, shards)
+            if crew_member["base_airport"] == base
+        }
+        assert len(base_shards) == 1
+
+
+def test_duty_checks_flag_short_rest():
+    """Rest under 10 hours between duty periods is counted."""
+    second = dict(SAMPLE_FLIGHTS[1], duty_report_time="2025-11-04 08:00:00")
+    batch = RosterBatch.from_roster(
+        [(SAMPLE_CREW_MEMBER, [SAMPLE_FLIGHTS[0], second])]
+    )
+
+    checks = batch.duty_checks()
+
+    assert checks["duty_periods"].tolist() == [2]
+    assert checks["short_rests"].tolist() == [1]
+    assert checks["compliant"].tolist() == [False]
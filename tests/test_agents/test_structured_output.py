@@ -0,0 +1,113 @@
+"""
+Test structured (tool-use) agent output and validation repair
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from agents.core.base_agent import OUTPUT_TOOL_NAME
+from agents.core.call_policy import CallPolicy, ModelTiers
+from agents.core.guarantee_calculator import GuaranteeCalculator
+from agents.prompts.guarantee_prompts import GUARANTEE_SYSTEM_PROMPT
+
+GUARANTEE = {
+    "crew_type": "line_holder",
+    "role": "Captain",
+    "actual_hours": 68.0,
+    "paid_hours": 75.0,
+    "guarantee_triggered": True,
+    "calculation": {
+        "actual_credit_hours": 68.0,
+        "guarantee_hours": 75.0,
+        "paid_hours": 75.0,
+        "hourly_rate": 100.0,
+        "base_pay": 7500.0,
+    },
+    "confidence_score": 0.95,
+}
+
+
+def _tool_response(tool_input):
+    return SimpleNamespace(
+        content=[
+            SimpleNamespace(type="tool_use", id="toolu_1", name=OUTPUT_TOOL_NAME, input=tool_input)
+        ]
+    )
+
+
+class FakeToolMessages:
+    """beta.tools.messages stand-in that records requests."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def create(self, timeout=None, **request):
+        self.requests.append(request)
+        return self.responses.pop(0)
+
+
+def _agent(messages):
+    agent = GuaranteeCalculator()
+    agent.client = SimpleNamespace(beta=SimpleNamespace(tools=SimpleNamespace(messages=messages)))
+    agent.policy = CallPolicy(max_retries=0, structured=True)
+    agent.tiers = ModelTiers(fast_agents=frozenset())
+    return agent
+
+
+def test_output_requested_as_tool_call():
+    messages = FakeToolMessages(_tool_response(GUARANTEE))
+    agent = _agent(messages)
+
+    result = agent.call_claude(GUARANTEE_SYSTEM_PROMPT, "user")
+
+    request = messages.requests[0]
+    assert request["tools"][0]["name"] == OUTPUT_TOOL_NAME
+    assert "calculation" in request["tools"][0]["input_schema"]["properties"]
+    assert "OUTPUT FORMAT" not in request["system"]
+    assert "Always pay the higher amount" in request["system"]
+    assert result["calculation"]["base_pay"] == 7500.0
+    # Model defaults are filled in
+    assert result["breakdown_by_day"] == [] and result["notes"] == []
+
+
+def test_invalid_output_is_repaired_once():
+    invalid = {key: value for key, value in GUARANTEE.items() if key != "calculation"}
+    messages = FakeToolMessages(_tool_response(invalid), _tool_response(GUARANTEE))
+    agent = _agent(messages)
+
+    result = agent.call_claude("system", "user")
+
+    assert result["paid_hours"] == 75.0
+    repair = messages.requests[1]["messages"][-1]["content"][0]
+    assert repair["type"] == "tool_result" and repair["is_error"]
+    assert "calculation" in repair["content"]
+
+
+def test_output_still_invalid_after_repair_raises():
+    invalid = dict(GUARANTEE, confidence_score=1.5)
+    messages = FakeToolMessages(_tool_response(invalid), _tool_response(invalid))
+
+    with pytest.raises(ValidationError):
+        _agent(messages).call_claude("system", "user")
+    assert len(messages.requests) == 2
+
+
+def test_default_policy_uses_messages_endpoint(monkeypatch):
+    """Structured output is opt-in; by default no request goes to beta tools."""
+    monkeypatch.delenv("CLAUDE_STRUCTURED_OUTPUT", raising=False)
+    messages = FakeToolMessages(
+        SimpleNamespace(content=[SimpleNamespace(text=json.dumps(GUARANTEE))])
+    )
+    agent = GuaranteeCalculator()
+    agent.client = SimpleNamespace(messages=messages)
+    agent.policy = CallPolicy.from_env("GuaranteeCalculator")
+    agent.tiers = ModelTiers(fast_agents=frozenset())
+
+    result = agent.call_claude(GUARANTEE_SYSTEM_PROMPT, "user")
+
+    assert "tools" not in messages.requests[0]
+    assert result["paid_hours"] == 75.0
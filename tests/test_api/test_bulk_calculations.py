@@ -0,0 +1,156 @@
+"""
+Test streaming bulk pay calculations
+"""
+
+import asyncio
+import json
+import uuid
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services import bulk_calculations
+from api.v1 import calculations
+from tests.fixtures.sample_data import SAMPLE_CREW_MEMBER, SAMPLE_FLIGHTS
+
+
+class FakeSession:
+    def close(self):
+        pass
+
+
+class FakeOrchestrator:
+    """Returns a canned final state; fails for employee E-FAIL."""
+
+    def process(self, crew_member_data, flight_assignments, pay_period_start, pay_period_end):
+        if crew_member_data["employee_id"] == "E-FAIL":
+            raise RuntimeError("boom")
+        return {
+            "crew_member_id": crew_member_data["id"],
+            "employee_id": crew_member_data["employee_id"],
+            "execution_id": f"exec-{crew_member_data['employee_id']}",
+            "pay_period_start": pay_period_start,
+            "pay_period_end": pay_period_end,
+            "status": "complete",
+            "total_pay": 100.0 * len(flight_assignments),
+            "total_hours": 2.0,
+            "breakdown": {},
+            "flight_time_data": {"totals": {"total_flight_pay": 100.0}},
+            "compliance_status": {"overall_compliance": "pass"},
+            "confidence_score": 0.95,
+            "requires_human_review": False,
+            "warnings": [],
+            "error_log": [],
+        }
+
+
+def test_bulk_endpoint_streams_one_line_per_crew_member(monkeypatch):
+    """Each crew member becomes one NDJSON line, followed by a summary."""
+    roster = [
+        (dict(SAMPLE_CREW_MEMBER, id=str(uuid.UUID(int=i + 1)), employee_id=f"E{i}"), tuple(SAMPLE_FLIGHTS))
+        for i in range(5)
+    ]
+    roster.append((dict(SAMPLE_CREW_MEMBER, id="id-fail", employee_id="E-FAIL"), ()))
+
+    captured = {}
+
+    def fake_iter_roster(session, start, end, **filters):
+        captured.update(filters)
+        return iter(roster)
+
+    monkeypatch.setattr(calculations, "SessionLocal", FakeSession)
+    monkeypatch.setattr(calculations, "iter_roster", fake_iter_roster)
+    monkeypatch.setattr(bulk_calculations, "get_orchestrator", lambda: FakeOrchestrator())
+
+    batches = []
+
+    def fake_save(summaries, rows):
+        batches.append((list(summaries), list(rows)))
+        return len(rows)
+
+    monkeypatch.setattr(calculations, "save_line_items", fake_save)
+    monkeypatch.setattr(calculations.settings, "bulk_persist_batch_size", 2)
+    monkeypatch.setattr(calculations.settings, "bulk_max_in_flight", 1)
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/calculations/bulk",
+        json={
+            "pay_period_start": "2025-11-01",
+            "pay_period_end": "2025-11-15",
+            "base_airport": "ORD",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert captured["base_airport"] == "ORD"
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    results, summary = lines[:-1], lines[-1]["summary"]
+
+    assert len(results) == 6
+    by_employee = {r["employee_id"]: r for r in results}
+    assert by_employee["E0"]["total_pay"] == 100.0 * len(SAMPLE_FLIGHTS)
+    assert by_employee["E0"]["compliance"] == "pass"
+    assert by_employee["E-FAIL"]["status"] == "error"
+    assert summary["crew_members"] == 6
+    assert summary["complete"] == 5
+    assert summary["error"] == 1
+
+    # Completed crew members are persisted in batches; the failure is not
+    persisted = [summary for summaries, _ in batches for summary in summaries]
+    assert len(persisted) == 5
+    assert {summary["flight_pay"] for summary in persisted} == {100.0}
+    assert max(len(summaries) for summaries, _ in batches) <= 2
+    assert summary["persisted_rows"] == sum(len(rows) for _, rows in batches)
+
+
+def test_bulk_endpoint_rejects_inverted_period():
+    """A period ending before it starts is a client error."""
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/calculations/bulk",
+        json={"pay_period_start": "2025-11-15", "pay_period_end": "2025-11-01"},
+    )
+    assert response.status_code == 400
+
+
+def test_persist_failure_is_counted_separately(monkeypatch):
+    """Crew members whose rows failed to save are not double-counted as errors."""
+    monkeypatch.setattr(bulk_calculations, "get_orchestrator", lambda: FakeOrchestrator())
+    roster = [
+        (dict(SAMPLE_CREW_MEMBER, id=str(uuid.UUID(int=i + 1)), employee_id=f"E{i}"), ())
+        for i in range(3)
+    ]
+
+    def failing_persist(summaries, rows):
+        raise RuntimeError("database unavailable")
+
+    async def run():
+        stream = bulk_calculations.stream_bulk_results(
+            iter(roster), "2025-11-01", "2025-11-15", 2, failing_persist, 2
+        )
+        return [json.loads(line) async for line in stream]
+
+    lines = asyncio.run(run())
+    summary = lines[-1]["summary"]
+    assert summary["crew_members"] == 3
+    assert summary["complete"] + summary["needs_review"] + summary["error"] == 3
+    assert summary["persist_failed"] == 3
+    assert [line["status"] for line in lines if "summary" not in line].count("persist_error") == 2
+
+
+def test_only_start_and_resume_orchestrator_checkpoints(monkeypatch, tmp_path):
+    """Bulk runs use an orchestrator without the checkpoint store's lock."""
+    monkeypatch.setattr(
+        bulk_calculations.settings, "workflow_checkpoint_db", str(tmp_path / "checkpoints.sqlite")
+    )
+    bulk_calculations.get_orchestrator.cache_clear()
+    bulk_calculations.get_checkpointing_orchestrator.cache_clear()
+    try:
+        assert bulk_calculations.get_orchestrator().checkpointer is None
+        assert bulk_calculations.get_checkpointing_orchestrator().checkpointer is not None
+    finally:
+        bulk_calculations.get_orchestrator.cache_clear()
+        bulk_calculations.get_checkpointing_orchestrator.cache_clear()
@@ -0,0 +1,90 @@
+"""
+Test crew read endpoints served from crew_pay_summaries
+"""
+
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from api.database import get_db
+from api.main import app
+from api.v1 import crew
+
+CREW = SimpleNamespace(
+    id=uuid.UUID("550e8400-e29b-41d4-a716-446655440000"),
+    employee_id="P12345",
+    first_name="Sarah",
+    last_name="Chen",
+    role="Captain",
+    base_airport="BUR",
+    hourly_rate=Decimal("105.00"),
+    monthly_guarantee=Decimal("75.00"),
+)
+
+
+def _summary(start, total):
+    return SimpleNamespace(
+        pay_period_start=start,
+        pay_period_end=start.replace(day=15),
+        credit_hours=Decimal("80.0000"),
+        flight_pay=Decimal("8400.00"),
+        per_diem=Decimal("59.25"),
+        premium_pay=Decimal("100.00"),
+        guarantee_pay=Decimal("0.00"),
+        total_pay=Decimal(total),
+        compliance_status="pass",
+        confidence_score=Decimal("0.9500"),
+        requires_review=False,
+        calculated_at=datetime(2025, 11, 16, 6, 0),
+    )
+
+
+SUMMARIES = [_summary(date(2025, 11, 1), "8559.25"), _summary(date(2025, 10, 1), "8100.00")]
+
+
+def _client(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        crew, "find_crew_member", lambda db, crew_member_id: CREW if crew_member_id == "P12345" else None
+    )
+
+    def fake_summaries(db, crew_member_id, limit=12):
+        calls.append((crew_member_id, limit))
+        return SUMMARIES[:limit]
+
+    monkeypatch.setattr(crew, "get_pay_summaries", fake_summaries)
+    app.dependency_overrides[get_db] = lambda: None
+    return TestClient(app), calls
+
+
+def test_get_crew_member_serves_summaries(monkeypatch):
+    """Crew details include the current period and history from summaries."""
+    client, calls = _client(monkeypatch)
+    try:
+        response = client.get("/api/v1/crew/P12345?history=2")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["name"] == "Sarah Chen"
+    assert body["current_period"]["total_pay"] == 8559.25
+    assert [p["pay_period_start"] for p in body["pay_history"]] == ["2025-11-01", "2025-10-01"]
+    assert calls == [(CREW.id, 2)]
+
+
+def test_pay_history_and_unknown_crew(monkeypatch):
+    """Pay history honours limit; unknown crew members are 404."""
+    client, _ = _client(monkeypatch)
+    try:
+        history = client.get("/api/v1/crew/P12345/pay-history?limit=1")
+        missing = client.get("/api/v1/crew/NOPE")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert history.status_code == 200
+    assert len(history.json()) == 1
+    assert missing.status_code == 404
@@ -0,0 +1,104 @@
+"""
+Test the flight assignment importer
+"""
+
+import csv
+import io
+import json
+import uuid
+
+import pytest
+
+from api.services import flight_import
+from api.services.flight_import import (
+    RowError,
+    import_flights,
+    normalize_row,
+    read_rows,
+    write_copy_buffer,
+)
+
+CREW_ID = uuid.UUID("550e8400-e29b-41d4-a716-446655440000")
+CREW_MAP = {"P12345": CREW_ID}
+
+ROW = {
+    "employee_id": "P12345",
+    "flight_number": "xp101",
+    "origin_airport": "bur",
+    "destination_airport": "PDX",
+    "scheduled_departure": "2025-11-03 22:30:00",
+    "scheduled_arrival": "2025-11-04 01:15:00",
+    "actual_departure": "2025-11-03T22:45:00Z",
+    "actual_arrival": "2025-11-04 01:20:00",
+    "duty_report_time": "2025-11-03 21:30:00",
+    "duty_end_time": "2025-11-04 02:00:00",
+    "is_international": "false",
+    "trip_id": "TRIP-001",
+    "sequence_number": "1",
+}
+
+
+def test_normalize_row_derives_times_and_flags():
+    """Block times, FDP and the red-eye flag come from the timestamps."""
+    row = normalize_row(dict(ROW), CREW_MAP)
+
+    assert row["crew_member_id"] == CREW_ID
+    assert row["flight_number"] == "XP101"
+    assert row["origin_airport"] == "BUR"
+    assert str(row["flight_date"]) == "2025-11-03"
+    assert row["scheduled_block_time"] == 2.75
+    assert row["actual_block_time"] == 2.58
+    assert row["flight_duty_period"] == 4.5
+    assert row["is_redeye"] is True
+    assert row["is_international"] is False
+    assert row["sequence_number"] == 1
+
+
+@pytest.mark.parametrize(
+    "change, message",
+    [
+        ({"employee_id": "NOPE"}, "unknown employee_id"),
+        ({"origin_airport": "BURBANK"}, "invalid origin_airport"),
+        ({"scheduled_arrival": "2025-11-03 20:00:00"}, "implausible scheduled_block_time"),
+        ({"flight_number": ""}, "missing flight_number"),
+        ({"actual_departure": "yesterday"}, "invalid actual_departure"),
+    ],
+)
+def test_normalize_row_rejects_bad_rows(change, message):
+    """Invalid rows raise RowError with a reason."""
+    with pytest.raises(RowError, match=message):
+        normalize_row(dict(ROW, **change), CREW_MAP)
+
+
+def test_import_batches_and_dedupes(monkeypatch):
+    """Rows are loaded in batches, duplicates collapse, bad rows are reported."""
+    loaded = []
+    monkeypatch.setattr(
+        flight_import, "load_batch", lambda session, rows: loaded.append(rows) or len(rows)
+    )
+
+    rows = [dict(ROW, flight_number=f"XP{n}") for n in range(5)]
+    rows.insert(1, dict(ROW, flight_number="XP0", trip_id="TRIP-002"))  # same leg again
+    rows.append(dict(ROW, employee_id="NOPE"))
+
+    source = io.StringIO("\n".join(json.dumps(r) for r in rows))
+    result = import_flights(None, read_rows(source, "jsonl"), batch_size=2, crew_map=CREW_MAP)
+
+    assert result["rows_read"] == 7
+    assert result["rows_rejected"] == 1
+    assert result["errors"] == [{"line": 7, "error": "unknown employee_id NOPE"}]
+    assert result["rows_loaded"] == 5
+    assert [len(batch) for batch in loaded] == [2, 2, 1]
+    assert [r["flight_number"] for r in loaded[0]] == ["XP0", "XP1"]
+    assert loaded[0][0]["trip_id"] == "TRIP-002"
+
+
+def test_copy_buffer_encoding():
+    """COPY rows use IMPORT_COLUMNS order with \\N for NULL."""
+    row = normalize_row(dict(ROW, aircraft_type=None), CREW_MAP)
+    values = next(csv.reader(write_copy_buffer([row])))
+
+    assert len(values) == len(flight_import.IMPORT_COLUMNS)
+    assert values[flight_import.IMPORT_COLUMNS.index("aircraft_type")] == r"\N"
+    assert values[flight_import.IMPORT_COLUMNS.index("is_redeye")] == "t"
+    assert values[flight_import.IMPORT_COLUMNS.index("actual_departure")] == "2025-11-03 22:45:00"
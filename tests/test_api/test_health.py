@@ -0,0 +1,115 @@
+"""
+Test liveness and readiness checks
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from agents.llm_health import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from api.main import app
+from api.services.health import HealthMonitor
+from api.services.recompute import RecomputeQueue
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    return create_engine(
+        f"sqlite:///{tmp_path / 'health.sqlite'}",
+        poolclass=QueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+
+
+def _readiness(monitor, probes=1, **load):
+    """Run readiness probes with a started recompute queue."""
+
+    async def run():
+        await monitor.queue.start()
+        monitor.load.update(load)
+        try:
+            return [await monitor.readiness() for _ in range(probes)]
+        finally:
+            await monitor.queue.stop()
+
+    return asyncio.run(run())
+
+
+def _monitor(db_engine, **kwargs):
+    kwargs.setdefault("circuit", CircuitBreaker())
+    return HealthMonitor(
+        db_engine=db_engine,
+        queue=kwargs.pop("queue", RecomputeQueue(max_size=10)),
+        load={"runs": 0, "workers": 0, "in_flight": 0},
+        pool_capacity=1,
+        llm_configured=lambda: True,
+        **kwargs,
+    )
+
+
+def test_ready_when_dependencies_healthy(db_engine):
+    (report,) = _readiness(_monitor(db_engine))
+    assert report["status"] == "ready"
+    assert report["reasons"] == []
+    assert report["database"]["status"] == "connected"
+    assert report["database"]["pool"] == {"checked_out": 0, "capacity": 1}
+    assert report["llm"]["state"] == CLOSED
+
+
+def test_exhausted_pool_is_not_probed(db_engine):
+    monitor = _monitor(db_engine)
+    with db_engine.connect():
+        (report,) = _readiness(monitor)
+    assert report["status"] == "not_ready"
+    assert report["database"]["status"] == "exhausted"
+
+
+def test_slow_database_times_out(db_engine):
+    monitor = _monitor(db_engine, db_timeout_seconds=0.05)
+    monitor._select_one = lambda: time.sleep(0.5)
+    (report,) = _readiness(monitor)
+    assert report["database"]["status"] == "timeout"
+    assert "database timeout" in report["reasons"]
+
+
+def test_open_circuit_and_saturation_shed_traffic(db_engine):
+    circuit = CircuitBreaker(failure_threshold=2, cooldown_seconds=60)
+    for _ in range(2):
+        circuit.record_failure(TimeoutError("overloaded"))
+    (report,) = _readiness(_monitor(db_engine, circuit=circuit, max_bulk_runs=1), runs=1)
+    assert report["status"] == "not_ready"
+    assert report["llm"]["state"] == OPEN
+    assert report["reasons"][-2:] == ["claude circuit open", "bulk runs saturated (1/1)"]
+
+
+def test_circuit_half_opens_after_cooldown_and_closes_on_success():
+    circuit = CircuitBreaker(failure_threshold=1, cooldown_seconds=0)
+    circuit.record_failure(ConnectionError("refused"))
+    assert circuit.state == HALF_OPEN
+    assert circuit.snapshot()["last_error"] == "ConnectionError"
+    circuit.record_success()
+    assert circuit.state == CLOSED
+
+
+def test_report_is_cached(db_engine):
+    monitor = _monitor(db_engine, cache_seconds=60)
+    probes = []
+    select_one = monitor._select_one
+    monitor._select_one = lambda: probes.append(1) or select_one()
+    first, second = _readiness(monitor, probes=2)
+    assert first is second
+    assert len(probes) == 1
+
+
+def test_liveness_and_readiness_endpoints():
+    client = TestClient(app)
+    assert client.get("/health/live").json()["status"] == "alive"
+    # No lifespan here, so the recompute queue is not running
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert "recompute queue not running" in response.json()["reasons"]
@@ -0,0 +1,72 @@
+"""
+Test monthly partition helpers and log retention
+"""
+
+from datetime import date
+
+from api.services.partitions import (
+    add_months,
+    expire_partitions,
+    partitions_for_period,
+)
+
+
+def test_period_touches_one_or_two_partitions():
+    """Pay periods prune to the month(s) they overlap."""
+    assert partitions_for_period("flight_assignments", date(2025, 11, 1), date(2025, 11, 15)) == [
+        "flight_assignments_y2025m11"
+    ]
+    assert partitions_for_period("flight_assignments", date(2025, 12, 16), date(2026, 1, 15)) == [
+        "flight_assignments_y2025m12",
+        "flight_assignments_y2026m01",
+    ]
+    assert add_months(date(2025, 11, 1), -12) == date(2024, 11, 1)
+
+
+class FakeResult:
+    def __init__(self, names):
+        self.names = names
+
+    def scalars(self):
+        return iter(self.names)
+
+
+class RecordingSession:
+    def __init__(self, partitions):
+        self.partitions = partitions
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "pg_inherits" in sql:
+            return FakeResult(self.partitions)
+        return None
+
+
+def test_expire_partitions_archives_old_months():
+    """Partitions older than the window are detached and archived."""
+    session = RecordingSession(
+        [
+            "agent_execution_log_y2025m09",
+            "agent_execution_log_y2025m10",
+            "agent_execution_log_y2025m11",
+            "agent_execution_log_y2025m12",
+        ]
+    )
+
+    expired = expire_partitions(
+        session, "agent_execution_log", 1, "archive", today=date(2025, 12, 20)
+    )
+
+    assert expired == ["agent_execution_log_y2025m09", "agent_execution_log_y2025m10"]
+    assert 'ALTER TABLE "agent_execution_log" DETACH PARTITION "agent_execution_log_y2025m09"' in session.statements
+    assert 'ALTER TABLE "agent_execution_log_y2025m10" SET SCHEMA "archive"' in session.statements
+    assert not any(s.startswith("DROP") for s in session.statements)
+
+
+def test_expire_partitions_can_drop():
+    """Without an archive schema, expired partitions are dropped."""
+    session = RecordingSession(["agent_execution_log_y2024m01"])
+    expire_partitions(session, "agent_execution_log", 12, None, today=date(2025, 12, 1))
+    assert 'DROP TABLE "agent_execution_log_y2024m01"' in session.statements
@@ -0,0 +1,101 @@
+"""
+Test pay_calculations line items and upsert
+"""
+
+from sqlalchemy.dialects import postgresql
+
+from api.services.pay_persistence import build_line_items, build_summary, upsert_line_items
+from tests.fixtures.sample_data import SAMPLE_CREW_MEMBER, SAMPLE_FLIGHTS
+
+FLIGHT_IDS = ["11111111-1111-1111-1111-111111111111", "22222222-2222-2222-2222-222222222222"]
+
+
+def _state():
+    flights = [dict(f, id=FLIGHT_IDS[i]) for i, f in enumerate(SAMPLE_FLIGHTS[:2])]
+    return {
+        "crew_member_id": SAMPLE_CREW_MEMBER["id"],
+        "pay_period_start": "2025-11-01",
+        "pay_period_end": "2025-11-15",
+        "execution_id": "exec-1",
+        "crew_member_data": SAMPLE_CREW_MEMBER,
+        "flight_assignments": flights,
+        "status": "complete",
+        "flight_time_data": {
+            "flights": [
+                {"flight_number": f["flight_number"], "flight_date": f["flight_date"], "credit_hours": 2.0}
+                for f in flights
+            ],
+            "totals": {"hourly_rate": 100.0, "total_flight_pay": 400.0},
+        },
+        "premium_pay_data": {
+            "premium_components": [
+                {"type": "redeye", "flight_number": flights[0]["flight_number"],
+                 "date": flights[0]["flight_date"], "premium_amount": 50.0},
+                {"type": "redeye", "flight_number": flights[0]["flight_number"],
+                 "date": flights[0]["flight_date"], "premium_amount": 25.0},
+            ],
+        },
+        "per_diem_data": {"totals": {"total_net_per_diem": 59.25}},
+        "guarantee_data": {"calculation": {"base_pay": 1000.0}},
+        "compliance_status": {"overall_compliance": "pass"},
+        "total_hours": 4.0,
+        "confidence_score": 0.95,
+    }
+
+
+def test_build_line_items():
+    """Rows are keyed per flight, merged on collisions, and sum to total pay."""
+    rows = build_line_items(_state())
+    by_key = {(r["calculation_type"], str(r["flight_assignment_id"])): r for r in rows}
+
+    assert by_key[("flight_pay", FLIGHT_IDS[0])]["amount"] == 200.0
+    assert by_key[("flight_pay", FLIGHT_IDS[1])]["amount"] == 200.0
+    assert by_key[("premium_redeye", FLIGHT_IDS[0])]["amount"] == 75.0
+    assert len(by_key[("premium_redeye", FLIGHT_IDS[0])]["calculation_details"]["items"]) == 2
+    assert by_key[("per_diem", "None")]["amount"] == 59.25
+    assert by_key[("guarantee", "None")]["amount"] == 600.0
+    assert round(sum(r["amount"] for r in rows), 2) == 1134.25
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+        self.committed = False
+
+    def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+
+def test_build_summary():
+    """The period summary splits the line items into pay categories."""
+    state = _state()
+    summary = build_summary(state, build_line_items(state))
+
+    assert summary["flight_pay"] == 400.0
+    assert summary["premium_pay"] == 75.0
+    assert summary["per_diem"] == 59.25
+    assert summary["guarantee_pay"] == 600.0
+    assert summary["total_pay"] == 1134.25
+    assert summary["compliance_status"] == "pass"
+    assert summary["line_items"] == 5
+
+
+def test_upsert_is_one_statement_per_chunk():
+    """A batch becomes one multi-row upsert, a stale-row delete and a summary upsert."""
+    state = _state()
+    rows = build_line_items(state)
+    session = RecordingSession()
+
+    assert upsert_line_items(session, [build_summary(state, rows)], rows) == len(rows)
+    insert, delete, summary = session.statements
+    assert "ON CONFLICT (crew_member_id, pay_period_start, pay_period_end, calculation_type, COALESCE(" in insert
+    assert f"amount_m{len(rows) - 1}" in insert
+    assert delete.startswith("DELETE FROM pay_calculations")
+    assert "ON CONFLICT ON CONSTRAINT unique_crew_period DO UPDATE" in summary
+    assert session.committed
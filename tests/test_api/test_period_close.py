@@ -0,0 +1,87 @@
+"""
+Test pay period close checkpoints
+"""
+
+from datetime import date
+from types import SimpleNamespace
+
+from api.services import period_close
+from api.services.period_close import checkpoint_item, run_close_item
+from tests.fixtures.sample_data import SAMPLE_CREW_MEMBER, SAMPLE_FLIGHTS
+
+START, END = date(2025, 11, 1), date(2025, 11, 15)
+
+
+class FakeOrchestrator:
+    def __init__(self, state=None, error=None):
+        self.state = state
+        self.error = error
+
+    def process(self, on_progress=None, **kwargs):
+        if self.error:
+            raise self.error
+        on_progress("exec-1", {"event": "node_started", "node": "flight_time"})
+        on_progress(
+            "exec-1",
+            {"event": "node_completed", "node": "flight_time", "result": {"day": START}},
+        )
+        return self.state
+
+
+def _item():
+    return SimpleNamespace(attempts=0, status="pending", error=None, execution_id=None)
+
+
+def test_completed_run_is_checkpointed(monkeypatch):
+    state = {"status": "complete", "execution_id": "exec-1", "total_pay": 1234.5}
+    monkeypatch.setattr(period_close, "get_orchestrator", lambda: FakeOrchestrator(state))
+
+    result = run_close_item(SAMPLE_CREW_MEMBER, SAMPLE_FLIGHTS, START, END)
+    item = _item()
+    checkpoint_item(item, result, max_attempts=3)
+
+    assert item.status == "complete"
+    assert item.total_pay == 1234.5
+    assert item.node_outputs["flight_time"]["result"] == {"day": "2025-11-01"}
+
+
+def test_flagged_run_routes_to_review(monkeypatch):
+    state = {"status": "complete", "requires_human_review": True, "total_pay": 10.0}
+    monkeypatch.setattr(period_close, "get_orchestrator", lambda: FakeOrchestrator(state))
+
+    item = _item()
+    checkpoint_item(item, run_close_item(SAMPLE_CREW_MEMBER, [], START, END), max_attempts=3)
+    assert item.status == "review"
+
+
+def test_failures_retry_then_route_to_review(monkeypatch):
+    monkeypatch.setattr(
+        period_close, "get_orchestrator", lambda: FakeOrchestrator(error=RuntimeError("timeout"))
+    )
+
+    item = _item()
+    for expected in ("failed", "failed", "review"):
+        checkpoint_item(item, run_close_item(SAMPLE_CREW_MEMBER, [], START, END), max_attempts=3)
+        assert item.status == expected
+    assert item.attempts == 3
+    assert item.error == "timeout"
+
+
+def test_flight_pay_is_cross_checked_against_local_totals(monkeypatch):
+    """Sharded local totals are kept with the item; a mismatch goes to review."""
+    from agents.sharded_runner import ShardedPayRunner
+
+    local = ShardedPayRunner(max_workers=1).run([(SAMPLE_CREW_MEMBER, SAMPLE_FLIGHTS)])["crew"]
+    crew_local = local[SAMPLE_CREW_MEMBER["id"]]
+
+    for flight_pay, expected in ((559.65, "complete"), (600.0, "review")):
+        state = {"status": "complete", "total_pay": 1.0, "breakdown": {"flight_pay": flight_pay}}
+        monkeypatch.setattr(period_close, "get_orchestrator", lambda: FakeOrchestrator(state))
+
+        item = _item()
+        result = run_close_item(SAMPLE_CREW_MEMBER, SAMPLE_FLIGHTS, START, END)
+        checkpoint_item(item, result, max_attempts=3, local=crew_local)
+
+        assert item.status == expected
+        assert item.node_outputs["local_totals"]["flight_time"]["total_flight_pay"] == 559.65
+    assert item.error == "Flight pay 600.00 differs from local calculation 559.65"
@@ -0,0 +1,141 @@
+"""
+Test execution progress broker and SSE endpoint
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.progress import ProgressBroker, progress_broker
+
+
+def _collect(broker, execution_id, last_event_id=None):
+    async def run():
+        return [e async for e in broker.subscribe(execution_id, last_event_id)]
+
+    return asyncio.run(run())
+
+
+def test_late_subscriber_replays_history():
+    """Subscribers attaching after events were published still see them."""
+    broker = ProgressBroker()
+    broker.publish("e1", {"event": "node_started", "node": "flight_time"})
+    broker.publish("e1", {"event": "node_completed", "node": "flight_time"})
+    broker.publish("e1", {"event": "execution_completed", "status": "complete"})
+
+    events = _collect(broker, "e1")
+    assert [e["seq"] for e in events] == [1, 2, 3]
+    assert [e["seq"] for e in _collect(broker, "e1", last_event_id=2)] == [3]
+
+
+def test_live_events_from_worker_thread():
+    """Events published from another thread reach an async subscriber."""
+    broker = ProgressBroker()
+    broker.register("e2")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+
+        async def consume():
+            return [e["event"] async for e in broker.subscribe("e2")]
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+
+        def publish():
+            broker.publish("e2", {"event": "node_started", "node": "flight_time"})
+            broker.publish("e2", {"event": "execution_completed", "status": "complete"})
+
+        await loop.run_in_executor(None, publish)
+        return await asyncio.wait_for(consumer, timeout=5)
+
+    assert asyncio.run(run()) == ["node_started", "execution_completed"]
+
+
+def test_finished_executions_are_evicted():
+    """Only max_executions finished runs are retained."""
+    broker = ProgressBroker(max_executions=2)
+    for execution_id in ("a", "b", "c"):
+        broker.publish(execution_id, {"event": "execution_completed"})
+    broker.register("d")
+
+    assert not broker.exists("a")
+    assert broker.exists("d")
+
+
+def test_sse_endpoint():
+    """The events endpoint streams SSE messages and 404s unknown runs."""
+    progress_broker.publish("sse-1", {"event": "node_completed", "node": "flight_time"})
+    progress_broker.publish("sse-1", {"event": "execution_completed", "status": "complete"})
+
+    client = TestClient(app)
+    response = client.get("/api/v1/calculations/sse-1/events")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    messages = [m for m in response.text.split("\n\n") if m]
+    assert messages[0].splitlines()[:2] == ["id: 1", "event: node_completed"]
+    assert json.loads(messages[1].splitlines()[2][len("data: "):])["status"] == "complete"
+
+    assert client.get("/api/v1/calculations/unknown/events").status_code == 404
+
+
+def test_start_failure_before_workflow_ends_stream(monkeypatch):
+    """An error before the workflow runs still ends the SSE stream."""
+    from api.v1 import calculations
+
+    def broken_orchestrator():
+        raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+
+    monkeypatch.setattr(calculations, "_load_roster_entry", lambda request: ({"id": "c1"}, []))
+    monkeypatch.setattr(calculations, "get_checkpointing_orchestrator", broken_orchestrator)
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/calculations/start",
+        json={
+            "crew_member_id": "c1",
+            "pay_period_start": "2025-11-01",
+            "pay_period_end": "2025-11-15",
+        },
+    )
+    assert response.status_code == 202
+
+    events = _collect(progress_broker, response.json()["execution_id"])
+    assert events[-1]["event"] == "execution_completed"
+    assert events[-1]["status"] == "error"
+    assert "ANTHROPIC_API_KEY" in events[-1]["error"]
+
+
+def test_fail_does_not_repeat_terminal_event():
+    """fail() after the workflow's own terminal event is a no-op."""
+    broker = ProgressBroker()
+    broker.publish("e3", {"event": "execution_completed", "status": "complete"})
+    broker.fail("e3", "persist failed")
+
+    assert [e["status"] for e in _collect(broker, "e3")] == ["complete"]
+
+
+def test_resume_only_maps_missing_checkpoints_to_404(monkeypatch):
+    """A KeyError while persisting the resumed result is not a missing execution."""
+    from api.v1 import calculations
+
+    class Resumable:
+        def resume(self, execution_id):
+            if execution_id == "unknown":
+                raise KeyError(execution_id)
+            return {"execution_id": execution_id, "status": "complete"}
+
+    def broken_persist(session, states):
+        raise KeyError("flight_time_data")
+
+    monkeypatch.setattr(calculations, "get_checkpointing_orchestrator", Resumable)
+    monkeypatch.setattr(calculations, "SessionLocal", lambda: SimpleNamespace(close=lambda: None))
+    monkeypatch.setattr(calculations, "persist_results", broken_persist)
+
+    client = TestClient(app, raise_server_exceptions=False)
+    assert client.post("/api/v1/calculations/unknown/resume").status_code == 404
+    assert client.post("/api/v1/calculations/exec-1/resume").status_code == 500
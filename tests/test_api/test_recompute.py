@@ -0,0 +1,170 @@
+"""
+Test incremental recompute queue and leg actuals endpoint
+"""
+
+import asyncio
+import threading
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agents.flight_record import FlightRecord
+from api.main import app
+from api.services import recompute
+from api.services.recompute import (
+    LegTimeUpdate,
+    RecomputeQueue,
+    apply_leg_update,
+    recompute_queue,
+)
+
+CAPTAIN = uuid.uuid4()
+FIRST_OFFICER = uuid.uuid4()
+PERIOD = (date(2025, 11, 1), date(2025, 11, 15))
+
+
+def _update(flight_number="XP101", minute=0):
+    return LegTimeUpdate(
+        flight_number=flight_number,
+        flight_date=date(2025, 11, 3),
+        origin_airport="BUR",
+        actual_departure=datetime(2025, 11, 3, 8, minute),
+    )
+
+
+def _run_queue(events, **kwargs):
+    """Publish events in a burst and return the recomputed keys."""
+    recomputed = []
+    lock = threading.Lock()
+
+    def apply_update(event):
+        if event.flight_number == "XP101":
+            return [(CAPTAIN, *PERIOD), (FIRST_OFFICER, *PERIOD)]
+        return [(CAPTAIN, *PERIOD)]
+
+    def recompute(key):
+        with lock:
+            recomputed.append(key)
+
+    async def run():
+        queue = RecomputeQueue(
+            apply_update=apply_update,
+            recompute=recompute,
+            debounce_seconds=0.05,
+            max_delay_seconds=kwargs.get("max_delay_seconds", 5),
+        )
+        await queue.start()
+        for event in events:
+            queue.publish(event)
+        while queue.depth or queue._running or queue.stats["events"] < len(events):
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return queue.stats
+
+    return recomputed, asyncio.run(run())
+
+
+def test_burst_coalesces_per_crew_member():
+    """Many updates for the same crew period produce one recompute each."""
+    events = [_update(minute=m) for m in range(10)] + [_update("XP102")]
+    recomputed, stats = _run_queue(events)
+
+    assert stats["events"] == 11
+    assert sorted(recomputed) == sorted([(CAPTAIN, *PERIOD), (FIRST_OFFICER, *PERIOD)])
+
+
+def test_publish_requires_running_queue():
+    queue = RecomputeQueue(apply_update=lambda e: [], recompute=lambda k: None)
+    with pytest.raises(RuntimeError):
+        queue.publish(_update())
+
+
+def test_actuals_endpoint_validates_times(monkeypatch):
+    published = []
+    monkeypatch.setattr(recompute_queue, "publish", published.append)
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/v1/flights/actuals",
+        json=[
+            {
+                "flight_number": "XP101",
+                "flight_date": "2025-11-03",
+                "origin_airport": "bur",
+                "actual_departure": "2025-11-03T08:05:00",
+                "actual_arrival": "2025-11-03T09:40:00",
+            }
+        ],
+    )
+    assert response.status_code == 202
+    assert response.json()["accepted"] == 1
+    assert published[0].origin_airport == "BUR"
+
+    response = client.post(
+        "/api/v1/flights/actuals",
+        json=[{"flight_number": "XP101", "flight_date": "2025-11-03", "origin_airport": "BUR"}],
+    )
+    assert response.status_code == 400
+
+
+class _UpdateSession:
+    """Captures the UPDATE issued by apply_leg_update (no database)."""
+
+    def __init__(self):
+        self.values = []
+
+    def execute(self, statement):
+        if statement.is_dml:
+            self.values.append(statement.compile().params)
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: [CAPTAIN]))
+        return SimpleNamespace(
+            first=lambda: SimpleNamespace(period_start=PERIOD[0], period_end=PERIOD[1])
+        )
+
+    def commit(self):
+        pass
+
+
+def test_separate_out_and_in_updates_recompute_block_time():
+    """An arrival-only update does not leave a stale block time behind."""
+    session = _UpdateSession()
+    departure = datetime(2025, 11, 3, 8, 15)
+    arrival = datetime(2025, 11, 3, 10, 45)
+
+    assert apply_leg_update(session, _update(minute=15)) == [(CAPTAIN, *PERIOD)]
+    apply_leg_update(
+        session, LegTimeUpdate("XP101", date(2025, 11, 3), "BUR", actual_arrival=arrival)
+    )
+
+    out, arrived = session.values
+    assert out["actual_departure"] == departure and "actual_arrival" not in out
+    assert arrived["actual_arrival"] == arrival and "actual_departure" not in arrived
+    assert out["actual_block_time"] is None and arrived["actual_block_time"] is None
+
+    # With the stored block time cleared, the merged row derives it from the actuals
+    leg = {
+        "flight_number": "XP101",
+        "flight_date": "2025-11-03",
+        "scheduled_departure": "2025-11-03 08:00:00",
+        "scheduled_arrival": "2025-11-03 10:00:00",
+        "scheduled_block_time": 2.0,
+        "actual_departure": departure,
+        "actual_arrival": arrival,
+        "actual_block_time": arrived["actual_block_time"],
+    }
+    assert FlightRecord.from_dict(leg).block_centihours == 250
+
+
+@pytest.mark.parametrize("status", ["closing", "closed", "paid"])
+def test_late_update_leaves_closed_period_alone(monkeypatch, status):
+    """Pay in a period past open is not rewritten by a recompute."""
+    monkeypatch.setattr(
+        recompute, "iter_roster", lambda *a, **k: pytest.fail("roster loaded for recompute")
+    )
+    monkeypatch.setattr(recompute, "persist_results", lambda *a: pytest.fail("results persisted"))
+    session = SimpleNamespace(execute=lambda statement: SimpleNamespace(scalar=lambda: status))
+
+    assert recompute.recompute_crew_period(session, CAPTAIN, *PERIOD) is None
@@ -0,0 +1,52 @@
+"""
+Test API cold start: import-time budget and lazy agent stack
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Packages only the agent stack needs; loaded on first use or by the
+# lifespan warm-up, never while importing the app
+AGENT_STACK = ("langgraph", "langchain", "langchain_core", "anthropic", "openai")
+
+# Cold import of api.main (measured ~1.0s here, from ~3.3s with the agent
+# stack imported eagerly); override on slow CI runners
+IMPORT_BUDGET_SECONDS = float(os.getenv("API_IMPORT_BUDGET_SECONDS", "2.0"))
+
+ROOT = Path(__file__).resolve().parents[2]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import api.main
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": sorted({m.split(".")[0] for m in sys.modules})}))
+"""
+
+
+def _cold_import():
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        env={**os.environ, "ANTHROPIC_API_KEY": os.getenv("ANTHROPIC_API_KEY", "test")},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_app_import_does_not_load_agent_stack():
+    probe = _cold_import()
+    assert not set(AGENT_STACK) & set(probe["modules"])
+
+
+def test_app_import_within_budget():
+    # Best of three, so one slow process start does not fail the check
+    seconds = min(_cold_import()["seconds"] for _ in range(3))
+    assert (
+        seconds < IMPORT_BUDGET_SECONDS
+    ), f"importing api.main took {seconds:.2f}s (budget {IMPORT_BUDGET_SECONDS:.2f}s)"
@@ -3,6 +3,7 @@ Test Crew Pay Orchestrator
 """
 
 import pytest
+from agents.checkpoint import create_checkpointer
 from agents.orchestrator import CrewPayOrchestrator
 from tests.fixtures.sample_data import SAMPLE_CREW_MEMBER, SAMPLE_FLIGHTS
 
@@ -97,3 +98,263 @@ def test_full_workflow(orchestrator):
     print(f"Total Pay: ${result.get('total_pay', 0):.2f}")
     print(f"Total Hours: {result.get('total_hours', 0):.2f}")
     print(f"Confidence: {result['confidence_score']:.2%}")
+
+
+def _canned_responses(orchestrator):
+    return {
+        orchestrator.flight_time_agent: {
+            "totals": {"total_credit_hours": 5.33, "total_flight_pay": 559.65},
+            "confidence_score": 0.95,
+        },
+        orchestrator.duty_time_agent: {"violations": [], "confidence_score": 0.95},
+        orchestrator.per_diem_agent: {"totals": {"total_net_per_diem": 59.25}},
+        orchestrator.premium_pay_agent: {
+            "leg_premiums": [
+                {"type": "redeye", "flight_number": "XP101", "date": "2025-11-03", "basis": 1}
+            ],
+            "confidence_score": 0.95,
+        },
+        orchestrator.guarantee_agent: {"calculation": {"base_pay": 7875.0}},
+        orchestrator.compliance_agent: {"overall_compliance": "pass"},
+    }
+
+
+def test_progress_events(orchestrator, monkeypatch):
+    """Each node emits started/completed events with partial results."""
+    for agent, response in _canned_responses(orchestrator).items():
+        monkeypatch.setattr(agent, "call_claude", lambda *a, r=response, **k: dict(r))
+
+    events = []
+    result = orchestrator.process(
+        crew_member_data=SAMPLE_CREW_MEMBER,
+        flight_assignments=SAMPLE_FLIGHTS,
+        pay_period_start="2025-11-01",
+        pay_period_end="2025-11-15",
+        execution_id="exec-progress",
+        on_progress=lambda execution_id, event: events.append((execution_id, event)),
+    )
+
+    assert result["execution_id"] == "exec-progress"
+    assert {execution_id for execution_id, _ in events} == {"exec-progress"}
+
+    kinds = [(e["event"], e.get("node")) for _, e in events]
+    assert kinds[0] == ("execution_started", None)
+    assert kinds[1:3] == [("node_started", "flight_time"), ("node_completed", "flight_time")]
+    assert kinds[-2] == ("node_completed", "finalize")
+    assert kinds[-1] == ("execution_completed", None)
+
+    flight_time = events[2][1]
+    assert flight_time["result"]["total_flight_pay"] == 559.65
+    assert flight_time["duration_ms"] >= 0
+    assert events[-1][1]["total_pay"] == result["total_pay"]
+    assert "exec-progress" not in orchestrator._progress_callbacks
+
+
+def test_resume_from_failed_node(monkeypatch, tmp_path):
+    """A resumed run restarts at the failed node without re-running earlier ones."""
+    orchestrator = CrewPayOrchestrator(
+        checkpointer=create_checkpointer(str(tmp_path / "checkpoints.sqlite"))
+    )
+    calls = []
+    failing = {"premium_pay": True}
+
+    def responder(name, response):
+        def call_claude(*args, **kwargs):
+            calls.append(name)
+            if failing.get(name):
+                raise RuntimeError("overloaded")
+            return dict(response)
+
+        return call_claude
+
+    names = {
+        orchestrator.flight_time_agent: "flight_time",
+        orchestrator.duty_time_agent: "duty_time",
+        orchestrator.per_diem_agent: "per_diem",
+        orchestrator.premium_pay_agent: "premium_pay",
+        orchestrator.guarantee_agent: "guarantee",
+        orchestrator.compliance_agent: "compliance",
+    }
+    for agent, response in _canned_responses(orchestrator).items():
+        monkeypatch.setattr(agent, "call_claude", responder(names[agent], response))
+
+    failed = orchestrator.process(
+        crew_member_data=SAMPLE_CREW_MEMBER,
+        flight_assignments=SAMPLE_FLIGHTS,
+        pay_period_start="2025-11-01",
+        pay_period_end="2025-11-15",
+        execution_id="exec-resume",
+    )
+    assert failed["status"] == "error"
+    assert "premium_pay" in calls
+
+    calls.clear()
+    failing["premium_pay"] = False
+    resumed = orchestrator.resume("exec-resume")
+
+    assert resumed["status"] == "complete"
+    assert resumed["error_log"] == []
+    assert "flight_time" not in calls and calls[0] == "premium_pay"
+    assert resumed["flight_time_data"]["totals"]["total_flight_pay"] == 559.65
+
+    with pytest.raises(KeyError):
+        orchestrator.resume("exec-unknown")
+
+
+@pytest.mark.parametrize("credit_hours, expected_runs", [(5.33, 1), (6.0, 2)])
+def test_speculative_downstream(orchestrator, monkeypatch, credit_hours, expected_runs):
+    """Premium and guarantee start on estimated hours and re-run only if the estimate misses."""
+    responses = _canned_responses(orchestrator)
+    responses[orchestrator.flight_time_agent]["totals"]["total_credit_hours"] = credit_hours
+    for agent, response in responses.items():
+        monkeypatch.setattr(agent, "call_claude", lambda *a, r=response, **k: dict(r))
+
+    seen_hours = {"premium_pay": [], "guarantee": []}
+    for name, agent in (
+        ("premium_pay", orchestrator.premium_pay_agent),
+        ("guarantee", orchestrator.guarantee_agent),
+    ):
+
+        def calculate(input_data, name=name, original=agent.calculate):
+            seen_hours[name].append(input_data["flight_time_data"]["totals"]["total_credit_hours"])
+            return original(input_data)
+
+        monkeypatch.setattr(agent, "calculate", calculate)
+
+    result = orchestrator.process(
+        crew_member_data=SAMPLE_CREW_MEMBER,
+        flight_assignments=SAMPLE_FLIGHTS,
+        pay_period_start="2025-11-01",
+        pay_period_end="2025-11-15",
+    )
+
+    assert result["status"] == "complete"
+    # The sample legs credit 2.58 + 2.75 hours
+    assert seen_hours["premium_pay"][0] == seen_hours["guarantee"][0] == 5.33
+    assert len(seen_hours["premium_pay"]) == len(seen_hours["guarantee"]) == expected_runs
+    assert seen_hours["guarantee"][-1] == credit_hours
+    assert orchestrator._speculation == {}
+
+
+def test_empty_period_skips_model_calls(orchestrator, monkeypatch):
+    """A reserve with no flights is routed straight to compliance without Claude."""
+    calls = []
+    for agent in _canned_responses(orchestrator):
+        monkeypatch.setattr(
+            agent, "call_claude", lambda *a, name=agent.agent_name, **k: calls.append(name)
+        )
+
+    events = []
+    result = orchestrator.process(
+        crew_member_data=dict(SAMPLE_CREW_MEMBER, crew_type="reserve"),
+        flight_assignments=[],
+        pay_period_start="2025-11-01",
+        pay_period_end="2025-11-15",
+        on_progress=lambda execution_id, event: events.append(event),
+    )
+
+    assert calls == []
+    assert result["status"] == "complete"
+    assert result["skipped_nodes"] == [
+        "flight_time",
+        "duty_time",
+        "per_diem",
+        "premium_pay",
+        "guarantee",
+    ]
+    assert result["guarantee_data"]["guarantee_triggered"] is True
+    assert result["total_pay"] == 73.0 * SAMPLE_CREW_MEMBER["hourly_rate"]
+    started = [e["node"] for e in events if e["event"] == "node_started"]
+    assert started == ["compliance", "finalize"]
+
+
+def test_trivial_nodes_are_routed_around(orchestrator, monkeypatch):
+    """Without layovers or premium flags only the nodes that need Claude run."""
+    for agent, response in _canned_responses(orchestrator).items():
+        monkeypatch.setattr(agent, "call_claude", lambda *a, r=response, **k: dict(r))
+    flights = [
+        dict(flight, overnight_location=None, is_redeye=False, is_international=False)
+        for flight in SAMPLE_FLIGHTS
+    ]
+
+    result = orchestrator.process(
+        crew_member_data=SAMPLE_CREW_MEMBER,
+        flight_assignments=flights,
+        pay_period_start="2025-11-01",
+        pay_period_end="2025-11-15",
+    )
+
+    assert result["skipped_nodes"] == ["per_diem", "premium_pay"]
+    assert result["per_diem_data"]["totals"]["total_net_per_diem"] == 0.0
+    assert result["premium_pay_data"]["totals"]["total_premium_pay"] == 0.0
+    # 5.33 credit hours over two duty days: the monthly guarantee is paid
+    assert result["guarantee_data"]["calculation"]["base_pay"] == 7875.0
+    assert result["status"] == "complete"
+
+
+def test_nodes_return_partial_updates(orchestrator, monkeypatch):
+    """Nodes return only the keys they change; inputs are never rewritten."""
+    state = {
+        "execution_id": "exec-partial",
+        "crew_member_data": SAMPLE_CREW_MEMBER,
+        "flight_assignments": SAMPLE_FLIGHTS,
+        "flight_records": (),
+        "warnings": [],
+        "error_log": [],
+    }
+    monkeypatch.setattr(
+        orchestrator.duty_time_agent,
+        "calculate",
+        lambda input_data: {"violations": [{"type": "rest"}]},
+    )
+
+    def overloaded(input_data):
+        raise RuntimeError("overloaded")
+
+    monkeypatch.setattr(orchestrator.per_diem_agent, "calculate", overloaded)
+
+    update = orchestrator._monitor_duty_time(state)
+    assert set(update) == {"duty_time_data", "warnings"}
+    assert state["warnings"] == [] and len(update["warnings"]) == 1
+
+    update = orchestrator._calculate_per_diem(state)
+    assert update == {"error_log": ["Per Diem Error: overloaded"]}
+    assert state["error_log"] == []
+
+
+def test_benchmark_runs():
+    """The framework-overhead benchmark completes with every node executed."""
+    from agents import benchmark
+
+    stats = benchmark.run(runs=2, flights=8, checkpoint=False)
+    assert stats["nodes_per_run"] == 7
+    assert stats["ms_per_node"] > 0
+
+
+def test_per_diem_rates_reach_per_diem_and_compliance(monkeypatch):
+    """Per Diem and the compliance rate check see the same rate table."""
+    rates = {"PDX": {"rate": 79.0}}
+    orchestrator = CrewPayOrchestrator(per_diem_rates=rates)
+    for agent, response in _canned_responses(orchestrator).items():
+        monkeypatch.setattr(agent, "call_claude", lambda *a, r=response, **k: dict(r))
+
+    seen = {}
+    for name, agent in (
+        ("per_diem", orchestrator.per_diem_agent),
+        ("compliance", orchestrator.compliance_agent),
+    ):
+
+        def calculate(input_data, name=name, original=agent.calculate):
+            seen[name] = input_data["per_diem_rates"]
+            return original(input_data)
+
+        monkeypatch.setattr(agent, "calculate", calculate)
+
+    orchestrator.process(
+        crew_member_data=SAMPLE_CREW_MEMBER,
+        flight_assignments=SAMPLE_FLIGHTS,
+        pay_period_start="2025-11-01",
+        pay_period_end="2025-11-15",
+    )
+
+    assert seen == {"per_diem": rates, "compliance": rates}